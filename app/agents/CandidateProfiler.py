@@ -1,10 +1,4 @@
-from crewai import Agent
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool, FileReadTool, MDXSearchTool
-
-scrape_tool = ScrapeWebsiteTool()
-search_tool = SerperDevTool()
-read_resume = FileReadTool(file_path='./fake_resume.md')  # Replace with actual resume path as needed
-semantic_search_resume = MDXSearchTool(mdx='./fake_resume.md')  # Replace as needed
+from agents.registry import get_agent, get_tools
 
 # profiler = Agent(
 #     role="Personal Profiler for Engineers",
@@ -17,14 +11,23 @@ semantic_search_resume = MDXSearchTool(mdx='./fake_resume.md')  # Replace as nee
 #         "laying the groundwork for personalized resume enhancements."
 #     )
 # )
-profiler_agent = Agent(
-    role="Candidate Profiler",
-    goal="Create detailed candidate profiles based on job requirements and company culture",
-    backstory="""You are a skilled profiler who analyzes job requirements and company information 
-    to create comprehensive candidate profiles. You build upon research findings to understand 
-    what makes an ideal candidate.""",
-    tools=[scrape_tool, search_tool, read_resume, semantic_search_resume],
-    memory=True,  # Access shared memory from JobResearcher
-    allow_delegation=True,  # Can ask JobResearcher for clarification
-    verbose=True
-)
\ No newline at end of file
+def build_profiler_agent():
+    from crewai import Agent
+
+    return Agent(
+        role="Candidate Profiler",
+        goal="Create detailed candidate profiles based on job requirements and company culture",
+        backstory="""You are a skilled profiler who analyzes job requirements and company information 
+        to create comprehensive candidate profiles. You build upon research findings to understand 
+        what makes an ideal candidate.""",
+        tools=get_tools('scrape', 'search', 'read_resume', 'resume_search'),
+        memory=True,  # Access shared memory from JobResearcher
+        allow_delegation=True,  # Can ask JobResearcher for clarification
+        verbose=True
+    )
+
+def __getattr__(name):
+    # `from agents... import profiler_agent` builds the agent on first access instead of at import
+    if name == 'profiler_agent':
+        return get_agent('profiler_agent')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,4 @@
-from crewai import Agent
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool, FileReadTool, MDXSearchTool, GithubSearchTool
-
-overAllSearchWithinRepo = GithubSearchTool(
-    config=config,
-    gh_token=gh_token,  # Replace with your GitHub token
-    content_types=["code", "issues", "pull_requests", "discussions"],
-    
-)
+from agents.registry import get_agent, get_tools
 
 # codeSearchTool = GithubSearchTool(
 #     config=config,
@@ -15,14 +7,24 @@ overAllSearchWithinRepo = GithubSearchTool(
 # )
 
 
-github_analyzer = Agent(
-    role="GitHub Portfolio Analyst", 
-    goal="Analyze GitHub profiles and repositories for job alignment",
-    backstory="""You are a technical recruiter who specializes in evaluating GitHub profiles 
-    and code repositories. You assess technical skills and project alignment based on job 
-    requirements and company tech stack.""",
-    tools=[scrape_tool],  # Add GitHub-specific tools as needed
-    memory=True,  # Access research findings about tech requirements
-    allow_delegation=True,  # Can ask for specific technical requirements
-    verbose=True
-)
+def build_github_analyzer():
+    from crewai import Agent
+
+    return Agent(
+        role="GitHub Portfolio Analyst", 
+        goal="Analyze GitHub profiles and repositories for job alignment",
+        backstory="""You are a technical recruiter who specializes in evaluating GitHub profiles 
+        and code repositories. You assess technical skills and project alignment based on job 
+        requirements and company tech stack.""",
+        tools=get_tools('scrape'),  # Add GitHub-specific tools (e.g. 'github_search') as needed
+        memory=True,  # Access research findings about tech requirements
+        allow_delegation=True,  # Can ask for specific technical requirements
+        verbose=True
+    )
+
+def __getattr__(name):
+    # `from agents... import github_analyzer` builds the agent on first access instead of at import
+    if name == 'github_analyzer':
+        return get_agent('github_analyzer')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
@@ -1,10 +1,4 @@
-from crewai import Agent
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool, FileReadTool, MDXSearchTool
-
-scrape_tool = ScrapeWebsiteTool()
-search_tool = SerperDevTool()
-read_resume = FileReadTool(file_path='./fake_resume.md')  # Replace with actual resume path as needed
-semantic_search_resume = MDXSearchTool(mdx='./fake_resume.md')  # Replace as needed
+from agents.registry import get_agent
 
 # interview_preparer = Agent(
 #     role="Engineering Interview Preparer",
@@ -18,13 +12,22 @@ semantic_search_resume = MDXSearchTool(mdx='./fake_resume.md')  # Replace as nee
 #     )
 # )
 
-interview_preparer = Agent(
-    role="Interview Preparation Specialist",
-    goal="Prepare comprehensive interview strategies and practice materials",
-    backstory="""You are an interview coach who prepares candidates for success. 
-    You use detailed company research, job requirements, and candidate profiles 
-    to create targeted interview preparation materials.""",
-    memory=True,  # Access all accumulated knowledge
-    allow_delegation=True,  # Can ask for clarification from any team member
-    verbose=True
-)
\ No newline at end of file
+def build_interview_preparer():
+    from crewai import Agent
+
+    return Agent(
+        role="Interview Preparation Specialist",
+        goal="Prepare comprehensive interview strategies and practice materials",
+        backstory="""You are an interview coach who prepares candidates for success. 
+        You use detailed company research, job requirements, and candidate profiles 
+        to create targeted interview preparation materials.""",
+        memory=True,  # Access all accumulated knowledge
+        allow_delegation=True,  # Can ask for clarification from any team member
+        verbose=True
+    )
+
+def __getattr__(name):
+    # `from agents... import interview_preparer` builds the agent on first access instead of at import
+    if name == 'interview_preparer':
+        return get_agent('interview_preparer')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,4 @@
-from crewai import Agent
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool
-from crewai.memory import memory
-
-
-scrape_tool = ScrapeWebsiteTool()
-search_tool = SerperDevTool()
+from agents.registry import get_agent, get_tools
 
 # researcher = Agent(
 #     role="Tech Job Researcher",
@@ -20,13 +14,22 @@ search_tool = SerperDevTool()
 #     ),
 #     memory=True,
 # )
-job_researcher = Agent(
-    role="Job Market Researcher",
-    goal="Research comprehensive information about the job position and company",
-    backstory="""You are an expert job market researcher who specializes in gathering 
-    detailed information about job positions, company culture, requirements, and industry trends. 
-    Your research forms the foundation for all other team members.""",
-    tools=[search_tool, scrape_tool],
-    memory=True,  # Enable memory to retain research findings
-    verbose=True
-)
\ No newline at end of file
+def build_job_researcher():
+    from crewai import Agent
+
+    return Agent(
+        role="Job Market Researcher",
+        goal="Research comprehensive information about the job position and company",
+        backstory="""You are an expert job market researcher who specializes in gathering 
+        detailed information about job positions, company culture, requirements, and industry trends. 
+        Your research forms the foundation for all other team members.""",
+        tools=get_tools('search', 'scrape'),
+        memory=True,  # Enable memory to retain research findings
+        verbose=True
+    )
+
+def __getattr__(name):
+    # `from agents... import job_researcher` builds the agent on first access instead of at import
+    if name == 'job_researcher':
+        return get_agent('job_researcher')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,33 @@
-from crewai import Agent
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool, FileReadTool, MDXSearchTool
+from agents.registry import get_agent, get_tools
 
-scrape_tool = ScrapeWebsiteTool()
-search_tool = SerperDevTool()
-read_resume = FileReadTool(file_path='./fake_resume.md')  # Replace with actual resume path as needed
-semantic_search_resume = MDXSearchTool(mdx='./fake_resume.md')  # Replace as needed
+# resume_strategist = Agent(
+#     role="Resume Strategist for Engineers",
+#     goal="Find all the best ways to make a resume stand out in the job market.",
+#     tools=[scrape_tool, search_tool, read_resume, semantic_search_resume],
+#     verbose=True,
+#     backstory=(
+#         "With a strategic mind and an eye for detail, you excel at refining resumes to highlight the most "
+#         "relevant skills and experiences, ensuring they resonate perfectly with the job's requirements."
+#     )
+# )
 
-resume_strategist = Agent(
-    role="Resume Strategist for Engineers",
-    goal="Find all the best ways to make a resume stand out in the job market.",
-    tools=[scrape_tool, search_tool, read_resume, semantic_search_resume],
-    verbose=True,
-    backstory=(
-        "With a strategic mind and an eye for detail, you excel at refining resumes to highlight the most "
-        "relevant skills and experiences, ensuring they resonate perfectly with the job's requirements."
-    )
-)
+def build_resume_strategist():
+    from crewai import Agent
 
+    return Agent(
+        role="Resume Strategy Expert",
+        goal="Create targeted resume strategies based on job and company research",
+        backstory="""You are a professional resume strategist who crafts compelling resumes 
+        tailored to specific job opportunities. You leverage deep company and role research 
+        to highlight the most relevant candidate experiences.""",
+        tools=get_tools('scrape', 'search', 'read_resume', 'resume_search'),
+        memory=True,  # Access all previous research and analysis
+        allow_delegation=True,  # Can request specific information from other agents
+        verbose=True
+    )
 
-resume_strategist = Agent(
-    role="Resume Strategy Expert",
-    goal="Create targeted resume strategies based on job and company research",
-    backstory="""You are a professional resume strategist who crafts compelling resumes 
-    tailored to specific job opportunities. You leverage deep company and role research 
-    to highlight the most relevant candidate experiences.""",
-    tools=[scrape_tool, search_tool, read_resume, semantic_search_resume],
-    memory=True,  # Access all previous research and analysis
-    allow_delegation=True,  # Can request specific information from other agents
-    verbose=True
-)
\ No newline at end of file
+def __getattr__(name):
+    # `from agents... import resume_strategist` builds the agent on first access instead of at import
+    if name == 'resume_strategist':
+        return get_agent('resume_strategist')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,113 @@
+"""
+Lazily built, shared CrewAI tools and agents
+"""
+import importlib
+import os
+import threading
+from typing import Any, Callable, Dict, List
+
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+
+# Resume the file tools read; the MDX tool builds its embedding index from it on first use
+CREW_RESUME_PATH = os.getenv("CREW_RESUME_PATH", "./fake_resume.md")
+
+def _scrape_tool():
+    from crewai_tools import ScrapeWebsiteTool
+    return ScrapeWebsiteTool()
+
+def _search_tool():
+    from crewai_tools import SerperDevTool
+    return SerperDevTool()
+
+def _read_resume_tool():
+    from crewai_tools import FileReadTool
+    return FileReadTool(file_path=CREW_RESUME_PATH)
+
+def _resume_search_tool():
+    from crewai_tools import MDXSearchTool
+    return MDXSearchTool(mdx=CREW_RESUME_PATH)
+
+def _github_search_tool():
+    from crewai_tools import GithubSearchTool
+    return GithubSearchTool(
+        gh_token=os.getenv("GITHUB_TOKEN"),
+        content_types=["code", "issues", "pull_requests", "discussions"],
+    )
+
+TOOL_FACTORIES: Dict[str, Callable[[], Any]] = {
+    'scrape': _scrape_tool,
+    'search': _search_tool,
+    'read_resume': _read_resume_tool,
+    'resume_search': _resume_search_tool,
+    'github_search': _github_search_tool,
+}
+
+# Agent name -> "module:builder"; modules are only imported when the agent is first requested
+AGENT_BUILDERS = {
+    'job_researcher': "agents.JobResearcher:build_job_researcher",
+    'profiler_agent': "agents.CandidateProfiler:build_profiler_agent",
+    'github_analyzer': "agents.GithubAnalyzer:build_github_analyzer",
+    'resume_strategist': "agents.ResumeStrategist:build_resume_strategist",
+    'interview_preparer': "agents.InterviewPreparer:build_interview_preparer",
+}
+
+_instances: Dict[str, Any] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+def _get_or_build(key: str, build: Callable[[], Any]) -> Any:
+    """Build an instance once per process; concurrent first requests wait for the same build"""
+    if key in _instances:
+        return _instances[key]
+    with _registry_lock:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _instances:
+            with default_metrics.timer(f"crew.build.{key}"):
+                _instances[key] = build()
+            logger.debug(f"Built {key}")
+        return _instances[key]
+
+def get_tool(name: str) -> Any:
+    """
+    Return the shared instance of a CrewAI tool, building it on first use
+
+    Args:
+        name: Key of TOOL_FACTORIES
+
+    Returns:
+        Any: Tool instance
+
+    Raises:
+        ValueError: If the tool is unknown
+    """
+    if name not in TOOL_FACTORIES:
+        raise ValueError(f"Unknown crew tool: {name}")
+    return _get_or_build(f"tool:{name}", TOOL_FACTORIES[name])
+
+def get_tools(*names: str) -> List[Any]:
+    """Shared instances of several tools"""
+    return [get_tool(name) for name in names]
+
+def get_agent(name: str) -> Any:
+    """
+    Return the shared instance of a crew agent, building it (and its tools) on first use
+
+    Args:
+        name: Key of AGENT_BUILDERS
+
+    Returns:
+        Any: crewai.Agent
+
+    Raises:
+        ValueError: If the agent is unknown
+    """
+    if name not in AGENT_BUILDERS:
+        raise ValueError(f"Unknown crew agent: {name}")
+    module, builder = AGENT_BUILDERS[name].split(':')
+    return _get_or_build(f"agent:{name}", lambda: getattr(importlib.import_module(module), builder)())
+
+def built() -> List[str]:
+    """Keys of the tools and agents built so far"""
+    return sorted(_instances)
@@ -0,0 +1,286 @@
+"""
+Headless HTTP API for resume analysis, GitHub profiles and RAG retrieval and chat
+
+Usage:
+    python app/api.py --host 0.0.0.0 --port 8000
+    uvicorn api:app --app-dir app --workers 2
+
+Blocking work (PDF parsing, GitHub and model calls) runs in a bounded thread
+pool under a per-request timeout; outbound HTTP goes through shared, pooled
+clients (one requests session for GitHub, one client per model).
+
+Worker processes share the caches, the RAG index and the candidate index
+in the cache directory, which are safe to use from several processes.
+/metrics, request coalescing and the GitHub budget are per worker.
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from config import ATS_ENGINE
+from pipeline import AnalysisError, run_analysis, score_text
+from utils.github_scheduler import get_scheduler
+from utils.github_utils import fetch_github_data
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+from utils.rag_utils import RAGSystem
+
+# Seconds a request may spend on its blocking work before it is answered with 504
+API_REQUEST_TIMEOUT = float(os.getenv("API_REQUEST_TIMEOUT", "120"))
+API_BATCH_TIMEOUT = float(os.getenv("API_BATCH_TIMEOUT", "600"))
+API_MAX_BATCH = int(os.getenv("API_MAX_BATCH", "50"))
+# Resumes of one batch request analysed at once
+API_BATCH_CONCURRENCY = int(os.getenv("API_BATCH_CONCURRENCY", "4"))
+# Requests doing blocking work at once across the process; more wait, up to their timeout
+API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "32"))
+
+ENGINES = ('llm', 'local')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+class APIError(Exception):
+    """Error answered with its status code and message"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool blocking request work runs on, API_MAX_CONCURRENCY threads wide"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=API_MAX_CONCURRENCY, thread_name_prefix="api")
+        return _executor
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, timeout: float = API_REQUEST_TIMEOUT) -> Any:
+    """
+    Run a blocking function in the API thread pool under a timeout
+
+    A timed-out call that is still queued is dropped. One that has started is
+    abandoned rather than interrupted: it keeps its thread, and so its place
+    in the concurrency limit, until it finishes, and its result is discarded.
+
+    Raises:
+        APIError: 504 when the timeout expires, including time spent waiting for a thread
+    """
+    future = asyncio.get_running_loop().run_in_executor(get_executor(), fn, *args)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        default_metrics.increment("api.timeouts")
+        raise APIError(504, f"Request timed out after {timeout:.0f}s")
+
+async def read_json(request: Request) -> Dict[str, Any]:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise APIError(400, "Request body must be JSON")
+    if not isinstance(body, dict):
+        raise APIError(400, "Request body must be a JSON object")
+    return body
+
+def _require(body: Dict[str, Any], name: str) -> Any:
+    value = body.get(name)
+    if value in (None, ""):
+        raise APIError(400, f"'{name}' is required")
+    return value
+
+def _engine(body: Dict[str, Any]) -> str:
+    engine = body.get('engine') or ATS_ENGINE
+    if engine not in ENGINES:
+        raise APIError(400, f"'engine' must be one of: {', '.join(ENGINES)}")
+    return engine
+
+def _pdf(value: str) -> bytes:
+    try:
+        return base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        raise APIError(400, "'resume_pdf' must be base64-encoded PDF bytes")
+
+def analyze_one(item: Dict[str, Any], jd: str, engine: str) -> Dict[str, Any]:
+    """
+    Analyse one resume given as {'resume_text'} or {'resume_pdf': base64}, with an optional 'github_username'
+
+    Returns:
+        Dict[str, Any]: analysis, github_data (repository list or None) and warnings
+
+    Raises:
+        APIError: 422 if the PDF has no text or the model's analysis is unusable
+    """
+    username = item.get('github_username')
+    try:
+        if item.get('resume_pdf'):
+            result = run_analysis(_pdf(item['resume_pdf']), jd, username, engine, item.get('name') or "resume.pdf")
+            return {key: result[key] for key in ('github_data', 'warnings')} | {'analysis': result['response_dict']}
+        text = _require(item, 'resume_text')
+        github_data = fetch_github_data(username) if username else None
+        warnings = [f"No public repositories found for user {username}"] if username and not github_data else []
+        return {
+            'analysis': score_text(text, jd, github_data, engine),
+            'github_data': github_data['repositories'] if github_data else None,
+            'warnings': warnings
+        }
+    except AnalysisError as e:
+        raise APIError(422, str(e))
+
+async def analyze(request: Request) -> JSONResponse:
+    """POST /analyze: JSON {resume_text | resume_pdf, job_description, github_username?, engine?} or a multipart form"""
+    if request.headers.get('content-type', '').startswith('multipart/form-data'):
+        form = await request.form()
+        upload = form.get('file')
+        if upload is None:
+            raise APIError(400, "'file' is required")
+        body = {
+            'resume_pdf': base64.b64encode(await upload.read()).decode('ascii'),
+            'name': upload.filename,
+            'job_description': form.get('job_description'),
+            'github_username': form.get('github_username'),
+            'engine': form.get('engine'),
+        }
+    else:
+        body = await read_json(request)
+    jd = _require(body, 'job_description')
+    engine = _engine(body)
+    if not body.get('resume_pdf'):
+        _require(body, 'resume_text')
+    return JSONResponse(await run_blocking(analyze_one, body, jd, engine))
+
+async def batch_analyze(request: Request) -> JSONResponse:
+    """POST /batch-analyze: {job_description, engine?, resumes: [{id?, resume_text | resume_pdf, github_username?}]}"""
+    body = await read_json(request)
+    jd = _require(body, 'job_description')
+    engine = _engine(body)
+    resumes = body.get('resumes')
+    if not isinstance(resumes, list) or not resumes:
+        raise APIError(400, "'resumes' must be a non-empty list")
+    if len(resumes) > API_MAX_BATCH:
+        raise APIError(413, f"At most {API_MAX_BATCH} resumes per batch")
+
+    semaphore = asyncio.Semaphore(API_BATCH_CONCURRENCY)
+
+    async def one(index: int, item: Any) -> Dict[str, Any]:
+        record = {'id': item.get('id', index) if isinstance(item, dict) else index, 'status': 'ok'}
+        async with semaphore:
+            try:
+                if not isinstance(item, dict):
+                    raise APIError(400, "Each resume must be an object")
+                record.update(await run_blocking(analyze_one, item, jd, engine))
+            except Exception as e:
+                record.update(status='error', error=e.message if isinstance(e, APIError) else str(e))
+        return record
+
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*(one(i, item) for i, item in enumerate(resumes))), API_BATCH_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        default_metrics.increment("api.timeouts")
+        raise APIError(504, f"Batch timed out after {API_BATCH_TIMEOUT:.0f}s")
+    summary = {'ok': sum(r['status'] == 'ok' for r in results), 'error': sum(r['status'] != 'ok' for r in results)}
+    return JSONResponse({'results': results, 'summary': summary})
+
+async def github_profile(request: Request) -> JSONResponse:
+    """GET /github-profile/{username}"""
+    username = request.path_params['username']
+    data = await run_blocking(fetch_github_data, username)
+    if not data:
+        raise APIError(404, f"No public repositories found for user {username}")
+    return JSONResponse(data)
+
+def _build_index(owner_id: str, body: Dict[str, Any]) -> int:
+    rag = RAGSystem(owner_id=owner_id)
+    github_data = body.get('github_data')
+    if isinstance(github_data, list):
+        github_data = {'repositories': github_data}
+    rag.process_documents(body['resume_text'], body['job_description'], github_data)
+    rag.create_embeddings_and_index()
+    return len(rag.documents)
+
+async def rag_index(request: Request) -> JSONResponse:
+    """POST /rag-index: {resume_text, job_description, github_data?, owner_id?}; returns the owner_id to query with"""
+    body = await read_json(request)
+    _require(body, 'resume_text')
+    _require(body, 'job_description')
+    owner_id = body.get('owner_id') or uuid.uuid4().hex
+    chunks = await run_blocking(_build_index, owner_id, body)
+    return JSONResponse({'owner_id': owner_id, 'chunks': chunks})
+
+def _query(owner_id: str, question: str, top_k: int, answer: bool) -> Dict[str, Any]:
+    rag = RAGSystem(owner_id=owner_id)
+    context = rag.retrieve_relevant_context(question, top_k=top_k)
+    result = {'context': context}
+    if answer:
+        result['answer'] = rag.generate_rag_response(question, context)
+    return result
+
+async def rag_query(request: Request) -> JSONResponse:
+    """POST /rag-query: {owner_id, question, top_k?, answer?}; answer=false returns retrieval only"""
+    body = await read_json(request)
+    owner_id = _require(body, 'owner_id')
+    question = _require(body, 'question')
+    try:
+        top_k = max(1, min(int(body.get('top_k', 5)), 50))
+    except (TypeError, ValueError):
+        raise APIError(400, "'top_k' must be an integer")
+    return JSONResponse(await run_blocking(_query, owner_id, question, top_k, body.get('answer', True) is not False))
+
+async def health(request: Request) -> JSONResponse:
+    return JSONResponse({'status': 'ok'})
+
+async def metrics(request: Request) -> JSONResponse:
+    return JSONResponse({**default_metrics.snapshot(), 'github_budget': get_scheduler().budget()})
+
+def _endpoint(handler: Callable) -> Callable:
+    """Turn APIErrors and unexpected failures into JSON error responses and count requests"""
+    name = handler.__name__
+
+    async def wrapped(request: Request) -> JSONResponse:
+        default_metrics.increment(f"api.{name}.requests")
+        try:
+            with default_metrics.timer(f"api.{name}"):
+                return await handler(request)
+        except APIError as e:
+            default_metrics.increment(f"api.{name}.errors")
+            return JSONResponse({'error': e.message}, status_code=e.status)
+        except Exception as e:
+            default_metrics.increment(f"api.{name}.errors")
+            logger.error(f"{request.method} {request.url.path} failed: {str(e)}")
+            return JSONResponse({'error': "Internal server error"}, status_code=500)
+
+    return wrapped
+
+app = Starlette(routes=[
+    Route('/analyze', _endpoint(analyze), methods=['POST']),
+    Route('/batch-analyze', _endpoint(batch_analyze), methods=['POST']),
+    Route('/github-profile/{username}', _endpoint(github_profile), methods=['GET']),
+    Route('/rag-index', _endpoint(rag_index), methods=['POST']),
+    Route('/rag-query', _endpoint(rag_query), methods=['POST']),
+    Route('/health', health, methods=['GET']),
+    Route('/metrics', metrics, methods=['GET']),
+])
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the Smart ATS HTTP API")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
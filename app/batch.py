@@ -0,0 +1,275 @@
+"""
+Headless batch screening of resumes against a single job description
+
+Usage:
+    python app/batch.py --jd jd.txt --input resumes/ --output results.jsonl
+    python app/batch.py --jd jd.txt --input resumes/ --output results.jsonl --engine triage --min-local-score 60
+"""
+import argparse
+import importlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from utils.pdf_utils import read_pdf_text
+from utils.inverted_index import InvertedIndex, get_candidate_index
+from models.gemini import score_resume
+from models.local_scorer import get_local_scorer, score_resume_local
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+
+def discover_resumes(source: str) -> List[str]:
+    """
+    Collect the PDF paths to screen
+
+    Args:
+        source: Directory searched recursively for PDFs, or a manifest file
+            listing one PDF path per line (relative paths resolve against
+            the manifest's directory, blank lines and '#' comments are skipped)
+
+    Returns:
+        List[str]: Sorted absolute PDF paths
+    """
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(root, name)
+            for root, _, files in os.walk(source)
+            for name in files
+            if name.lower().endswith('.pdf')
+        ]
+    else:
+        base_dir = os.path.dirname(os.path.abspath(source))
+        with open(source, encoding='utf-8') as manifest:
+            paths = [
+                os.path.join(base_dir, line.strip())
+                for line in manifest
+                if line.strip() and not line.startswith('#')
+            ]
+    return sorted(os.path.abspath(path) for path in paths)
+
+def load_completed(journal_path: str) -> Set[str]:
+    """
+    Read the paths already screened successfully in a previous run
+
+    Args:
+        journal_path: JSONL results file
+
+    Returns:
+        Set[str]: Paths with an 'ok' record; a line truncated by a killed run is ignored
+    """
+    completed = set()
+    if not os.path.exists(journal_path):
+        return completed
+    with open(journal_path, encoding='utf-8') as journal:
+        for line in journal:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get('status') == 'ok':
+                completed.add(record['path'])
+    return completed
+
+ENGINES = ('llm', 'local', 'triage')
+
+def make_scorer(engine: str = 'llm', min_local_score: float = 60.0) -> Callable[[str, str], str]:
+    """
+    Build the scoring function for an engine
+
+    Args:
+        engine: 'llm' (Gemini), 'local' (deterministic scorer) or 'triage'
+            (local scorer first, Gemini only for resumes reaching min_local_score)
+        min_local_score: Local JD Match percentage a resume needs to be sent to the LLM in triage mode
+
+    Returns:
+        Callable[[str, str], str]: Function returning the JSON analysis string for (text, jd)
+    """
+    if engine == 'llm':
+        return score_resume
+    if engine == 'local':
+        return score_resume_local
+    if engine != 'triage':
+        raise ValueError(f"Unknown scoring engine: {engine}")
+
+    def triage(text: str, jd: str) -> str:
+        local = get_local_scorer(jd).score(text)
+        if float(local['JD Match'].rstrip('%')) < min_local_score:
+            return json.dumps({**local, 'Engine': 'local'})
+        result = json.loads(score_resume(text, jd))
+        return json.dumps({**result, 'LocalMatch': local['JD Match'], 'Engine': 'llm'})
+
+    return triage
+
+def screen_resume(
+    path: str,
+    jd: str,
+    scorer: Callable[[str, str], str] = score_resume,
+    index: Optional[InvertedIndex] = None,
+    extractor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """
+    Extract, score and parse a single resume
+
+    Args:
+        path: PDF path
+        jd: Job description text
+        scorer: Function returning the JSON analysis string for (text, jd)
+        index: Candidate index the extracted text is added to, keyed by path
+        extractor: Process pool PDF parsing is offloaded to (cached texts skip it)
+
+    Returns:
+        Dict[str, Any]: Result record with status, parsed result or error, and timing
+    """
+    start = time.perf_counter()
+    record = {'path': path, 'status': 'ok', 'result': None, 'error': None}
+    try:
+        text = read_pdf_text(path, executor=extractor)
+        if not text or not text.strip():
+            raise ValueError("No text could be extracted from the PDF")
+        if index is not None:
+            index.add_document(path, text, {'path': path})
+        record['result'] = json.loads(scorer(text, jd))
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = str(e)
+    record['elapsed'] = round(time.perf_counter() - start, 3)
+    return record
+
+def _journal_path(output: str) -> str:
+    """Results are always streamed as JSONL; Parquet output is converted at the end"""
+    if output.endswith('.parquet'):
+        return output + '.partial.jsonl'
+    return output
+
+def _check_parquet_engine() -> None:
+    """Fail before screening, not after it, when pandas has no Parquet engine"""
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            importlib.import_module(engine)
+            return
+        except ImportError:
+            continue
+    raise RuntimeError("Parquet output requires pyarrow: pip install pyarrow")
+
+def _write_parquet(journal_path: str, output: str) -> None:
+    """Convert the JSONL journal into a Parquet file, keeping the latest record per path"""
+    import pandas as pd
+
+    records = {}
+    with open(journal_path, encoding='utf-8') as journal:
+        for line in journal:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record['path']] = record
+    df = pd.json_normalize(list(records.values()))
+    df.to_parquet(output, index=False)
+
+def screen_resumes(
+    paths: Iterable[str],
+    jd: str,
+    output: str,
+    max_workers: int = 4,
+    resume: bool = True,
+    scorer: Callable[[str, str], str] = score_resume,
+    index: Optional[InvertedIndex] = None
+) -> Dict[str, int]:
+    """
+    Screen resumes through a bounded worker pool, streaming results as they finish
+
+    Args:
+        paths: PDF paths to screen
+        jd: Job description text
+        output: Results file (.jsonl, or .parquet)
+        max_workers: Number of concurrent workers
+        resume: Skip paths already screened successfully in the results file
+        scorer: Function returning the JSON analysis string for (text, jd)
+        index: Candidate index extracted texts are added to for later searches
+
+    Returns:
+        Dict[str, int]: Counts of ok, failed and skipped resumes
+
+    Raises:
+        RuntimeError: If output is .parquet and no Parquet engine is installed
+    """
+    journal_path = _journal_path(output)
+    if output != journal_path:
+        _check_parquet_engine()
+    if not resume and os.path.exists(journal_path):
+        os.remove(journal_path)
+    completed = load_completed(journal_path)
+    pending = [path for path in paths if path not in completed]
+    summary = {'ok': 0, 'error': 0, 'skipped': len(completed)}
+    logger.info(f"Screening {len(pending)} resumes with {max_workers} workers ({len(completed)} already done)")
+
+    # A killed run can leave a partial last line; start on a fresh one
+    needs_newline = False
+    if os.path.exists(journal_path) and os.path.getsize(journal_path) > 0:
+        with open(journal_path, 'rb') as journal:
+            journal.seek(-1, os.SEEK_END)
+            needs_newline = journal.read(1) != b'\n'
+
+    # Threads wait on the LLM; PDF parsing is CPU-bound, so it runs in a process pool alongside them
+    with open(journal_path, 'a', encoding='utf-8') as journal, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor, \
+            ProcessPoolExecutor(max_workers=max_workers) as extractor:
+        if needs_newline:
+            journal.write('\n')
+        queue = iter(pending)
+        in_flight = set()
+        max_in_flight = max_workers * 2
+        while True:
+            # Keep the queue bounded so huge pools do not materialise every future up front
+            for path in queue:
+                in_flight.add(executor.submit(screen_resume, path, jd, scorer, index, extractor))
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                summary[record['status']] += 1
+                journal.write(json.dumps(record) + '\n')
+                journal.flush()
+                if record['status'] != 'ok':
+                    logger.warning(f"Failed to screen {record['path']}: {record['error']}")
+
+    if output != journal_path:
+        _write_parquet(journal_path, output)
+    logger.info(f"Batch screening finished: {summary}")
+    return summary
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Screen a pool of resumes against one job description")
+    parser.add_argument('--jd', required=True, help="Path to the job description text file")
+    parser.add_argument('--input', required=True, help="Directory of PDFs or manifest file with one PDF path per line")
+    parser.add_argument('--output', required=True, help="Results file (.jsonl or .parquet)")
+    parser.add_argument('--workers', type=int, default=4, help="Number of concurrent workers")
+    parser.add_argument('--no-resume', action='store_true', help="Start over instead of skipping finished resumes")
+    parser.add_argument('--engine', choices=ENGINES, default='llm',
+                        help="Scoring engine: Gemini, the local scorer, or local triage before Gemini")
+    parser.add_argument('--min-local-score', type=float, default=60.0,
+                        help="Local JD Match percentage needed to reach the LLM with --engine triage")
+    parser.add_argument('--no-index', action='store_true',
+                        help="Do not add extracted resumes to the searchable candidate index")
+    args = parser.parse_args(argv)
+
+    with open(args.jd, encoding='utf-8') as jd_file:
+        jd = jd_file.read()
+    paths = discover_resumes(args.input)
+    summary = screen_resumes(
+        paths, jd, args.output, max_workers=args.workers, resume=not args.no_resume,
+        scorer=make_scorer(args.engine, args.min_local_score),
+        index=None if args.no_index else get_candidate_index()
+    )
+    # How often LLM output needed syntax or field repairs, or could not be used at all
+    counters = default_metrics.snapshot()['counters']
+    summary.update({name: value for name, value in counters.items() if name.startswith('llm_json.')})
+    print(json.dumps(summary))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Search the candidate pool indexed by batch screening and the app
+
+Usage:
+    python app/candidate_search.py "Python AND Spark AND NOT intern" --top 20
+"""
+import argparse
+import json
+from typing import List, Optional
+
+from utils.inverted_index import get_candidate_index
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query indexed resumes with AND/OR/NOT and BM25 ranking")
+    parser.add_argument('query', help='Boolean query, e.g. "k8s AND (AWS OR GCP) AND NOT intern"')
+    parser.add_argument('--top', type=int, default=10, help="Number of ranked results")
+    parser.add_argument('--count', action='store_true', help="Only print the number of matching candidates")
+    args = parser.parse_args(argv)
+
+    index = get_candidate_index()
+    if args.count:
+        print(len(index.match(args.query)))
+        return
+    for result in index.search(args.query, top_k=args.top):
+        print(json.dumps({'key': result['key'], 'score': round(result['score'], 3), **result['metadata']}))
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,12 @@ from .visualizations import (
     create_keyword_table
 )
 
+def display_job_progress(job):
+    """Render a background job's current stage and any output it has streamed so far"""
+    st.caption(job.stage or "Waiting for a free worker...")
+    if job.partial:
+        st.code(job.partial, language="json")
+
 def display_github_project(project, languages, stars, forks):
     """Display individual GitHub project details"""
     with st.expander(f"📂 {project['ProjectName']} - Relevance: {project['Relevance']}"):
@@ -111,6 +117,7 @@ def display_results(response_dict, github_data=None, include_github=False):
                     df,
                     column_config={
                         "Missing Keywords": st.column_config.TextColumn("Missing Keywords", width="medium"),
+                        "Category": st.column_config.TextColumn("Category", width="small"),
                         "Impact": st.column_config.TextColumn("Impact Level", width="small"),
                         "Suggested Implementation": st.column_config.TextColumn("Where to Add", width="large")
                     },
@@ -0,0 +1,33 @@
+import streamlit as st
+from config import ATS_ENGINE, GOOGLE_API_KEY
+from utils.hooks import add_error_reporter
+
+# Page configuration
+def setup_page():
+    """Configure the Streamlit page settings and show core errors on the page"""
+    st.set_page_config(
+        page_title="Smart ATS - Resume Analyzer",
+        page_icon="📝",
+        layout="wide"
+    )
+    # Errors the core reports from this script's thread are rendered with st.error;
+    # background jobs keep theirs on the job, which wait_for_job renders
+    add_error_reporter(st.error, current_thread=True)
+    if not GOOGLE_API_KEY and ATS_ENGINE == "llm":
+        st.error("Please set up your Gemini API key in the app settings")
+
+# Session state initialization
+def init_session_state():
+    """Initialize the session state if not already done"""
+    if 'current_state' not in st.session_state:
+        reset_session_state()
+
+def reset_session_state():
+    st.session_state.current_state = {
+        'analysis_complete': False,
+        'response_dict': None,
+        'github_data': None,
+        'include_github': False,
+        'resume_text': None,
+        'jd_text': None
+    }
@@ -1,5 +1,5 @@
 import streamlit as st
-from config import reset_session_state
+from .session import reset_session_state
 
 def render_sidebar():
     """Render the sidebar with file upload and input fields"""
@@ -1,5 +1,17 @@
 import plotly.express as px
 import pandas as pd
+from utils.skill_taxonomy import get_taxonomy
+
+# Where a missing skill of each taxonomy category belongs on the resume
+CATEGORY_SUGGESTIONS = {
+    'language': 'Add to Skills/Technologies section',
+    'framework': 'Add to Skills/Technologies section',
+    'tool': 'Add to Skills/Technologies section',
+    'cloud': 'Add to Skills/Technologies section',
+    'database': 'Add to Skills/Technologies section',
+    'concept': 'Add to Project Highlights',
+    'soft': 'Include in Work Experience',
+}
 
 def create_keyword_chart(keywords):
     """Create bar chart for missing keywords"""
@@ -51,19 +63,42 @@ def create_project_relevance_chart(projects):
                  barmode='group')
     return fig
 
+def _keyword_suggestion(keyword):
+    """Placement hint for a keyword the skill taxonomy does not know"""
+    kw = keyword.lower()
+    if 'experience' in kw or 'year' in kw:
+        return 'Include in Work Experience'
+    if 'project' in kw or 'develop' in kw:
+        return 'Add to Project Highlights'
+    return 'General Addition'
+
+def _impact(weight):
+    return 'High' if weight >= 1.0 else 'Medium' if weight >= 0.8 else 'Low'
+
 def create_keyword_table(keywords):
-    """Create table for missing keywords"""
+    """Create table for missing keywords, classified through the skill taxonomy"""
     if not keywords:
         return None
-    df = pd.DataFrame({
-        'Missing Keywords': keywords,
-        'Impact': ['High'] * len(keywords),
-        'Suggested Implementation': [
-            'Add to Skills/Technologies section' if 'framework' in kw.lower() or 'language' in kw.lower() or 'tool' in kw.lower()
-            else 'Include in Work Experience' if 'experience' in kw.lower() or 'year' in kw.lower()
-            else 'Add to Project Highlights' if 'project' in kw.lower() or 'develop' in kw.lower()
-            else 'General Addition'
-            for kw in keywords
-        ]
-    })
-    return df 
\ No newline at end of file
+    taxonomy = get_taxonomy()
+    rows = []
+    for kw in keywords:
+        skill = taxonomy.canonical(kw)
+        if skill:
+            rows.append({
+                'Missing Keywords': kw,
+                'Category': taxonomy.category(skill).title(),
+                'Impact': _impact(taxonomy.weight(skill)),
+                'Suggested Implementation': CATEGORY_SUGGESTIONS.get(taxonomy.category(skill), 'General Addition'),
+                'weight': taxonomy.weight(skill)
+            })
+        else:
+            rows.append({
+                'Missing Keywords': kw,
+                'Category': 'Other',
+                'Impact': 'High',
+                'Suggested Implementation': _keyword_suggestion(kw),
+                'weight': 1.0
+            })
+    # Most important keywords first; ties keep the order they were reported in
+    df = pd.DataFrame(rows).sort_values('weight', ascending=False, kind='stable')
+    return df.drop(columns='weight').reset_index(drop=True)
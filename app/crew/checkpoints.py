@@ -0,0 +1,109 @@
+"""
+Persistent checkpoints of crew task outputs
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from utils.cache_utils import SQLiteCache
+from utils.hooks import open_cache
+
+# Default lifetime of a checkpoint, and of research outputs shared across candidates
+CREW_CHECKPOINT_TTL = float(os.getenv("CREW_CHECKPOINT_TTL", str(7 * 24 * 3600)))
+CREW_RESEARCH_TTL = float(os.getenv("CREW_RESEARCH_TTL", str(24 * 3600)))
+
+# Part of every key, so a change in how outputs are stored invalidates old checkpoints
+CHECKPOINT_VERSION = "1"
+
+_store = None
+_store_lock = threading.Lock()
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def _template(task: Any, field: str) -> Optional[str]:
+    """A task field as written, before CrewAI interpolated inputs into it"""
+    return getattr(task, f'_original_{field}', None) or getattr(task, field, None)
+
+class CheckpointStore:
+    """
+    Task outputs keyed by a hash of the task definition, its inputs and its upstream outputs
+
+    A rerun with the same inputs finds every finished task's checkpoint and
+    only executes from the first task whose key changed. Tasks can be scoped
+    to a subset of the inputs (e.g. research to the company and job
+    description), so their output is shared by every candidate applying to
+    the same job.
+    """
+
+    def __init__(self, cache: Optional[SQLiteCache] = None, ttls: Optional[Mapping[str, float]] = None,
+                 input_keys: Optional[Mapping[str, Sequence[str]]] = None, default_ttl: float = CREW_CHECKPOINT_TTL):
+        """
+        Args:
+            cache: Backing store, defaults to crew_checkpoints.sqlite in the cache directory
+            ttls: Lifetime in seconds by task name, overriding default_ttl
+            input_keys: Inputs each task's key depends on, by task name; other tasks use every input
+            default_ttl: Lifetime in seconds of other tasks' checkpoints
+        """
+        self.cache = cache or open_cache("crew_checkpoints.sqlite")
+        self.ttls = dict(ttls or {})
+        self.input_keys = {name: tuple(keys) for name, keys in (input_keys or {}).items()}
+        self.default_ttl = default_ttl
+
+    def key(self, name: str, task: Any, inputs: Mapping[str, Any], upstream: Mapping[str, str]) -> str:
+        """
+        Checkpoint key of a task run
+
+        Args:
+            name: Task name
+            task: Task object; its description and expected output templates are part of the key
+            inputs: Crew inputs
+            upstream: Output text of each upstream task, by name
+
+        Returns:
+            str: Hex digest
+        """
+        scope = self.input_keys.get(name)
+        scoped_inputs = {k: v for k, v in inputs.items() if scope is None or k in scope}
+        return _digest({
+            'version': CHECKPOINT_VERSION,
+            'task': name,
+            'description': _template(task, 'description'),
+            'expected_output': _template(task, 'expected_output'),
+            'inputs': scoped_inputs,
+            'upstream': {dep: _digest(text) for dep, text in upstream.items()},
+        })
+
+    def get(self, key: str) -> Optional[str]:
+        """Checkpointed output text, or None when missing or expired"""
+        record = self.cache.get_json(f"crew:{key}")
+        return record['output'] if record else None
+
+    def put(self, key: str, name: str, output: str) -> None:
+        """Checkpoint a task's output text for its configured lifetime"""
+        self.cache.set_json(
+            f"crew:{key}",
+            {'task': name, 'output': output, 'created_at': time.time()},
+            ttl=self.ttls.get(name, self.default_ttl)
+        )
+
+def get_checkpoint_store(ttls: Optional[Mapping[str, float]] = None,
+                         input_keys: Optional[Mapping[str, Sequence[str]]] = None) -> CheckpointStore:
+    """
+    Return the process-wide checkpoint store
+
+    Args:
+        ttls: Per-task lifetimes, applied when the store is first created
+        input_keys: Per-task input scopes, applied when the store is first created
+
+    Returns:
+        CheckpointStore: Shared store
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore(ttls=ttls, input_keys=input_keys)
+        return _store
@@ -0,0 +1,192 @@
+"""
+Dependency-driven execution of crew tasks
+"""
+import copy
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from crew.checkpoints import CheckpointStore
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+
+CREW_MAX_WORKERS = int(os.getenv("CREW_MAX_WORKERS", "3"))
+
+# Runs one task given its upstream outputs (by task name) and the crew inputs, returning its output
+TaskRunner = Callable[[Any, Dict[str, Any], Dict[str, Any]], Any]
+
+@dataclass
+class StageTiming:
+    """When a task started (seconds after kickoff) and how long it ran"""
+    start: float
+    seconds: float
+
+@dataclass
+class DAGResult:
+    """Outputs and timings of a scheduler run, keyed by task name"""
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, StageTiming] = field(default_factory=dict)
+    total: float = 0.0
+    # Tasks whose output came from a checkpoint instead of running
+    resumed: List[str] = field(default_factory=list)
+
+    @property
+    def final(self) -> Any:
+        """Output of the task that finished last"""
+        if not self.timings:
+            return None
+        name = max(self.timings, key=lambda n: self.timings[n].start + self.timings[n].seconds)
+        return self.outputs[name]
+
+def _output_text(output: Any) -> str:
+    """Plain text of a task output (CrewAI TaskOutput or a string)"""
+    return str(getattr(output, 'raw', output))
+
+def run_crewai_task(task: Any, upstream: Dict[str, Any], inputs: Dict[str, Any]) -> Any:
+    """
+    Execute a CrewAI task with its upstream outputs as context
+
+    Args:
+        task: crewai.Task; it is left unchanged
+        upstream: Outputs of the tasks in task.context, by name
+        inputs: Values interpolated into the task description
+
+    Returns:
+        Any: The task output
+    """
+    if inputs and hasattr(task, 'interpolate_inputs'):
+        # The Task objects are shared by every kickoff; fill the inputs into this run's copy
+        task = copy.copy(task)
+        task.interpolate_inputs(inputs)
+    context = "\n\n".join(_output_text(output) for output in upstream.values()) or None
+    if hasattr(task, 'execute_sync'):
+        return task.execute_sync(agent=task.agent, context=context)
+    return task.execute(agent=task.agent, context=context)
+
+class DAGScheduler:
+    """
+    Runs tasks as soon as every task in their `context` has finished
+
+    Independent tasks run concurrently on a bounded thread pool, so a crew
+    declared as research -> (profiling, GitHub analysis) -> strategy only
+    waits where an output is actually consumed. Each task's duration is
+    observed under 'crew.stage.<name>' in the default metrics registry.
+
+    With a checkpoint store, finished outputs are saved as each task
+    completes and reused on the next run while the task's inputs and
+    upstream outputs are unchanged, so a failed run resumes where it broke.
+    """
+
+    def __init__(self, tasks: Mapping[str, Any], max_workers: int = CREW_MAX_WORKERS,
+                 runner: TaskRunner = run_crewai_task, checkpoints: Optional[CheckpointStore] = None):
+        """
+        Args:
+            tasks: Task objects by name; dependencies come from each task's `context` list
+            max_workers: Tasks running at once
+            runner: Function executing one task, see TaskRunner
+            checkpoints: Store task outputs are saved to and resumed from
+
+        Raises:
+            ValueError: If a context task is not in tasks or the dependencies form a cycle
+        """
+        self.tasks = dict(tasks)
+        self.max_workers = max(1, max_workers)
+        self.runner = runner
+        self.checkpoints = checkpoints
+        names = {id(task): name for name, task in self.tasks.items()}
+        self.dependencies: Dict[str, List[str]] = {}
+        for name, task in self.tasks.items():
+            deps = []
+            for upstream in getattr(task, 'context', None) or []:
+                if id(upstream) not in names:
+                    raise ValueError(f"Task '{name}' depends on a task that is not scheduled")
+                deps.append(names[id(upstream)])
+            self.dependencies[name] = deps
+        self.stages = self._stages()
+
+    def _stages(self) -> List[List[str]]:
+        """Tasks grouped by dependency depth; tasks within a stage are independent"""
+        stages, placed = [], set()
+        while len(placed) < len(self.tasks):
+            ready = [name for name in self.tasks
+                     if name not in placed and all(dep in placed for dep in self.dependencies[name])]
+            if not ready:
+                cycle = sorted(set(self.tasks) - placed)
+                raise ValueError(f"Task dependencies form a cycle among: {', '.join(cycle)}")
+            stages.append(ready)
+            placed.update(ready)
+        return stages
+
+    def kickoff(self, inputs: Optional[Dict[str, Any]] = None) -> DAGResult:
+        """
+        Run every task, respecting dependencies
+
+        Args:
+            inputs: Values passed to each task (CrewAI interpolates them into descriptions)
+
+        Returns:
+            DAGResult: Outputs and timings by task name
+
+        Raises:
+            RuntimeError: If a task fails; tasks already running finish, dependents are not started
+        """
+        inputs = inputs or {}
+        result = DAGResult()
+        remaining = {name: set(deps) for name, deps in self.dependencies.items()}
+        running: Dict[Future, str] = {}
+        failure = None
+        kickoff = time.perf_counter()
+        logger.info(f"Crew stages: {' -> '.join('(' + ', '.join(stage) + ')' for stage in self.stages)}")
+
+        def run(name: str) -> Any:
+            start = time.perf_counter()
+            try:
+                upstream = {dep: result.outputs[dep] for dep in self.dependencies[name]}
+                if self.checkpoints is None:
+                    return self.runner(self.tasks[name], upstream, inputs)
+                key = self.checkpoints.key(
+                    name, self.tasks[name], inputs, {dep: _output_text(output) for dep, output in upstream.items()}
+                )
+                cached = self.checkpoints.get(key)
+                if cached is not None:
+                    default_metrics.increment("crew.checkpoint_hits")
+                    result.resumed.append(name)
+                    return cached
+                output = self.runner(self.tasks[name], upstream, inputs)
+                self.checkpoints.put(key, name, _output_text(output))
+                return output
+            finally:
+                seconds = time.perf_counter() - start
+                result.timings[name] = StageTiming(start - kickoff, seconds)
+                default_metrics.observe(f"crew.stage.{name}", seconds)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining or running:
+                if failure is None:
+                    for name in [name for name, deps in remaining.items() if not deps]:
+                        del remaining[name]
+                        running[executor.submit(run, name)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        logger.error(f"Crew task '{name}' failed: {str(error)}")
+                        failure = failure or (name, error)
+                        continue
+                    result.outputs[name] = future.result()
+                    source = "from checkpoint" if name in result.resumed else "in"
+                    logger.info(f"Crew task '{name}' finished {source} {result.timings[name].seconds:.2f}s")
+                    for deps in remaining.values():
+                        deps.discard(name)
+
+        result.total = time.perf_counter() - kickoff
+        default_metrics.observe("crew.total", result.total)
+        if failure is not None:
+            name, error = failure
+            raise RuntimeError(f"Crew task '{name}' failed: {error}") from error
+        return result
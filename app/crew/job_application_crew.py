@@ -1,35 +1,54 @@
-from agents.InterviewPreparer import interview_preparer
-from agents.CandidateProfiler import profiler_agent
-from agents.GithubAnalyzer import github_analyzer
-from agents.JobResearcher import job_researcher
-from agents.ResumeStrategist import resume_strategist
-from tasks.github_analyzer_task import github_analysis_task
-from tasks.interview_preparation_task import interview_prep_task
-from tasks.profile_task import profiling_task
-from tasks.research_task import research_task
-from tasks.resume_strategy_task import resume_strategy_task
-from crewai import Crew, Process
-
-
-
-
-
-job_application_crew = Crew(
-    agents=[
-        job_researcher,
-        profiler_agent, 
-        github_analyzer,
-        resume_strategist,
-        interview_preparer
-    ],
-    tasks=[
-        research_task,
-        profiling_task,
-        github_analysis_task, 
-        resume_strategy_task,
-        interview_prep_task
-    ],
-    process=Process.sequential,  # Execute in order
-    memory=True,  # Enable shared memory across all agents
-    verbose=True
-)
\ No newline at end of file
+import threading
+
+from crew.checkpoints import CREW_RESEARCH_TTL, get_checkpoint_store
+from crew.dag_scheduler import CREW_MAX_WORKERS, DAGScheduler
+
+_crew = None
+_crew_lock = threading.Lock()
+
+def build_job_application_crew() -> DAGScheduler:
+    """
+    Build the job application crew; CrewAI, the agents and their tools are imported and built here
+
+    Tasks run as soon as the tasks in their `context` have finished, up to
+    CREW_MAX_WORKERS at once, instead of strictly in list order. Outputs are
+    checkpointed, so a rerun resumes from the first task whose inputs changed.
+
+    Returns:
+        DAGScheduler: The crew
+    """
+    from tasks.github_analyzer_task import github_analysis_task
+    from tasks.interview_preparation_task import interview_prep_task
+    from tasks.profile_task import profiling_task
+    from tasks.research_task import research_task
+    from tasks.resume_strategy_task import resume_strategy_task
+
+    return DAGScheduler(
+        tasks={
+            'research': research_task,
+            'profiling': profiling_task,
+            'github_analysis': github_analysis_task,
+            'resume_strategy': resume_strategy_task,
+            'interview_prep': interview_prep_task
+        },
+        max_workers=CREW_MAX_WORKERS,
+        checkpoints=get_checkpoint_store(
+            # Research depends only on the job, so candidates applying to the same one share it for a day
+            ttls={'research': CREW_RESEARCH_TTL},
+            input_keys={'research': ('company', 'job_url', 'job_description')}
+        )
+    )
+
+def get_job_application_crew() -> DAGScheduler:
+    """Return the process-wide crew, building it on first use"""
+    global _crew
+    with _crew_lock:
+        if _crew is None:
+            _crew = build_job_application_crew()
+        return _crew
+
+def __getattr__(name):
+    # Importing this module stays cheap; `job_application_crew` is built on first access
+    if name == 'job_application_crew':
+        return get_job_application_crew()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
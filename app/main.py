@@ -1,16 +1,20 @@
 import streamlit as st
-import json
 import os
-from config import setup_page, init_session_state
-from utils.pdf_utils import extract_text_from_pdf
-from utils.github_utils import fetch_github_data
-from models.gemini import analyze_resume
-from components.display import display_results
+import time
+import uuid
+from config import STREAM_RESPONSES, ATS_ENGINE
+from components.session import setup_page, init_session_state
+from utils.pdf_utils import pdf_bytes
+from components.display import display_results, display_job_progress
 from components.sidebar import render_sidebar
 from utils.logging_utils import default_logger as logger
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
-from utils.rag_utils import RAGSystem
+from utils.job_queue import FAILED, QueueFullError, get_job_queue
+from pipeline import analysis_key, build_rag, run_analysis
+
+# Seconds between status checks while a background job runs
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "0.3"))
 
 def main():
     # Setup page and initialize session state
@@ -23,7 +27,7 @@ def main():
     uploaded_file, jd, github_username, submit = render_sidebar()
     
     # Main content area
-    if not st.session_state.current_state['analysis_complete'] and not submit:
+    if not st.session_state.current_state['analysis_complete'] and not submit and 'analysis_job' not in st.session_state:
         # Landing page content
         st.title("🚀 Welcome to Smart ATS")
         st.markdown("""
@@ -50,48 +54,45 @@ def main():
             logger.warning("Missing required inputs: resume or job description")
             st.error("Please upload your resume and provide the job description.")
             return
-        
-        logger.info("Starting resume analysis")
-        with st.spinner("Analyzing your resume..."):
-            # Extract text from PDF
-            logger.debug(f"Processing PDF file: {uploaded_file.name}")
-            logger.info("Extracting text from PDF")
 
-            text = extract_text_from_pdf(uploaded_file)
+        # Analysis runs on the shared job queue; this script only submits and polls,
+        # so widget interactions never restart the work
+        logger.info("Submitting resume analysis")
+        pdf_data = pdf_bytes(uploaded_file)
+        try:
+            job_id = get_job_queue().submit(
+                run_analysis, pdf_data, jd, github_username, ATS_ENGINE, uploaded_file.name,
+                kind="analysis", key=analysis_key(pdf_data, jd, github_username, ATS_ENGINE)
+            )
+        except QueueFullError:
+            logger.warning("Analysis rejected: job queue is full")
+            st.warning("The analyzer is busy right now. Please try again in a moment.")
+            return
+        st.session_state['analysis_job'] = job_id
+        # A new analysis gets a fresh chat
+        for key in ('rag_system', 'rag_job', 'rag_chat_history'):
+            st.session_state.pop(key, None)
 
-            if not text:
-                logger.error("Failed to extract text from PDF")
-                st.error("Could not extract text from the PDF. Please check the file.")
-                return
-            
-            # Fetch GitHub data if username provided
-            github_data = None
-            if github_username:
-                logger.info(f"Fetching GitHub data for {github_username}")
-                with st.spinner("Fetching GitHub data..."):
-                    github_data = fetch_github_data(github_username)
-                    if not github_data:
-                        logger.warning(f"No public repositories found for user {github_username}")
-                        st.warning(f"No public repositories found for user {github_username}")
-            
-            # Process the resume and update state
-            logger.info("Analyzing resume")
-            response = analyze_resume(text, jd, github_username if github_data else None)
-            if response:
-                try:
-                    response_dict = json.loads(response)
-                    st.session_state.current_state.update({
-                        'analysis_complete': True,
-                        'response_dict': response_dict,
-                        'github_data': github_data['repositories'] if github_data else None,
-                        'include_github': bool(github_data),
-                        'resume_text': text,
-                        'jd_text': jd
-                    })
-                except Exception as e:
-                    logger.error(f"Failed to parse analysis response: {str(e)}")
-                    st.error("An error occurred while analyzing your resume. Please try again.")
-                    return
+    if 'analysis_job' in st.session_state:
+        job = wait_for_job(st.session_state['analysis_job'])
+        del st.session_state['analysis_job']
+        if job is None:
+            st.error("The analysis is no longer available. Please submit it again.")
+            return
+        if job.status == FAILED:
+            st.error(f"Error in resume analysis: {job.error}")
+            return
+        result = job.result
+        for warning in result['warnings']:
+            st.warning(warning)
+        st.session_state.current_state.update({
+            'analysis_complete': True,
+            'response_dict': result['response_dict'],
+            'github_data': result['github_data'],
+            'include_github': result['include_github'],
+            'resume_text': result['resume_text'],
+            'jd_text': result['jd_text']
+        })
 
     # Display results if analysis is complete
     if st.session_state.current_state['analysis_complete']:
@@ -106,30 +107,72 @@ def main():
         st.markdown("---")
         st.header("💬 Ask Questions (RAG Chat)")
         if 'rag_system' not in st.session_state:
-            rag = RAGSystem()
-            rag.process_documents(
-                st.session_state.current_state['resume_text'],
-                st.session_state.current_state['jd_text'],
-                {'repositories': st.session_state.current_state['github_data']} if st.session_state.current_state['include_github'] else None
-            )
-            rag.create_embeddings_and_index()
-            st.session_state['rag_system'] = rag
-        else:
-            rag = st.session_state['rag_system']
+            # Index into the shared persisted index under this session's ID, in the background
+            if 'rag_owner_id' not in st.session_state:
+                st.session_state['rag_owner_id'] = uuid.uuid4().hex
+            if 'rag_job' not in st.session_state:
+                state = st.session_state.current_state
+                try:
+                    st.session_state['rag_job'] = get_job_queue().submit(
+                        build_rag, st.session_state['rag_owner_id'], state['resume_text'], state['jd_text'],
+                        state['github_data'] if state['include_github'] else None, kind="rag"
+                    )
+                except QueueFullError:
+                    st.info("Chat will be available once the analyzer is less busy.")
+                    return
+            job = wait_for_job(st.session_state['rag_job'])
+            del st.session_state['rag_job']
+            if job is None or job.status == FAILED:
+                st.error(f"Could not prepare the chat: {job.error if job else 'the job expired'}")
+                return
+            st.session_state['rag_system'] = job.result
+        rag = st.session_state['rag_system']
 
         if 'rag_chat_history' not in st.session_state:
             st.session_state['rag_chat_history'] = []
 
         user_message = st.text_input("Ask a question about your resume, job description, or GitHub profile:")
         if st.button("Ask") and user_message:
-            with st.spinner("Retrieving answer..."):
-                answer = rag.chat_with_rag(user_message)
+            if STREAM_RESPONSES:
+                # Stream into a placeholder; the history below renders the finished answer
+                live = st.empty()
+                with live.container():
+                    st.markdown(f"**You:** {user_message}")
+                    answer = st.write_stream(rag.chat_with_rag_stream(user_message))
+                live.empty()
                 st.session_state['rag_chat_history'].append((user_message, answer))
+            else:
+                with st.spinner("Retrieving answer..."):
+                    answer = rag.chat_with_rag(user_message)
+                    st.session_state['rag_chat_history'].append((user_message, answer))
 
         # Display chat history
         for user_msg, answer in st.session_state['rag_chat_history']:
             st.markdown(f"**You:** {user_msg}")
             st.markdown(f"**AI:** {answer}")
 
+def wait_for_job(job_id):
+    """
+    Poll a background job, rendering its progress, until it finishes, then show the errors it reported
+
+    Args:
+        job_id (str): Job ID from the job queue
+
+    Returns:
+        Job: Finished job snapshot, or None if it is unknown or expired
+    """
+    placeholder = st.empty()
+    while True:
+        job = get_job_queue().status(job_id)
+        if job is None or job.finished:
+            placeholder.empty()
+            if job is not None:
+                for message in job.errors:
+                    st.error(message)
+            return job
+        with placeholder.container():
+            display_job_progress(job)
+        time.sleep(JOB_POLL_INTERVAL)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,25 +1,68 @@
-import google.generativeai as genai
-import streamlit as st
+import json
+import os
+import time
 from config import GOOGLE_API_KEY
-from prompts.templates import ats_prompt, github_analysis_prompt
+from models.llm_gateway import get_gateway
+from prompts.builder import build_analysis_prompt as build_budgeted_prompt
+from utils.hooks import report_error
+from utils.json_utils import ATS_SCHEMA, GITHUB_ANALYSIS_SCHEMA, JSONStreamExtractor, parse_llm_json
 from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import timed_stream
 
-# Configure Gemini
-try:
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+
+def generate_response(input_prompt):
+    """
+    Get response from Gemini model without any Streamlit calls
+    
+    Responses are served from the gateway's persistent cache when possible,
+    and identical concurrent prompts share one upstream call.
+    
+    Args:
+        input_prompt (str): Formatted prompt for the model
+    
+    Returns:
+        str: Model's response text
+    
+    Raises:
+        RuntimeError: If the Gemini API key is not configured
+    """
+    if not GOOGLE_API_KEY:
+        raise RuntimeError("Gemini API key not configured")
+    
+    logger.debug("Generating content with prompt")
+    response = get_gateway().generate("gemini", GEMINI_MODEL, input_prompt)
+    
+    logger.debug("Successfully generated response")
+    return response
+
+def stream_gemini_response(input_prompt, complete=None):
+    """
+    Stream the Gemini response, yielding text chunks as they arrive
+    
+    Time-to-first-token and total latency are recorded under 'gemini.ttft'
+    and 'gemini.total' in the default metrics registry.
+    
+    Args:
+        input_prompt (str): Formatted prompt for the model
+        complete (callable, optional): Whether the text so far is a usable response,
+            so it is cached even if the caller stops reading early
+    
+    Yields:
+        str: Response text chunks
+    
+    Raises:
+        RuntimeError: If the Gemini API key is not configured
+    """
     if not GOOGLE_API_KEY:
-        logger.error("Gemini API key not found in environment variables")
-        st.error("Please set up your Gemini API key in the app settings")
-    else:
-        genai.configure(api_key=GOOGLE_API_KEY)
-        logger.info("Gemini API configured successfully")
-except Exception as e:
-    logger.error(f"Failed to configure Gemini API: {str(e)}")
-    st.error("Error configuring Gemini API. Please check your API key.")
+        raise RuntimeError("Gemini API key not configured")
+    
+    start = time.perf_counter()
+    yield from timed_stream(get_gateway().stream("gemini", GEMINI_MODEL, input_prompt, complete=complete), "gemini", start=start)
 
-@st.cache_data(ttl=3600)
 def get_gemini_response(input_prompt):
     """
-    Get response from Gemini model with caching
+    Get response from Gemini model with caching, passing errors to the error reporters
     
     Args:
         input_prompt (str): Formatted prompt for the model
@@ -31,22 +74,67 @@ def get_gemini_response(input_prompt):
         if not GOOGLE_API_KEY:
             logger.error("Cannot generate response: Gemini API key not configured")
             return None
-            
-        logger.debug("Creating Gemini model instance")
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        logger.debug("Generating content with prompt")
-        response = model.generate_content(input_prompt)
-        
-        logger.debug("Successfully generated response")
-        return response.text
+        return generate_response(input_prompt)
         
     except Exception as e:
-        error_msg = f"Error getting Gemini response: {str(e)}"
-        logger.error(error_msg)
-        st.error(error_msg)
+        report_error(f"Error getting Gemini response: {str(e)}")
         return None
 
+def build_analysis_prompt(text, jd, github_data=None):
+    """
+    Build the analysis prompt with or without GitHub data
+    
+    The prompt is assembled within per-field token budgets: only relevant
+    resume sections are sent, JD boilerplate is dropped and repositories are
+    reduced to compact entries with README summaries ranked by relevance.
+    
+    Args:
+        text (str): Resume text
+        jd (str): Job description
+        github_data (dict, optional): GitHub repository data
+    
+    Returns:
+        str: Formatted prompt
+    """
+    return build_budgeted_prompt(text, jd, github_data).prompt
+
+def parse_analysis(response, with_github=False):
+    """
+    Parse the analysis JSON out of a model response
+    
+    Prose, code fences and common syntax mistakes around the object are
+    tolerated; fields that are missing or malformed are requested again from
+    the model, without the rest of the analysis.
+    
+    Args:
+        response (str): Raw model response
+        with_github (bool): Validate against the GitHub analysis shape
+    
+    Returns:
+        dict: Validated analysis
+    
+    Raises:
+        ValueError: If no valid analysis can be recovered
+    """
+    schema = GITHUB_ANALYSIS_SCHEMA if with_github else ATS_SCHEMA
+    return parse_llm_json(response, schema, repair=generate_response if GOOGLE_API_KEY else None)
+
+def clean_response(response, with_github=False):
+    """
+    Normalise a model response to the analysis JSON string
+    
+    Args:
+        response (str): Raw model response
+        with_github (bool): Validate against the GitHub analysis shape
+    
+    Returns:
+        str: Validated JSON response string
+    
+    Raises:
+        ValueError: If no valid analysis can be recovered
+    """
+    return json.dumps(parse_analysis(response, with_github))
+
 def analyze_resume(text, jd, github_data=None):
     """
     Analyze resume with or without GitHub data
@@ -60,29 +148,62 @@ def analyze_resume(text, jd, github_data=None):
         str: JSON response string from Gemini, or None if analysis fails
     """
     try:
-        if github_data:
-            prompt = github_analysis_prompt.format(
-                text=text,
-                jd=jd,
-                github_data=github_data
-            )
-        else:
-            prompt = ats_prompt.format(
-                text=text,
-                jd=jd
-            )
+        prompt = build_analysis_prompt(text, jd, github_data)
         
         response = get_gemini_response(prompt)
         if not response:
             return None
             
-        # Clean the response
-        response = response.strip()
-        if response.startswith("```json"):
-            response = response[7:-3]
-            
-        return response
+        # Extract and validate the JSON analysis
+        return clean_response(response, bool(github_data))
         
     except Exception as e:
-        st.error(f"Error in resume analysis: {str(e)}")
-        return None 
\ No newline at end of file
+        report_error(f"Error in resume analysis: {str(e)}")
+        return None
+
+def has_json_object(text):
+    """Whether text contains a complete top-level JSON object"""
+    return JSONStreamExtractor().feed(text) is not None
+
+def stream_analysis(text, jd, github_data=None):
+    """
+    Streaming variant of analyze_resume
+    
+    Args:
+        text (str): Resume text
+        jd (str): Job description
+        github_data (dict, optional): GitHub repository data
+    
+    Yields:
+        str: Raw response text chunks, ending once the JSON object is complete;
+            pass the joined text through clean_response
+    """
+    extractor = JSONStreamExtractor()
+    chunks = stream_gemini_response(build_analysis_prompt(text, jd, github_data), complete=has_json_object)
+    try:
+        for chunk in chunks:
+            yield chunk
+            # Anything the model adds after the analysis object is not needed
+            if extractor.feed(chunk) is not None:
+                return
+    finally:
+        # Close the upstream stream now so the gateway caches the complete object
+        chunks.close()
+
+def score_resume(text, jd, github_data=None):
+    """
+    Headless variant of analyze_resume for batch and worker use
+    
+    Args:
+        text (str): Resume text
+        jd (str): Job description
+        github_data (dict, optional): GitHub repository data
+    
+    Returns:
+        str: Cleaned JSON response string from Gemini
+    
+    Raises:
+        Exception: Any error raised while generating the response
+    """
+    prompt = build_analysis_prompt(text, jd, github_data)
+    return clean_response(generate_response(prompt), bool(github_data))
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from utils.cache_utils import SQLiteCache
+from utils.hooks import open_cache
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024
+# Seconds an upstream model call may take before the client gives up
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+
+# A prompt is either plain text or a list of chat messages
+Prompt = Union[str, List[Dict[str, str]]]
+
+class LLMProvider:
+    """Interface for a model client; one instance is created per (provider, model) and reused"""
+
+    def generate(self, prompt: Prompt, **params) -> str:
+        """Return the full completion for prompt"""
+        raise NotImplementedError
+
+    def stream(self, prompt: Prompt, **params) -> Iterator[str]:
+        """Yield completion text chunks as they arrive"""
+        yield self.generate(prompt, **params)
+
+def _as_text(prompt: Prompt) -> str:
+    """Flatten chat messages into a single prompt for text-only models"""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n\n".join(message['content'] for message in prompt)
+
+def _as_messages(prompt: Prompt) -> List[Dict[str, str]]:
+    """Wrap a plain prompt as a single user message"""
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    return prompt
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through google.generativeai"""
+
+    _configure_lock = threading.Lock()
+    _configured = False
+
+    def __init__(self, model: str):
+        import google.generativeai as genai
+
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise RuntimeError("Gemini API key not configured")
+        with GeminiProvider._configure_lock:
+            if not GeminiProvider._configured:
+                genai.configure(api_key=api_key)
+                GeminiProvider._configured = True
+                logger.info("Gemini API configured successfully")
+        logger.debug(f"Creating Gemini model instance: {model}")
+        self._model = genai.GenerativeModel(model)
+
+    def generate(self, prompt: Prompt, **params) -> str:
+        response = self._model.generate_content(
+            _as_text(prompt), generation_config=params or None, request_options={'timeout': LLM_TIMEOUT}
+        )
+        return response.text
+
+    def stream(self, prompt: Prompt, **params) -> Iterator[str]:
+        response = self._model.generate_content(
+            _as_text(prompt), generation_config=params or None, stream=True, request_options={'timeout': LLM_TIMEOUT}
+        )
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions"""
+
+    def __init__(self, model: str):
+        from openai import OpenAI
+
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OpenAI API key not configured")
+        self.model = model
+        self._client = OpenAI(api_key=api_key, timeout=LLM_TIMEOUT)
+
+    def generate(self, prompt: Prompt, **params) -> str:
+        response = self._client.chat.completions.create(model=self.model, messages=_as_messages(prompt), **params)
+        return response.choices[0].message.content
+
+    def stream(self, prompt: Prompt, **params) -> Iterator[str]:
+        response = self._client.chat.completions.create(
+            model=self.model, messages=_as_messages(prompt), stream=True, **params
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+class LLMGateway:
+    """Single entry point for LLM calls shared by the ATS analysis and the RAG chat.
+
+    Reuses one client per (provider, model), caches completions on disk keyed
+    by (provider, model, prompt hash, params) with TTL and LRU eviction, and
+    coalesces identical concurrent requests into one upstream call.
+    """
+
+    def __init__(self, cache: Optional[SQLiteCache] = None):
+        """
+        Args:
+            cache: Response cache, defaults to the shared on-disk LLM cache
+        """
+        self.cache = cache if cache is not None else open_cache(
+            "llm_responses.sqlite", max_bytes=LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL
+        )
+        self._factories: Dict[str, Callable[[str], LLMProvider]] = {
+            "gemini": GeminiProvider,
+            "openai": OpenAIProvider,
+        }
+        self._clients: Dict[Tuple[str, str], LLMProvider] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def register_provider(self, name: str, factory: Callable[[str], LLMProvider]) -> None:
+        """
+        Add or replace a provider
+
+        Args:
+            name: Provider name used in generate/stream calls
+            factory: Callable building a provider client for a model name
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._clients = {key: client for key, client in self._clients.items() if key[0] != name}
+
+    def client(self, provider: str, model: str) -> LLMProvider:
+        """Return the reused client for (provider, model), creating it on first use"""
+        with self._lock:
+            key = (provider, model)
+            if key not in self._clients:
+                if provider not in self._factories:
+                    raise ValueError(f"Unknown LLM provider: {provider}")
+                self._clients[key] = self._factories[provider](model)
+            return self._clients[key]
+
+    @staticmethod
+    def cache_key(provider: str, model: str, prompt: Prompt, params: Dict[str, Any]) -> str:
+        """Hash identifying a request by provider, model, prompt and parameters"""
+        payload = json.dumps([provider, model, prompt, params], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def generate(self, provider: str, model: str, prompt: Prompt, use_cache: bool = True, **params) -> str:
+        """
+        Return a completion, from the cache or from a single upstream call
+
+        Args:
+            provider: Provider name ('gemini', 'openai' or a registered one)
+            model: Model name
+            prompt: Prompt text or chat messages
+            use_cache: Read and write the response cache
+            **params: Generation parameters passed to the provider
+
+        Returns:
+            str: Completion text
+        """
+        key = self.cache_key(provider, model, prompt, params)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                default_metrics.increment("llm.cache_hits")
+                return cached.decode('utf-8')
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            # An identical request is already running; share its result
+            default_metrics.increment("llm.coalesced")
+            return future.result()
+
+        try:
+            # The previous leader may have finished between our cache check and taking the lead
+            cached = self.cache.get(key) if use_cache else None
+            if cached is not None:
+                text = cached.decode('utf-8')
+                future.set_result(text)
+                return text
+            default_metrics.increment("llm.upstream_calls")
+            with default_metrics.timer(f"llm.{provider}.latency"):
+                text = self.client(provider, model).generate(prompt, **params)
+            if use_cache and text:
+                self.cache.set(key, text.encode('utf-8'))
+            future.set_result(text)
+            return text
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stream(
+        self,
+        provider: str,
+        model: str,
+        prompt: Prompt,
+        use_cache: bool = True,
+        complete: Optional[Callable[[str], bool]] = None,
+        **params
+    ) -> Iterator[str]:
+        """
+        Yield completion chunks; a cached completion is yielded in one piece
+
+        Args:
+            provider: Provider name ('gemini', 'openai' or a registered one)
+            model: Model name
+            prompt: Prompt text or chat messages
+            use_cache: Read the cache and store the completion once fully streamed
+            complete: Whether the text streamed so far is a usable completion; when
+                given, a stream the caller closes early is still cached if it is
+            **params: Generation parameters passed to the provider
+
+        Yields:
+            str: Completion text chunks
+        """
+        key = self.cache_key(provider, model, prompt, params)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                default_metrics.increment("llm.cache_hits")
+                yield cached.decode('utf-8')
+                return
+
+        default_metrics.increment("llm.upstream_calls")
+        chunks = []
+        finished = False
+        try:
+            for chunk in self.client(provider, model).stream(prompt, **params):
+                chunks.append(chunk)
+                yield chunk
+            finished = True
+        finally:
+            # Also runs when the caller stops reading (GeneratorExit), e.g. once it has what it needs
+            text = "".join(chunks)
+            if use_cache and text and (finished or (complete is not None and complete(text))):
+                self.cache.set(key, text.encode('utf-8'))
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+def get_gateway() -> LLMGateway:
+    """Return the process-wide LLM gateway"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
@@ -0,0 +1,226 @@
+import json
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logging_utils import default_logger as logger
+from utils.skill_taxonomy import SkillTaxonomy, get_taxonomy
+from utils.text_utils import split_sections, term_counts, tokenize
+
+# Sections scored individually, with their reference length in tokens for BM25 length normalisation
+SECTION_LENGTHS = {'projects': 150, 'experience': 250, 'education': 40}
+DOCUMENT_LENGTH = 450
+
+EDUCATION_TERMS = frozenset({
+    'bachelor', 'bachelors', 'master', 'masters', 'phd', 'doctorate', 'degree', 'diploma', 'bs', 'ba',
+    'ms', 'msc', 'bsc', 'btech', 'mtech', 'mba', 'graduate', 'computer', 'science', 'engineering',
+    'mathematics', 'statistics', 'physics', 'economics', 'information', 'technology',
+})
+
+# Degree abbreviations, with dots removed, mapped to the words job descriptions use
+DEGREE_ALIASES = {
+    'bs': ('bachelor', 'degree'), 'bsc': ('bachelor', 'degree'), 'ba': ('bachelor', 'degree'),
+    'btech': ('bachelor', 'degree'), 'be': ('bachelor', 'degree'), 'bachelors': ('bachelor', 'degree'),
+    'ms': ('master', 'degree'), 'msc': ('master', 'degree'), 'mtech': ('master', 'degree'),
+    'mba': ('master', 'degree'), 'masters': ('master', 'degree'), 'phd': ('phd', 'degree'),
+}
+
+# Blend of the overall score: weighted skill match, keyword coverage, experience/project sections
+SCORE_WEIGHTS = (0.5, 0.3, 0.2)
+
+class LocalATSScorer:
+    """Deterministic ATS scoring of resumes against one job description, without an LLM.
+
+    The job description is analysed once: its skills (through the skill
+    taxonomy) and its most frequent remaining terms become a weighted query.
+    Each resume is split into sections and scored with vectorised BM25 term
+    saturation against fixed reference lengths, so a resume always gets the
+    same score for the same job description regardless of the pool it is in.
+    """
+
+    def __init__(self, jd: str, taxonomy: Optional[SkillTaxonomy] = None, k1: float = 1.2, b: float = 0.75,
+                 max_terms: int = 60):
+        """
+        Args:
+            jd: Job description text
+            taxonomy: Skill taxonomy, defaults to the bundled data/skills.json
+            k1: BM25 term frequency saturation
+            b: BM25 length normalisation strength
+            max_terms: Number of non-skill JD terms kept in the query
+        """
+        self.taxonomy = taxonomy or get_taxonomy()
+        self.k1 = k1
+        self.b = b
+
+        jd_skills = self.taxonomy.extract(jd)
+        self.skills = sorted(jd_skills, key=lambda name: (-self.taxonomy.weight(name), name))
+        self.skill_weights = np.array(
+            [self.taxonomy.weight(name) * (1 + math.log(jd_skills[name])) for name in self.skills]
+        )
+
+        # Terms already covered by a skill would be counted twice
+        skill_tokens = {
+            token
+            for name in self.skills
+            for alias in [name] + self.taxonomy.skills[name].get('aliases', [])
+            for token in tokenize(alias, drop_stopwords=False)
+        }
+        jd_terms = Counter({term: count for term, count in term_counts(jd).items() if term not in skill_tokens})
+        ranked = sorted(jd_terms.items(), key=lambda item: (-item[1], item[0]))[:max_terms]
+        self.terms = [term for term, _ in ranked]
+        self.term_weights = np.array([1 + math.log(count) for _, count in ranked])
+        self.education_mask = np.array([term in EDUCATION_TERMS for term in self.terms], dtype=bool)
+        self._term_index = {term: i for i, term in enumerate(self.terms)}
+        self._skill_index = {name: i for i, name in enumerate(self.skills)}
+        logger.debug(f"Local scorer query: {len(self.skills)} skills, {len(self.terms)} terms")
+
+    def _features(self, text: str) -> Tuple[np.ndarray, int]:
+        """Query term and skill counts for a piece of text, plus its length in tokens"""
+        tokens = tokenize(text)
+        features = np.zeros(len(self.terms) + len(self.skills))
+        for token in tokens:
+            for term in DEGREE_ALIASES.get(token.replace('.', ''), (token,)):
+                i = self._term_index.get(term)
+                if i is not None:
+                    features[i] += 1
+        offset = len(self.terms)
+        for name, count in self.taxonomy.extract(text).items():
+            i = self._skill_index.get(name)
+            if i is not None:
+                features[offset + i] += count
+        return features, len(tokens)
+
+    def _saturate(self, tf: np.ndarray, lengths: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """BM25 term frequency saturation, scaled so one mention at the reference length counts as 1"""
+        norm = self.k1 * (1 - self.b + self.b * lengths / reference)
+        return np.minimum(1.0, tf * (self.k1 + 1) / (tf + norm[..., None]))
+
+    def score_many(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Score several resumes in one vectorised pass
+
+        Args:
+            texts: Extracted resume texts
+
+        Returns:
+            List[Dict[str, Any]]: One analysis per resume, shaped like the LLM analysis
+        """
+        kinds = list(SECTION_LENGTHS)
+        n, width = len(texts), len(self.terms) + len(self.skills)
+        # Slot 0 is the whole document, then one slot per scored section
+        tf = np.zeros((n, len(kinds) + 1, width))
+        lengths = np.zeros((n, len(kinds) + 1))
+        present = np.zeros((n, len(kinds)), dtype=bool)
+        for row, text in enumerate(texts):
+            for kind, section_text in split_sections(text).items():
+                features, length = self._features(section_text)
+                tf[row, 0] += features
+                lengths[row, 0] += length
+                if kind in SECTION_LENGTHS:
+                    slot = kinds.index(kind) + 1
+                    tf[row, slot], lengths[row, slot] = features, length
+                    present[row, slot - 1] = True
+        # Resumes without a recognisable section are judged on the whole document
+        for slot in range(1, len(kinds) + 1):
+            missing = ~present[:, slot - 1]
+            tf[missing, slot] = tf[missing, 0]
+            lengths[missing, slot] = lengths[missing, 0]
+
+        reference = np.array([DOCUMENT_LENGTH] + [SECTION_LENGTHS[kind] for kind in kinds], dtype=float)
+        saturated = self._saturate(tf, np.maximum(lengths, 1), reference)
+        # Degree terms are judged in the education section only
+        weights = np.concatenate([np.where(self.education_mask, 0.0, self.term_weights), self.skill_weights])
+        term_slice = slice(0, len(self.terms))
+        skill_slice = slice(len(self.terms), width)
+
+        found = tf[:, 0] > 0
+        coverage = _weighted_mean(found[:, term_slice], self.term_weights)
+        skill_match = _weighted_mean(found[:, skill_slice], self.skill_weights)
+        # Square root spreads the low raw scores of short sections over the percentage range
+        sections = np.sqrt(_weighted_mean(saturated[:, 1:], weights))
+        projects, experience = sections[:, kinds.index('projects')], sections[:, kinds.index('experience')]
+        if self.education_mask.any():
+            education = np.sqrt(_weighted_mean(
+                saturated[:, kinds.index('education') + 1, term_slice][:, self.education_mask],
+                self.term_weights[self.education_mask]
+            ))
+        else:
+            # The JD states no education requirement; only check that education is listed
+            education = np.where(present[:, kinds.index('education')], 1.0, 0.5)
+
+        skill_weight, coverage_weight, section_weight = SCORE_WEIGHTS
+        if not self.skills:
+            coverage_weight, skill_weight = coverage_weight + skill_weight, 0.0
+        overall = (skill_weight * skill_match + coverage_weight * coverage
+                   + section_weight * (projects + experience) / 2)
+
+        results = []
+        for row in range(n):
+            matched = [name for i, name in enumerate(self.skills) if found[row, len(self.terms) + i]]
+            missing = [name for i, name in enumerate(self.skills) if not found[row, len(self.terms) + i]]
+            if not self.skills:
+                missing = [term for i, term in enumerate(self.terms) if not found[row, i]][:10]
+            results.append({
+                "JD Match": _percent(overall[row]),
+                "MissingKeywords": missing[:15],
+                "Profile Summary": self._summary(matched, missing, present[row], kinds,
+                                                 experience[row], projects[row], coverage[row]),
+                "ProjectMatch": _percent(projects[row]),
+                "WorkExpMatch": _percent(experience[row]),
+                "EduMatch": _percent(education[row]),
+            })
+        return results
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """Score one resume; see score_many"""
+        return self.score_many([text])[0]
+
+    def _summary(self, matched: List[str], missing: List[str], present: np.ndarray, kinds: List[str],
+                 experience: float, projects: float, coverage: float) -> str:
+        """Templated profile summary addressing the candidate"""
+        lines = []
+        if self.skills:
+            shown = ", ".join(matched[:6]) if matched else "none of them"
+            lines.append(f"• You match {len(matched)} of the {len(self.skills)} skills the role asks for ({shown}).")
+        if missing:
+            lines.append(f"• Your resume does not mention {', '.join(missing[:5])}; add them where you have used them.")
+        lines.append(f"• Your resume covers {_percent(coverage)} of the job description's key terms.")
+        lines.append(f"• Your work experience reflects the role at {_percent(experience)}, "
+                     f"your projects at {_percent(projects)}.")
+        absent = [kind for kind, found in zip(kinds, present) if not found]
+        if absent:
+            lines.append(f"• Add clearly titled {', '.join(kind.title() for kind in absent)} "
+                         f"section(s) so your {'/'.join(absent)} can be matched.")
+        return "\n".join(lines)
+
+def _weighted_mean(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted mean over the last axis, 0 when there is nothing to weigh"""
+    total = weights.sum()
+    if total == 0:
+        return np.zeros(values.shape[:-1])
+    return (values * weights).sum(axis=-1) / total
+
+def _percent(value: float) -> str:
+    return f"{int(round(float(value) * 100))}%"
+
+@lru_cache(maxsize=8)
+def get_local_scorer(jd: str) -> LocalATSScorer:
+    """Return a scorer for a job description, reusing its precomputed query"""
+    return LocalATSScorer(jd)
+
+def score_resume_local(text, jd, github_data=None):
+    """
+    Score a resume locally, with the same signature and output as models.gemini.score_resume
+
+    Args:
+        text (str): Resume text
+        jd (str): Job description text
+        github_data: Ignored; GitHub analysis needs the LLM
+
+    Returns:
+        str: JSON analysis
+    """
+    return json.dumps(get_local_scorer(jd).score(text))
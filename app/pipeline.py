@@ -0,0 +1,154 @@
+"""
+Resume analysis run as a background job, without Streamlit calls
+
+The Streamlit front end submits run_analysis to the shared job queue and
+polls for its stage, streamed output and result.
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from config import ATS_ENGINE, STREAM_RESPONSES
+from models.gemini import clean_response, score_resume, stream_analysis
+from models.local_scorer import score_resume_local
+from utils.github_utils import fetch_github_data
+from utils.inverted_index import get_candidate_index
+from utils.job_queue import report_output, report_progress
+from utils.logging_utils import default_logger as logger
+from utils.pdf_utils import read_pdf_text
+from utils.rag_utils import RAGSystem
+
+# GitHub fetches run here so they overlap PDF extraction in the job's own thread
+GITHUB_FETCH_WORKERS = int(os.getenv("GITHUB_FETCH_WORKERS", "4"))
+
+_fetch_pool = None
+_fetch_lock = threading.Lock()
+
+class AnalysisError(ValueError):
+    """A resume could not be analysed: the PDF has no text or the model's analysis is unusable"""
+
+def get_fetch_pool() -> ThreadPoolExecutor:
+    """Return the thread pool GitHub profiles are fetched on"""
+    global _fetch_pool
+    with _fetch_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=GITHUB_FETCH_WORKERS, thread_name_prefix="github")
+        return _fetch_pool
+
+def analysis_key(pdf_data: bytes, jd: str, github_username: Optional[str], engine: str) -> str:
+    """Idempotency key of an analysis, so resubmitting the same inputs reuses the running or finished job"""
+    digest = hashlib.sha256()
+    for part in (pdf_data, jd.encode('utf-8'), (github_username or "").encode('utf-8'), engine.encode('utf-8')):
+        digest.update(hashlib.sha256(part).digest())
+    return f"analysis:{digest.hexdigest()}"
+
+def score_text(text: str, jd: str, github_data: Optional[Dict[str, Any]] = None, engine: str = ATS_ENGINE,
+               stream: bool = False) -> Dict[str, Any]:
+    """
+    Score extracted resume text against a job description
+
+    Args:
+        text: Resume text
+        jd: Job description
+        github_data: fetch_github_data output to analyse alongside the resume
+        engine: "llm" or "local"
+        stream: Stream model output into the running job's partial output
+
+    Returns:
+        Dict[str, Any]: Validated analysis
+
+    Raises:
+        AnalysisError: If the model's analysis is unusable
+    """
+    if engine == "local":
+        return json.loads(score_resume_local(text, jd))
+    try:
+        if stream:
+            chunks = []
+            for chunk in stream_analysis(text, jd, github_data):
+                chunks.append(chunk)
+                report_output(chunk)
+            return json.loads(clean_response("".join(chunks), bool(github_data)))
+        return json.loads(score_resume(text, jd, github_data))
+    except ValueError as e:
+        raise AnalysisError(str(e)) from e
+
+def run_analysis(pdf_data: bytes, jd: str, github_username: Optional[str] = None, engine: str = ATS_ENGINE,
+                 name: str = "resume.pdf") -> Dict[str, Any]:
+    """
+    Extract, score and index one uploaded resume
+
+    The GitHub profile is fetched while the PDF text is extracted. With the
+    LLM engine and STREAM_RESPONSES, model output is published to the job as
+    it arrives.
+
+    Args:
+        pdf_data: Raw bytes of the uploaded PDF
+        jd: Job description
+        github_username: GitHub profile to analyse alongside the resume
+        engine: "llm" or "local"
+        name: Upload file name, kept with the candidate index entry
+
+    Returns:
+        Dict[str, Any]: response_dict, github_data (repository list), include_github,
+            resume_text, jd_text and warnings
+
+    Raises:
+        AnalysisError: If no text can be extracted or the analysis is unusable
+    """
+    report_progress("Extracting text from PDF")
+    github_future = get_fetch_pool().submit(fetch_github_data, github_username) if github_username else None
+    text = read_pdf_text(pdf_data)
+    if not text or not text.strip():
+        raise AnalysisError("Could not extract text from the PDF. Please check the file.")
+
+    # Keep the resume searchable across the candidate pool
+    try:
+        get_candidate_index().add_document(
+            f"upload:{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}",
+            text,
+            {'name': name}
+        )
+    except Exception as e:
+        logger.warning(f"Failed to index resume for candidate search: {str(e)}")
+
+    warnings = []
+    github_data = None
+    if github_future is not None:
+        report_progress("Fetching GitHub data")
+        github_data = github_future.result()
+        if not github_data:
+            logger.warning(f"No public repositories found for user {github_username}")
+            warnings.append(f"No public repositories found for user {github_username}")
+
+    report_progress("Analyzing your resume")
+    return {
+        'response_dict': score_text(text, jd, github_data, engine, stream=STREAM_RESPONSES),
+        'github_data': github_data['repositories'] if github_data else None,
+        'include_github': bool(github_data),
+        'resume_text': text,
+        'jd_text': jd,
+        'warnings': warnings
+    }
+
+def build_rag(owner_id: str, resume_text: str, jd: str, repositories: Optional[list] = None) -> RAGSystem:
+    """
+    Build the RAG chat index for an analysed resume, as a job of its own so results show first
+
+    Args:
+        owner_id: Session ID the chunks are stored under in the shared index
+        resume_text: Extracted resume text
+        jd: Job description
+        repositories: GitHub repository list from the analysis
+
+    Returns:
+        RAGSystem: Ready to answer questions
+    """
+    report_progress("Indexing documents for chat")
+    rag = RAGSystem(owner_id=owner_id)
+    rag.process_documents(resume_text, jd, {'repositories': repositories} if repositories else None)
+    rag.create_embeddings_and_index()
+    return rag
@@ -0,0 +1,311 @@
+"""
+Token-budgeted assembly of the analysis prompts
+"""
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from prompts.templates import ats_prompt, github_analysis_prompt
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+from utils.resume_parser import PROMPT_SECTIONS, parse_resume
+from utils.skill_taxonomy import get_taxonomy
+from utils.text_utils import tokenize
+
+# English prose and code average about four characters per token across current tokenizers
+CHARS_PER_TOKEN = 4
+
+PROMPT_BUDGETS = {
+    'resume': int(os.getenv("PROMPT_RESUME_TOKENS", "2000")),
+    'jd': int(os.getenv("PROMPT_JD_TOKENS", "1000")),
+    'github': int(os.getenv("PROMPT_GITHUB_TOKENS", "1500")),
+    'readme': int(os.getenv("PROMPT_README_TOKENS", "150")),
+}
+
+# Resume sections in the order they are protected when the resume is over budget
+SECTION_PRIORITY = ('experience', 'projects', 'skills', 'summary', 'education', 'certifications', 'achievements')
+
+# README sections that rarely say anything about the candidate's skills
+_README_SKIP_HEADINGS = re.compile(
+    r"^(?:installation|install|setup|getting started|usage|license|licence|contributing|contributors|"
+    r"acknowledg(?:e)?ments|credits|changelog|faq|support|contact|table of contents|contents|"
+    r"running tests|tests|deployment|deploy)\b",
+    re.IGNORECASE
+)
+_JD_BOILERPLATE = re.compile(
+    r"equal opportunity|equal employment|without regard to|reasonable accommodation|benefits|perks|"
+    r"paid time off|401\(?k\)?|health insurance|about us|who we are|our mission|apply now|how to apply|"
+    r"privacy notice|e-verify",
+    re.IGNORECASE
+)
+_MARKDOWN_NOISE = [
+    (re.compile(r"```.*?```", re.DOTALL), " "),
+    (re.compile(r"<[^>]+>"), " "),
+    (re.compile(r"!\[[^\]]*\]\([^)]*\)"), " "),
+    (re.compile(r"\[([^\]]+)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"https?://\S+"), " "),
+    (re.compile(r"^[\s>*#=|:-]+$", re.MULTILINE), " "),
+]
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text without loading a tokenizer"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut text to about budget tokens at a word boundary"""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(' ', 0, limit)
+    return text[:cut if cut > 0 else limit].rstrip() + " …"
+
+class RelevanceScorer:
+    """Scores text pieces by their overlap with the job description's terms and skills"""
+
+    def __init__(self, jd: str):
+        self.taxonomy = get_taxonomy()
+        self.terms = Counter(tokenize(jd))
+        self.skills = set(self.taxonomy.extract(jd))
+
+    def score(self, piece: str) -> float:
+        tokens = set(tokenize(piece))
+        if not tokens:
+            return 0.0
+        overlap = sum(1 + math.log(self.terms[token]) for token in tokens if token in self.terms)
+        skills = len(self.skills.intersection(self.taxonomy.extract(piece)))
+        # Normalised by length so long pieces do not win on size alone
+        return (overlap + 3 * skills) / math.sqrt(len(tokens))
+
+    def select(self, pieces: Sequence[str], budget: int, separator: str = "\n") -> str:
+        """
+        Keep the most relevant pieces that fit in budget tokens, in their original order
+
+        Args:
+            pieces: Sentences, lines or paragraphs
+            budget: Token budget
+            separator: Joiner for the kept pieces
+
+        Returns:
+            str: Selected text
+        """
+        ranked = sorted(range(len(pieces)), key=lambda i: (-self.score(pieces[i]), i))
+        kept, used = set(), 0
+        for i in ranked:
+            cost = estimate_tokens(pieces[i]) + 1
+            if used + cost > budget:
+                continue
+            kept.add(i)
+            used += cost
+        return separator.join(pieces[i] for i in sorted(kept))
+
+@dataclass
+class BuiltPrompt:
+    """A rendered prompt with its per-field and total token estimates"""
+    prompt: str
+    tokens: Dict[str, int] = field(default_factory=dict)
+    original_tokens: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.tokens.get('total', 0)
+
+def dedupe_lines(texts: Sequence[str], min_occurrences: int = 2) -> List[str]:
+    """
+    Drop boilerplate lines repeated across several texts (template READMEs, license blurbs)
+
+    Args:
+        texts: Documents of the same kind, e.g. every README of a profile
+        min_occurrences: Number of documents a line must appear in to count as boilerplate
+
+    Returns:
+        List[str]: The texts without repeated lines, also deduplicating lines within each text
+    """
+    def normalise(line: str) -> str:
+        return " ".join(line.lower().split())
+
+    counts = Counter(
+        line for text in texts for line in {normalise(line) for line in text.splitlines() if len(line.strip()) > 20}
+    )
+    boilerplate = {line for line, count in counts.items() if count >= min_occurrences}
+    cleaned = []
+    for text in texts:
+        seen, lines = set(), []
+        for line in text.splitlines():
+            key = normalise(line)
+            if key in boilerplate or (key and key in seen):
+                continue
+            seen.add(key)
+            lines.append(line)
+        cleaned.append("\n".join(lines))
+    return cleaned
+
+def clean_readme(readme: str) -> str:
+    """Strip markdown noise (code blocks, badges, links, HTML) and install/license style sections"""
+    kept, skipping = [], False
+    for line in readme.splitlines():
+        heading = re.match(r"^\s*#{1,6}\s*(.+)$", line)
+        if heading:
+            skipping = bool(_README_SKIP_HEADINGS.match(heading.group(1).strip()))
+            if not skipping:
+                kept.append(heading.group(1).strip() + ":")
+            continue
+        if not skipping:
+            kept.append(line)
+    text = "\n".join(kept)
+    for pattern, replacement in _MARKDOWN_NOISE:
+        text = pattern.sub(replacement, text)
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+def summarize_readme(readme: str, scorer: RelevanceScorer, budget: int) -> str:
+    """Extractive summary: the README sentences most relevant to the job description"""
+    text = clean_readme(readme)
+    if estimate_tokens(text) <= budget:
+        return text
+    sentences = [sentence.strip() for sentence in _SENTENCE_RE.split(text) if len(sentence.strip()) > 3]
+    return scorer.select(sentences, budget, separator=" ")
+
+def compact_resume(text: str, scorer: RelevanceScorer, budget: int) -> str:
+    """
+    Relevant resume sections, trimmed line by line by relevance when over budget
+
+    Args:
+        text: Extracted resume text
+        scorer: Relevance to the job description
+        budget: Token budget for the resume
+
+    Returns:
+        str: Compact resume text
+    """
+    document = parse_resume(text)
+    compact = document.text_for() or " ".join(text.split())
+    if estimate_tokens(compact) <= budget:
+        return compact
+
+    sections = [section for section in document.sections if section.kind in PROMPT_SECTIONS]
+    if not sections:
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        return scorer.select(lines, budget)
+    # Each section gets a share of the budget proportional to its size, weighted by priority
+    weights = []
+    for section in sections:
+        rank = SECTION_PRIORITY.index(section.kind) if section.kind in SECTION_PRIORITY else len(SECTION_PRIORITY)
+        weights.append(estimate_tokens(section.text) * (1 + (len(SECTION_PRIORITY) - rank) / len(SECTION_PRIORITY)))
+    total_weight = sum(weights) or 1
+    parts = []
+    for section, weight in zip(sections, weights):
+        share = max(20, int(budget * weight / total_weight))
+        lines = [" ".join(line.split()) for line in section.text.splitlines() if line.strip()]
+        body = "\n".join(lines)
+        if estimate_tokens(body) > share:
+            body = scorer.select(lines, share)
+        if body:
+            parts.append(f"{section.heading or section.kind.title()}:\n{body}")
+    return truncate_to_tokens("\n\n".join(parts), budget)
+
+def compact_jd(jd: str, scorer: RelevanceScorer, budget: int) -> str:
+    """Job description without benefits/EEO paragraphs (judged by their opening), trimmed by relevance when over budget"""
+    paragraphs = [p for p in re.split(r"\n\s*\n", jd) if p.strip() and not _JD_BOILERPLATE.search(p[:120])] or [jd]
+    text = "\n\n".join(" ".join(paragraph.split()) for paragraph in paragraphs)
+    if estimate_tokens(text) <= budget:
+        return text
+    lines = [line.strip() for paragraph in paragraphs for line in paragraph.splitlines() if line.strip()]
+    return scorer.select(lines, budget)
+
+def repo_skills(repo: Dict[str, Any]) -> List[str]:
+    """Canonical skills mentioned in a repository's description, topics, languages and README"""
+    languages = repo.get('languages') or {}
+    text = "\n".join([
+        repo.get('description') or "",
+        " ".join(repo.get('topics') or []),
+        " ".join(languages),
+        repo.get('readme') or "",
+    ])
+    return sorted(get_taxonomy().extract(text))
+
+def compact_github(github_data: Any, scorer: RelevanceScorer, budget: int, readme_budget: int) -> str:
+    """
+    Compact JSON of the repositories most relevant to the job description
+
+    Args:
+        github_data: fetch_github_data output, its 'repositories' list, or any other value (passed through)
+        scorer: Relevance to the job description
+        budget: Token budget for the whole GitHub field
+        readme_budget: Token budget per README summary
+
+    Returns:
+        str: One compact JSON object per line, most relevant repositories first
+    """
+    repos = github_data.get('repositories') if isinstance(github_data, dict) else github_data
+    if not isinstance(repos, list):
+        return truncate_to_tokens(str(github_data), budget)
+
+    readmes = dedupe_lines([repo.get('readme') or "" for repo in repos])
+    entries = []
+    for repo, readme in zip(repos, readmes):
+        languages = repo.get('languages') or {}
+        entry = {
+            'name': repo.get('name'),
+            'description': repo.get('description'),
+            'language': repo.get('language'),
+            'languages': sorted(languages, key=languages.get, reverse=True)[:4] if isinstance(languages, dict) else languages,
+            'stars': repo.get('stars', repo.get('stargazers_count', 0)),
+            'topics': repo.get('topics') or [],
+            'skills': repo_skills(repo),
+            'readme': summarize_readme(readme, scorer, readme_budget) if readme else "",
+        }
+        entry = {key: value for key, value in entry.items() if value not in (None, "", [], "No README available")}
+        relevance = scorer.score(" ".join([str(entry.get('description', '')), " ".join(entry.get('skills', [])),
+                                           " ".join(entry.get('topics', [])), entry.get('readme', '')]))
+        entries.append((relevance, json.dumps(entry, separators=(',', ':'), ensure_ascii=False)))
+
+    lines, used = [], 0
+    for _, line in sorted(entries, key=lambda item: -item[0]):
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            continue
+        lines.append(line)
+        used += cost
+    if len(lines) < len(entries):
+        logger.debug(f"GitHub prompt field kept {len(lines)} of {len(entries)} repositories")
+    return "\n".join(lines)
+
+def build_analysis_prompt(text: str, jd: str, github_data: Any = None,
+                          budgets: Optional[Dict[str, int]] = None) -> BuiltPrompt:
+    """
+    Assemble the ATS analysis prompt within per-field token budgets
+
+    Args:
+        text: Resume text
+        jd: Job description
+        github_data: GitHub data (fetch_github_data output or its repository list)
+        budgets: Overrides for PROMPT_BUDGETS keys ('resume', 'jd', 'github', 'readme')
+
+    Returns:
+        BuiltPrompt: Prompt text with token estimates per field
+    """
+    budgets = {**PROMPT_BUDGETS, **(budgets or {})}
+    scorer = RelevanceScorer(jd)
+    fields = {
+        'text': compact_resume(text, scorer, budgets['resume']),
+        'jd': compact_jd(jd, scorer, budgets['jd']),
+    }
+    original = {'text': estimate_tokens(text), 'jd': estimate_tokens(jd)}
+    if github_data:
+        fields['github_data'] = compact_github(github_data, scorer, budgets['github'], budgets['readme'])
+        original['github_data'] = estimate_tokens(str(github_data))
+        prompt = github_analysis_prompt.format(**fields)
+    else:
+        prompt = ats_prompt.format(**fields)
+
+    tokens = {name: estimate_tokens(value) for name, value in fields.items()}
+    tokens['total'] = estimate_tokens(prompt)
+    template = github_analysis_prompt if github_data else ats_prompt
+    original['total'] = sum(original.values()) + estimate_tokens(template)
+    default_metrics.observe("prompt.tokens", tokens['total'])
+    logger.info(f"Analysis prompt: ~{tokens['total']} tokens (fields {tokens}, before budgeting ~{original['total']})")
+    return BuiltPrompt(prompt=prompt, tokens=tokens, original_tokens=original)
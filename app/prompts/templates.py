@@ -57,4 +57,14 @@ Provide the response in the following JSON format without any additional text:
         "Recommendations": "specific recommendations for improving GitHub profile"
     }}
 }}
-""" 
\ No newline at end of file
+""" 
+json_repair_prompt = """
+Your previous response could not be used because of these problems:
+{errors}
+
+Previous response:
+{response}
+
+Reply with only the following fields, corrected, as a JSON object in this format without any additional text:
+{fields}
+"""
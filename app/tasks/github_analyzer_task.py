@@ -1,5 +1,7 @@
 from crewai import Task
-from agents.GithubAnalyzer import GitHubAnalyzer
+from agents.GithubAnalyzer import github_analyzer
+from tasks.profile_task import profiling_task
+from tasks.research_task import research_task
 
 # GitHubAnalyzerTask = Task(
 #     description=(
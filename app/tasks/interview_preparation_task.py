@@ -1,7 +1,8 @@
 from crewai import Task
 from agents.InterviewPreparer import interview_preparer
+from tasks.github_analyzer_task import github_analysis_task
 from tasks.research_task import research_task
-from tasks.profile_task import profile_task
+from tasks.profile_task import profiling_task
 from tasks.resume_strategy_task import resume_strategy_task
 
 # interview_preparation_task = Task(
@@ -1,5 +1,6 @@
 from crewai import Task
-from app.agents.CandidateProfiler import profiler
+from agents.CandidateProfiler import profiler_agent
+from tasks.research_task import research_task
 
 # profile_task = Task(
 #     description=(
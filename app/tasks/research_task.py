@@ -1,5 +1,5 @@
 from crewai import Task
-from app.agents.JobResearcher import researcher
+from agents.JobResearcher import job_researcher
 
 
 research_task = Task(
@@ -1,7 +1,8 @@
 from crewai import Task
-from app.agents.ResumeStrategist import resume_strategist
+from agents.ResumeStrategist import resume_strategist
+from tasks.github_analyzer_task import github_analysis_task
 from tasks.research_task import research_task
-from tasks.profile_task import profile_task
+from tasks.profile_task import profiling_task
 
 # resume_strategy_task = Task(
 #     description=(
@@ -0,0 +1,242 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only serialise threads of this process
+    fcntl = None
+
+from utils.logging_utils import default_logger as logger
+
+CACHE_DIR = os.getenv("SMART_ATS_CACHE_DIR", ".cache")
+# Writes between recounts of the stored size, which also picks up other processes' writes
+CACHE_RECOUNT_WRITES = int(os.getenv("CACHE_RECOUNT_WRITES", "1000"))
+# Eviction frees space down to this fraction of max_bytes, so the next writes do not evict again
+CACHE_EVICT_TARGET = 0.9
+CACHE_EVICT_BATCH = 256
+
+def cache_path(filename: str) -> str:
+    """
+    Resolve a file inside the shared on-disk cache directory
+
+    Args:
+        filename (str): Cache file name
+
+    Returns:
+        str: Path inside CACHE_DIR (the directory is created if needed)
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+@contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory lock on a file across processes
+
+    Args:
+        path (str): Lock file, created if missing
+        shared (bool): Take a shared (read) lock instead of an exclusive one
+    """
+    with open(path, 'a') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+class SQLiteCache:
+    """Persistent key/value cache with optional TTL and size-based LRU eviction.
+
+    Backed by a single SQLite file so entries survive restarts and are shared
+    by every worker process pointing at the same path.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            path (str): SQLite database file
+            max_bytes (int, optional): Total value size above which least recently used entries are evicted
+            ttl (float, optional): Default time-to-live in seconds for new entries
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Running estimate of the stored size: replaced entries are not subtracted, so it only errs high
+        self._bytes: Optional[int] = None
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries(expires_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value for key, or None on a miss or expired entry"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Look up several keys in one round trip
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            Dict[str, bytes]: Values for the keys that were found and not expired
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with self._lock:
+            # SQLite limits bound parameters per statement, so look up in slices
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value, expires_at FROM entries WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                expired = []
+                for key, value, expires_at in rows:
+                    if expires_at is not None and expires_at <= now:
+                        expired.append(key)
+                    else:
+                        found[key] = value
+                if expired:
+                    self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in expired])
+                hit_keys = [key for key in batch if key in found]
+                if hit_keys:
+                    self._conn.executemany(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?", [(now, key) for key in hit_keys]
+                    )
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value, replacing any previous entry for key"""
+        self.set_many({key: value}, ttl=ttl)
+
+    def set_many(self, items: Dict[str, bytes], ttl: Optional[float] = None) -> None:
+        """
+        Store several values in one transaction
+
+        Args:
+            items: Mapping of key to value bytes
+            ttl (float, optional): Time-to-live in seconds, defaults to the cache TTL
+        """
+        if not items:
+            return
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                [(key, sqlite3.Binary(value), len(value), expires_at, now) for key, value in items.items()]
+            )
+            self._evict(sum(len(value) for value in items.values()), len(items))
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._bytes = 0
+
+    def get_json(self, key: str) -> Optional[Any]:
+        """Return a JSON-decoded value, or None on a miss"""
+        value = self.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serialisable value"""
+        self.set(key, json.dumps(value).encode('utf-8'), ttl=ttl)
+
+    def size(self) -> int:
+        """Total size in bytes of the stored values"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counters plus the current entry count and size"""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': count,
+            'bytes': total
+        }
+
+    def _evict(self, written: int, count: int) -> None:
+        """
+        Drop expired entries, then least recently used ones once over max_bytes
+
+        The stored size is tracked as a running estimate and only recounted
+        every CACHE_RECOUNT_WRITES writes or when the estimate passes
+        max_bytes, so writes do not scan the table. Caller holds the lock.
+
+        Args:
+            written: Bytes just stored
+            count: Entries just stored
+        """
+        self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        if not self.max_bytes:
+            return
+        self._writes += count
+        if self._bytes is None or self._writes >= CACHE_RECOUNT_WRITES:
+            self._bytes, self._writes = self._total(), 0
+        else:
+            self._bytes += written
+        if self._bytes <= self.max_bytes:
+            return
+        total = self._total()
+        target = int(self.max_bytes * CACHE_EVICT_TARGET)
+        evicted = 0
+        while total > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?", (CACHE_EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            keys = []
+            for key, size in rows:
+                if total <= target:
+                    break
+                keys.append((key,))
+                total -= size
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+            evicted += len(keys)
+        self._bytes = total
+        self.evictions += evicted
+        if evicted:
+            logger.debug(f"Evicted {evicted} entries from cache {self.path}")
+
+    def _total(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.cache_utils import SQLiteCache
+from utils.hooks import open_cache
+from utils.logging_utils import default_logger as logger
+
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_embedding_store() -> SQLiteCache:
+    """Return the process-wide on-disk embedding store."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = open_cache("embeddings.sqlite", max_bytes=EMBEDDING_CACHE_MAX_BYTES)
+        return _shared_store
+
+class EmbeddingCache:
+    """Content-addressed embedding store keyed by a hash of (model name, chunk text)."""
+
+    def __init__(self, model_name: str, store: Optional[SQLiteCache] = None):
+        """
+        Args:
+            model_name: Name of the embedding model the vectors come from
+            store: Backing store, defaults to the shared on-disk store
+        """
+        self.model_name = model_name
+        self.store = store if store is not None else get_embedding_store()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        """Content hash identifying the embedding of text under this model"""
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up embeddings for several texts in one batch
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            List of float32 vectors, with None for texts that are not cached
+        """
+        keys = [self.key(text) for text in texts]
+        found = self.store.get_many(keys)
+        vectors = [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+        hits = sum(vector is not None for vector in vectors)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        return vectors
+
+    def set_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store embeddings for texts"""
+        self.store.set_many({
+            self.key(text): np.asarray(vector, dtype=np.float32).tobytes()
+            for text, vector in zip(texts, vectors)
+        })
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters for this cache plus the backing store totals"""
+        return {'hits': self.hits, 'misses': self.misses, 'store': self.store.stats()}
+
+class CachedEmbeddings:
+    """Embedding backend wrapper that only sends uncached chunks to the backend.
+
+    Exposes the same embed_documents/embed_query/embed_queries interface as
+    utils.embeddings.Embedder; only document embeddings are cached.
+    """
+
+    def __init__(self, backend: Any, model_name: Optional[str] = None, store: Optional[SQLiteCache] = None):
+        """
+        Args:
+            backend: Object with embed_documents(texts) and embed_query(text)
+            model_name: Model name used in cache keys, defaults to the backend's model attribute
+            store: Backing store, defaults to the shared on-disk store
+        """
+        self.backend = backend
+        model_name = model_name or getattr(backend, 'model', None) or type(backend).__name__
+        self.model = model_name
+        self.cache = EmbeddingCache(model_name, store)
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into an (n, dim) float32 matrix, computing only the ones missing from the cache"""
+        vectors = self.cache.get_many(texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            logger.debug(f"Embedding {len(missing)} of {len(texts)} chunks (cache hits: {len(texts) - len(missing)})")
+            computed = np.asarray(self.backend.embed_documents(missing), dtype=np.float32)
+            self.cache.set_many(missing, computed)
+            computed = dict(zip(missing, computed))
+            vectors = [
+                vector if vector is not None else computed[text]
+                for text, vector in zip(texts, vectors)
+            ]
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a single query into a (dim,) float32 vector; queries are not cached"""
+        return np.asarray(self.backend.embed_query(text), dtype=np.float32)
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of queries into an (n, dim) float32 matrix with the backend's query embedding
+
+        Queries are not cached: they rarely repeat, and would evict chunk
+        embeddings that are reused on every re-index.
+        """
+        if hasattr(self.backend, 'embed_queries'):
+            return np.asarray(self.backend.embed_queries(texts), dtype=np.float32)
+        return np.vstack([self.embed_query(text) for text in texts])
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters of the underlying cache"""
+        return self.cache.stats()
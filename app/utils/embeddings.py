@@ -0,0 +1,138 @@
+import os
+import re
+import zlib
+from typing import List, Optional
+
+import numpy as np
+
+from utils.logging_utils import default_logger as logger
+
+EMBEDDING_BACKEND = os.getenv("RAG_EMBEDDING_BACKEND", "auto")
+HASHING_EMBEDDING_DIM = int(os.getenv("RAG_HASHING_DIM", "1024"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+class Embedder:
+    """Interface every embedding backend implements.
+
+    Backends embed batches of texts into a float32 matrix with one row per text.
+    """
+
+    model: str = "embedder"
+    # Remote backends pay a network round trip per call and are worth caching
+    is_remote: bool = False
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts into an (n, dim) float32 matrix"""
+        raise NotImplementedError
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a single query into a (dim,) float32 vector"""
+        return self.embed_documents([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of queries into an (n, dim) float32 matrix"""
+        return np.vstack([self.embed_query(text) for text in texts])
+
+class HashingEmbedder(Embedder):
+    """Local CPU embedder using signed feature hashing of word and character n-grams.
+
+    Needs no model download or network access. Term frequencies are
+    log-scaled and every row is L2-normalised, so L2 distance between vectors
+    ranks like cosine similarity over shared n-grams.
+    """
+
+    is_remote = False
+
+    def __init__(self, dimension: int = HASHING_EMBEDDING_DIM, char_ngram: int = 3):
+        """
+        Args:
+            dimension: Number of hash buckets (output vector size)
+            char_ngram: Length of the character n-grams taken inside each token
+        """
+        self.dimension = dimension
+        self.char_ngram = char_ngram
+        self.model = f"hashing-ngram-{dimension}-{char_ngram}"
+
+    def _features(self, text: str) -> List[str]:
+        """Word unigrams, word bigrams and in-word character n-grams"""
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = list(tokens)
+        features.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        n = self.char_ngram
+        for token in tokens:
+            padded = f"<{token}>"
+            features.extend(f"#{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+        return features
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        rows, hashes = [], []
+        for row, text in enumerate(texts):
+            row_hashes = [zlib.crc32(feature.encode('utf-8')) for feature in self._features(text)]
+            hashes.extend(row_hashes)
+            rows.extend([row] * len(row_hashes))
+
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        if hashes:
+            hashes = np.asarray(hashes, dtype=np.uint32)
+            rows = np.asarray(rows, dtype=np.int64)
+            columns = (hashes % self.dimension).astype(np.int64)
+            # The top hash bit picks the sign so collisions tend to cancel out
+            signs = np.where(hashes >> 31, -1.0, 1.0)
+            counts = np.bincount(rows * self.dimension + columns, weights=signs,
+                                 minlength=len(texts) * self.dimension)
+            matrix = counts.reshape(len(texts), self.dimension).astype(np.float32)
+            matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        # Queries and documents are hashed the same way, so a batch of queries is one matrix pass
+        return self.embed_documents(texts)
+
+class OpenAIEmbedder(Embedder):
+    """OpenAI embeddings through langchain_openai"""
+
+    is_remote = True
+
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Args:
+            api_key: OpenAI API key, defaults to the OPENAI_API_KEY environment variable
+        """
+        from langchain_openai import OpenAIEmbeddings
+
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            logger.error("OpenAI API key not found in environment variables")
+            raise ValueError("OpenAI API key is required for OpenAI embeddings")
+        self._client = OpenAIEmbeddings(openai_api_key=api_key)
+        self.model = self._client.model
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self._client.embed_documents(texts), dtype=np.float32)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return np.asarray(self._client.embed_query(text), dtype=np.float32)
+
+def get_embedder(backend: Optional[str] = None) -> Embedder:
+    """
+    Create the embedding backend selected by configuration
+
+    Args:
+        backend: 'openai', 'hashing' or 'auto' (OpenAI when OPENAI_API_KEY is set,
+            otherwise the local hashing embedder); defaults to RAG_EMBEDDING_BACKEND
+
+    Returns:
+        Embedder: The configured backend
+    """
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    if backend == "auto":
+        backend = "openai" if os.getenv("OPENAI_API_KEY") else "hashing"
+    if backend == "openai":
+        return OpenAIEmbedder()
+    if backend == "hashing":
+        return HashingEmbedder()
+    raise ValueError(f"Unknown embedding backend: {backend}")
@@ -0,0 +1,328 @@
+"""
+Rate-limit-aware scheduling of GitHub API requests across a pool of tokens
+"""
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+
+# Comma-separated personal access tokens; requests rotate across them as their budgets run down
+GITHUB_TOKENS = [token.strip() for token in os.getenv("GITHUB_TOKENS", "").split(",") if token.strip()]
+GITHUB_MAX_CONCURRENCY = int(os.getenv("GITHUB_MAX_CONCURRENCY", "16"))
+GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", "4"))
+# Exponential backoff (with full jitter) after secondary rate limits, in seconds
+GITHUB_BACKOFF_BASE = float(os.getenv("GITHUB_BACKOFF_BASE", "1"))
+GITHUB_BACKOFF_MAX = float(os.getenv("GITHUB_BACKOFF_MAX", "60"))
+# Requests wait this long for a token's budget to reset; longer waits fail with RateLimitExceeded
+GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))
+# Requests left on a token that are kept back, so interactive use is not starved by one large fetch
+GITHUB_RATE_LIMIT_RESERVE = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "0"))
+
+# Lower runs first: a profile is useless without its user and repository list, but works without READMEs
+PRIORITY_PROFILE, PRIORITY_REPOS, PRIORITY_DETAILS, PRIORITY_README = 0, 1, 2, 3
+PRIORITY_NAMES = {PRIORITY_PROFILE: 'profile', PRIORITY_REPOS: 'repos', PRIORITY_DETAILS: 'details',
+                  PRIORITY_README: 'readme'}
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when every token's budget is spent and none resets within the allowed wait"""
+
+    def __init__(self, message: str, reset: float):
+        super().__init__(message)
+        self.reset = reset
+
+@dataclass
+class RateLimit:
+    """Last known budget of one token for one resource ('core', 'graphql', 'search', ...)"""
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset: float = 0.0
+    # Whether the low-budget warning was logged in the current window
+    warned: bool = False
+
+    def exhausted(self, now: float, reserve: int = 0) -> bool:
+        return self.remaining is not None and self.remaining <= reserve and self.reset > now
+
+class GithubScheduler:
+    """
+    Shared gate for GitHub API requests
+
+    Requests queue by priority and are admitted up to max_concurrency at a
+    time. Each is sent with the token that has the most budget left for its
+    resource, as tracked from the X-RateLimit-* response headers. When a
+    token is exhausted the request moves to another one, and when all are
+    exhausted it waits for the earliest reset while requests queued behind
+    it for other resources go ahead. Secondary rate limits (429,
+    or 403 with Retry-After) are retried after Retry-After or a jittered
+    exponential backoff.
+    """
+
+    def __init__(self, tokens: Optional[Sequence[Optional[str]]] = None, session: Optional[requests.Session] = None,
+                 max_concurrency: int = GITHUB_MAX_CONCURRENCY, max_retries: int = GITHUB_MAX_RETRIES,
+                 backoff_base: float = GITHUB_BACKOFF_BASE, backoff_max: float = GITHUB_BACKOFF_MAX,
+                 max_wait: float = GITHUB_RATE_LIMIT_MAX_WAIT, reserve: int = GITHUB_RATE_LIMIT_RESERVE,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            tokens: Tokens to rotate across; None entries send anonymous requests.
+                Defaults to GITHUB_TOKENS, else GITHUB_TOKEN, else anonymous
+            session: HTTP session, defaults to a new pooled session
+            max_concurrency: Requests in flight at once
+            max_retries: Retries after secondary rate limits and connection errors
+            backoff_base: First backoff ceiling in seconds, doubled every retry
+            backoff_max: Largest backoff ceiling in seconds
+            max_wait: Longest wait in seconds for an exhausted budget to reset
+            reserve: Requests left unused on every token
+            timeout: Seconds to connect and to wait for each response
+        """
+        from utils.github_utils import GITHUB_TIMEOUT, create_session
+
+        if tokens is None:
+            tokens = GITHUB_TOKENS or [os.getenv("GITHUB_TOKEN") or None]
+        self.tokens: List[Optional[str]] = list(tokens) or [None]
+        self.session = session or create_session(max_concurrency)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self.timeout = timeout if timeout is not None else GITHUB_TIMEOUT
+        self._limits: Dict[Tuple[int, str], RateLimit] = {}
+        self._queue: List[Tuple[int, int, str]] = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def label(self, index: int) -> str:
+        """Name of a token safe to log"""
+        return "anonymous" if self.tokens[index] is None else f"token-{index + 1}"
+
+    def request(self, url: str, headers: Optional[Dict[str, str]] = None, priority: int = PRIORITY_DETAILS,
+                resource: str = "core", method: str = "GET", json: Any = None) -> requests.Response:
+        """
+        Send a request once it is admitted and a token has budget for it
+
+        Args:
+            url: Request URL
+            headers: Request headers; Authorization is set from the chosen token
+            priority: PRIORITY_* value, lower is sent first
+            resource: Rate-limit bucket the request draws from
+            method: HTTP method
+            json: JSON request body
+
+        Returns:
+            requests.Response: The final response, which may still be an error status
+
+        Raises:
+            RateLimitExceeded: If no token has budget within max_wait
+            requests.exceptions.RequestException: If the request keeps failing to connect
+        """
+        backoffs = switches = 0
+        while True:
+            token = self._acquire(priority, resource)
+            try:
+                response = self.session.request(
+                    method, url, headers=self._headers(headers, token), json=json, timeout=self.timeout
+                )
+            except requests.exceptions.RequestException:
+                self._release()
+                if backoffs >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(backoffs))
+                backoffs += 1
+                continue
+            resource = self._update(token, resource, response)
+            self._release()
+            default_metrics.increment("github.requests")
+
+            if response.status_code not in (403, 429):
+                return response
+            if response.headers.get('X-RateLimit-Remaining') == '0' and 'Retry-After' not in response.headers:
+                # Primary limit: the token is marked exhausted, so the next attempt picks another or waits
+                default_metrics.increment("github.rate_limited")
+                switches += 1
+                if switches > 2 * len(self.tokens):
+                    return response
+                logger.warning(f"GitHub budget of {self.label(token)} exhausted for {resource}")
+                continue
+            if response.status_code == 429 or 'Retry-After' in response.headers or \
+                    'secondary rate limit' in response.text.lower():
+                if backoffs >= self.max_retries:
+                    return response
+                delay = self._retry_after(response)
+                delay = self._backoff(backoffs) if delay is None else delay
+                default_metrics.increment("github.backoffs")
+                logger.warning(f"GitHub secondary rate limit, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                backoffs += 1
+                continue
+            # A plain 403 (e.g. a blocked repository) is not retried
+            return response
+
+    def _headers(self, headers: Optional[Dict[str, str]], token: int) -> Dict[str, str]:
+        headers = {name: value for name, value in (headers or {}).items() if name.lower() != 'authorization'}
+        if self.tokens[token] is not None:
+            headers['Authorization'] = f"token {self.tokens[token]}"
+        return headers
+
+    def _acquire(self, priority: int, resource: str) -> int:
+        """Wait until a slot is free, a token has budget and no request ahead of this one could use it instead"""
+        queued = time.perf_counter()
+        with self._cond:
+            entry = (priority, next(self._sequence), resource)
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    if self._active < self.max_concurrency:
+                        now = time.time()
+                        token = self._pick(resource, now)
+                        if token is not None:
+                            if self._next_ready(now) == entry:
+                                break
+                            self._cond.wait()
+                            continue
+                        # Only this resource is out of budget; requests for others are admitted past this one
+                        reset = min(self._limit(i, resource).reset for i in range(len(self.tokens)))
+                        if reset - now > self.max_wait:
+                            raise RateLimitExceeded(
+                                f"GitHub {resource} rate limit exhausted on {len(self.tokens)} token(s); "
+                                f"resets in {reset - now:.0f}s", reset
+                            )
+                        default_metrics.increment("github.rate_limit_waits")
+                        self._cond.wait(max(reset - now, 0.05))
+                    else:
+                        self._cond.wait()
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._active += 1
+                limit = self._limit(token, resource)
+                if limit.remaining is not None:
+                    limit.remaining -= 1
+                # The next request in line may be admitted too
+                self._cond.notify_all()
+            except BaseException:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._cond.notify_all()
+                raise
+        default_metrics.observe(f"github.wait.{PRIORITY_NAMES.get(priority, priority)}",
+                                time.perf_counter() - queued)
+        return token
+
+    def _next_ready(self, now: float) -> Optional[Tuple[int, int, str]]:
+        """Queued request first in priority order whose resource has a token with budget; caller holds the lock"""
+        ready: Dict[str, bool] = {}
+        for entry in sorted(self._queue):
+            resource = entry[2]
+            if resource not in ready:
+                ready[resource] = self._pick(resource, now) is not None
+            if ready[resource]:
+                return entry
+        return None
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _limit(self, token: int, resource: str) -> RateLimit:
+        """Budget of a token for a resource; caller holds the lock"""
+        return self._limits.setdefault((token, resource), RateLimit())
+
+    def _pick(self, resource: str, now: float) -> Optional[int]:
+        """Token with the most budget left for resource, unknown budgets first; caller holds the lock"""
+        best, best_remaining = None, -1
+        for token in range(len(self.tokens)):
+            limit = self._limit(token, resource)
+            if limit.exhausted(now, self.reserve):
+                continue
+            remaining = float('inf') if limit.remaining is None or limit.reset <= now else limit.remaining
+            if remaining > best_remaining:
+                best, best_remaining = token, remaining
+        return best
+
+    def _update(self, token: int, resource: str, response: requests.Response) -> str:
+        """Record the budget from a response's rate-limit headers and return the bucket it drew from"""
+        headers = response.headers
+        resource = headers.get('X-RateLimit-Resource', resource)
+        if 'X-RateLimit-Remaining' not in headers:
+            return resource
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            limit = int(headers.get('X-RateLimit-Limit', remaining))
+            reset = float(headers.get('X-RateLimit-Reset', 0))
+        except ValueError:
+            return resource
+        with self._cond:
+            state = self._limit(token, resource)
+            if reset > state.reset:
+                state.remaining, state.reset, state.warned = remaining, reset, False
+            elif state.remaining is None or remaining < state.remaining:
+                # Responses can arrive out of order; within one window the lowest count is the current one
+                state.remaining = remaining
+            state.limit = limit
+            warn = not state.warned and remaining * 10 < limit
+            state.warned = state.warned or warn
+            # A reset may have made budget available to a waiting request
+            self._cond.notify_all()
+        if warn:
+            logger.warning(f"GitHub {resource} budget of {self.label(token)} is low: {remaining}/{limit} left")
+        return resource
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        try:
+            return max(0.0, float(response.headers['Retry-After']))
+        except (KeyError, ValueError):
+            return None
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def budget(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Remaining budget by resource, summed over tokens with a known budget
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each resource seen so far: remaining, limit,
+                reset (earliest, epoch seconds), exhausted (token count) and per-token details
+        """
+        now = time.time()
+        report: Dict[str, Dict[str, Any]] = {}
+        with self._cond:
+            for (token, resource), limit in sorted(self._limits.items()):
+                if limit.remaining is None:
+                    continue
+                entry = report.setdefault(resource, {'remaining': 0, 'limit': 0, 'reset': None,
+                                                     'exhausted': 0, 'tokens': {}})
+                remaining = limit.limit if limit.reset <= now else limit.remaining
+                entry['remaining'] += remaining
+                entry['limit'] += limit.limit
+                entry['reset'] = limit.reset if entry['reset'] is None else min(entry['reset'], limit.reset)
+                entry['exhausted'] += limit.exhausted(now, self.reserve)
+                entry['tokens'][self.label(token)] = {'remaining': remaining, 'limit': limit.limit,
+                                                      'reset': limit.reset}
+        return report
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> GithubScheduler:
+    """Return the process-wide scheduler, shared by every profile fetch"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from utils.github_utils import GITHUB_SESSION_POOL_SIZE, get_session
+            _scheduler = GithubScheduler(session=get_session(),
+                                         max_concurrency=min(GITHUB_MAX_CONCURRENCY, GITHUB_SESSION_POOL_SIZE))
+        return _scheduler
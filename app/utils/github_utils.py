@@ -1,41 +1,191 @@
 import requests
 import json
 import base64
-import streamlit as st
-from typing import Dict, List, Optional, Any
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Any, Tuple
 import os
+import threading
 from dotenv import load_dotenv
+from utils.cache_utils import SQLiteCache
+from utils.github_scheduler import (PRIORITY_DETAILS, PRIORITY_PROFILE, PRIORITY_README, PRIORITY_REPOS,
+                                    GithubScheduler, RateLimitExceeded, get_scheduler)
+from utils.hooks import open_cache
 from utils.logging_utils import default_logger as logger
 
 # Load environment variables
 load_dotenv()
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_MAX_WORKERS = int(os.getenv("GITHUB_MAX_WORKERS", "8"))
+GITHUB_PER_PAGE = 100
+GITHUB_CACHE_MAX_BYTES = int(os.getenv("GITHUB_CACHE_MAX_MB", "256")) * 1024 * 1024
+# Connections kept alive to the API across every fetch in the process
+GITHUB_SESSION_POOL_SIZE = int(os.getenv("GITHUB_SESSION_POOL_SIZE", "32"))
+# Seconds to connect and to wait for each response
+GITHUB_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "10"))
+# "rest" (one call per repo for languages and README) or "graphql" (up to 100 repos per call, needs a token)
+GITHUB_FETCH_MODE = os.getenv("GITHUB_FETCH_MODE", "rest").lower()
+# GraphQL answers cannot be revalidated with ETags, so they are cached for this many seconds
+GITHUB_GRAPHQL_CACHE_TTL = float(os.getenv("GITHUB_GRAPHQL_CACHE_TTL", "3600"))
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+_session = None
+
+def get_response_cache() -> SQLiteCache:
+    """Return the process-wide on-disk cache of GitHub API responses."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = open_cache("github_responses.sqlite", max_bytes=GITHUB_CACHE_MAX_BYTES)
+        return _response_cache
+
+def create_session(pool_size: int = GITHUB_MAX_WORKERS) -> requests.Session:
+    """Create a requests session whose connection pool fits the worker count.
+    
+    Args:
+        pool_size (int): Maximum number of pooled connections per host
+    
+    Returns:
+        requests.Session: Session reusing keep-alive connections
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, so concurrent profile fetches share one keep-alive pool"""
+    global _session
+    with _response_cache_lock:
+        if _session is None:
+            _session = create_session(GITHUB_SESSION_POOL_SIZE)
+        return _session
+
+def language_shares(sizes: Dict[str, int]) -> Dict[str, float]:
+    """Convert bytes per language to percentages"""
+    total = sum(sizes.values())
+    if total > 0:
+        return {k: round((v / total) * 100, 2) for k, v in sizes.items()}
+    return sizes
+
+def repo_entry(repo: Dict[str, Any], languages: Dict[str, float], readme: str) -> Dict[str, Any]:
+    """github_data entry of a repository given in the REST API's shape"""
+    return {
+        'name': repo['name'],
+        'description': repo['description'] or "No description available",
+        'stars': repo['stargazers_count'],
+        'forks': repo['forks_count'],
+        'language': repo['language'],
+        'url': repo['html_url'],
+        'languages': languages,
+        'topics': repo.get('topics', []),
+        'readme': readme
+    }
 
 class GithubRepoFetcher:
-    def __init__(self, username: str):
+    def __init__(
+        self,
+        username: str,
+        max_workers: int = GITHUB_MAX_WORKERS,
+        session: Optional[requests.Session] = None,
+        api_url: str = GITHUB_API_URL,
+        cache: Optional[SQLiteCache] = None,
+        scheduler: Optional[GithubScheduler] = None
+    ):
         """Initialize the GitHub repository fetcher.
         
         Args:
             username (str): GitHub username to fetch data for
+            max_workers (int): Maximum number of concurrent per-repo requests
+            session (requests.Session, optional): Session for a scheduler of this fetcher's own;
+                ignored when scheduler is given
+            api_url (str): GitHub API root URL
+            cache (SQLiteCache, optional): Conditional-request cache, defaults to the shared on-disk cache
+            scheduler (GithubScheduler, optional): Rate-limit-aware request scheduler, which also
+                supplies the tokens; defaults to the process-wide one
         """
         self.username = username
-        self.headers = {'Authorization': f'token {GITHUB_TOKEN}'} if GITHUB_TOKEN else {}
-        self.base_url = f"https://api.github.com/repos/{username}"
+        self.max_workers = max(1, max_workers)
+        if scheduler is None:
+            scheduler = get_scheduler() if session is None else GithubScheduler(session=session)
+        self.scheduler = scheduler
+        self.api_url = api_url.rstrip('/')
+        self.cache = cache if cache is not None else get_response_cache()
+        self.headers = {}
+        self.base_url = f"{self.api_url}/repos/{username}"
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None,
+             priority: int = PRIORITY_DETAILS) -> Tuple[str, Optional[str]]:
+        """Make a conditional GET request, reusing the cached body on 304 Not Modified.
+        
+        Args:
+            url (str): Request URL
+            headers (Dict[str, str], optional): Request headers, defaults to self.headers
+            priority (int): Scheduler priority, PRIORITY_* of utils.github_scheduler
+        
+        Returns:
+            Tuple[str, Optional[str]]: Response body and the URL of the next page, if any
+        """
+        headers = {name: value for name, value in (headers or self.headers).items()
+                   if name.lower() not in ('if-none-match', 'if-modified-since')}
+        key = f"{headers.get('Accept', '')} {url}"
+        cached = self.cache.get_json(key)
+        # Validators are only sent when there is a body to reuse on 304
+        reusable = bool(cached) and cached.get('body') is not None
+        conditional = dict(headers)
+        if reusable:
+            if cached.get('etag'):
+                conditional['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                conditional['If-Modified-Since'] = cached['last_modified']
+        
+        response = self.scheduler.request(url, headers=conditional, priority=priority)
+        if response.status_code == 304:
+            if reusable:
+                logger.debug(f"Not modified, using cached response for: {url}")
+                return cached['body'], cached.get('next')
+            # Nothing to reuse (e.g. the validators came from a proxy); ask for the full body
+            response = self.scheduler.request(url, headers=headers, priority=priority)
+            if response.status_code == 304:
+                raise requests.exceptions.HTTPError(f"304 Not Modified without a cached body for: {url}",
+                                                    response=response)
+        response.raise_for_status()
+        
+        next_url = response.links.get('next', {}).get('url')
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.cache.set_json(key, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body': response.text,
+                'next': next_url
+            })
+        return response.text, next_url
+
+    def _get_all_pages(self, url: str, priority: int = PRIORITY_REPOS) -> List[Any]:
+        """Fetch a paginated list endpoint by following the Link rel="next" headers."""
+        items = []
+        next_url = f"{url}?per_page={GITHUB_PER_PAGE}"
+        while next_url:
+            logger.debug(f"Making request to: {next_url}")
+            body, next_url = self._get(next_url, priority=priority)
+            items.extend(json.loads(body))
+        return items
 
     def fetch_languages(self, repo_name: str) -> Dict[str, float]:
         """Fetch languages used in a repository."""
         try:
             logger.debug(f"Fetching languages for repo: {repo_name}")
-            response = requests.get(f"{self.base_url}/{repo_name}/languages", headers=self.headers)
-            response.raise_for_status()
+            body, _ = self._get(f"{self.base_url}/{repo_name}/languages")
             
-            languages = response.json()
-            total = sum(languages.values())
-            if total > 0:
-                languages = {k: round((v / total) * 100, 2) for k, v in languages.items()}
-            return languages
+            return language_shares(json.loads(body))
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError, RateLimitExceeded) as e:
             logger.warning(f"Failed to fetch languages for {repo_name}: {str(e)}")
             return {}
 
@@ -43,14 +193,14 @@ class GithubRepoFetcher:
         """Fetch README content for a repository."""
         try:
             logger.debug(f"Fetching README for repo: {repo_name}")
-            response = requests.get(
+            body, _ = self._get(
                 f"{self.base_url}/{repo_name}/readme",
-                headers={**self.headers, "Accept": "application/vnd.github.v3.raw"}
+                headers={**self.headers, "Accept": "application/vnd.github.v3.raw"},
+                priority=PRIORITY_README
             )
-            response.raise_for_status()
-            return response.text
+            return body
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, RateLimitExceeded) as e:
             logger.warning(f"Failed to fetch README for {repo_name}: {str(e)}")
             return "No README available"
 
@@ -65,39 +215,28 @@ class GithubRepoFetcher:
         
         try:
             # Fetch user data
-            user_url = f"https://api.github.com/users/{self.username}"
+            user_url = f"{self.api_url}/users/{self.username}"
             logger.debug(f"Making request to: {user_url}")
-            user_response = requests.get(user_url, headers=self.headers)
-            user_response.raise_for_status()
-            user_data = user_response.json()
+            body, _ = self._get(user_url, priority=PRIORITY_PROFILE)
+            user_data = json.loads(body)
             
-            # Fetch repositories
-            repos_url = f"https://api.github.com/users/{self.username}/repos"
-            logger.debug(f"Making request to: {repos_url}")
-            repos_response = requests.get(repos_url, headers=self.headers)
-            repos_response.raise_for_status()
-            repos_data = repos_response.json()
+            # Fetch every page of repositories
+            repos_url = f"{self.api_url}/users/{self.username}/repos"
+            repos_data = self._get_all_pages(repos_url)
             
             if not repos_data:
                 logger.warning(f"No repositories found for user {self.username}")
                 return None
                 
-            # Process repository data
-            processed_repos = []
-            for repo in repos_data:
-                if not repo['fork']:  # Only include non-forked repositories
-                    repo_info = {
-                        'name': repo['name'],
-                        'description': repo['description'] or "No description available",
-                        'stars': repo['stargazers_count'],
-                        'forks': repo['forks_count'],
-                        'language': repo['language'],
-                        'url': repo['html_url'],
-                        'languages': self.fetch_languages(repo['name']),
-                        'topics': repo.get('topics', []),
-                        'readme': self.fetch_readme(repo['name'])
-                    }
-                    processed_repos.append(repo_info)
+            # Process repository data, fetching per-repo details concurrently
+            own_repos = [repo for repo in repos_data if not repo['fork']]  # Only include non-forked repositories
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                languages = executor.map(self.fetch_languages, [repo['name'] for repo in own_repos])
+                readmes = executor.map(self.fetch_readme, [repo['name'] for repo in own_repos])
+                processed_repos = [
+                    repo_entry(repo, repo_languages, readme)
+                    for repo, repo_languages, readme in zip(own_repos, languages, readmes)
+                ]
             
             github_data = {
                 'username': self.username,
@@ -113,6 +252,167 @@ class GithubRepoFetcher:
             logger.debug(f"Processed GitHub data: {github_data}")
             return github_data
             
+        except RateLimitExceeded as e:
+            logger.error(f"GitHub rate limit reached while fetching {self.username}: {str(e)}")
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching GitHub data: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error while processing GitHub data: {str(e)}")
+            return None
+
+# README file names tried in order, as the REST /readme endpoint would find them
+GRAPHQL_README_PATHS = ("README.md", "readme.md", "Readme.md", "README.rst", "README.txt", "README")
+
+GRAPHQL_PROFILE_QUERY = """
+query($login: String!, $cursor: String) {
+  user(login: $login) {
+    name
+    bio
+    followers { totalCount }
+    following { totalCount }
+    repositories(first: %(page_size)d, after: $cursor, privacy: PUBLIC, ownerAffiliations: OWNER,
+                 orderBy: {field: NAME, direction: ASC}) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        description
+        isFork
+        stargazerCount
+        forkCount
+        url
+        primaryLanguage { name }
+        languages(first: 100, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+        repositoryTopics(first: 100) { nodes { topic { name } } }
+%(readmes)s
+      }
+    }
+  }
+}
+""" % {
+    'page_size': GITHUB_PER_PAGE,
+    'readmes': "\n".join(
+        f'        readme{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+        for i, path in enumerate(GRAPHQL_README_PATHS)
+    ),
+}
+
+class GithubGraphQLFetcher:
+    """
+    Fetch the same github_data as GithubRepoFetcher through the GraphQL API
+
+    Repositories, their languages with byte sizes, topics and README blob
+    come back 100 at a time in one query, instead of two REST calls per
+    repository. GitHub only serves GraphQL to authenticated requests.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        api_url: str = GITHUB_API_URL,
+        cache: Optional[SQLiteCache] = None,
+        scheduler: Optional[GithubScheduler] = None,
+        cache_ttl: float = GITHUB_GRAPHQL_CACHE_TTL
+    ):
+        """
+        Args:
+            username (str): GitHub username to fetch data for
+            api_url (str): GitHub API root URL; queries go to {api_url}/graphql
+            cache (SQLiteCache, optional): Response cache, defaults to the shared on-disk cache
+            scheduler (GithubScheduler, optional): Request scheduler, defaults to the process-wide one
+            cache_ttl (float): Seconds query results are reused
+        """
+        self.username = username
+        self.api_url = api_url.rstrip('/')
+        self.cache = cache if cache is not None else get_response_cache()
+        self.scheduler = scheduler or get_scheduler()
+        self.cache_ttl = cache_ttl
+
+    def _query(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the profile query, returning its data; errors other than a missing user raise ValueError"""
+        key = f"graphql {self.api_url} {hashlib.sha256(GRAPHQL_PROFILE_QUERY.encode('utf-8')).hexdigest()} " \
+              f"{json.dumps(variables, sort_keys=True)}"
+        cached = self.cache.get_json(key)
+        if cached is not None:
+            logger.debug(f"Using cached GraphQL response for {variables}")
+            return cached
+
+        response = self.scheduler.request(
+            f"{self.api_url}/graphql", priority=PRIORITY_PROFILE, resource="graphql", method="POST",
+            json={'query': GRAPHQL_PROFILE_QUERY, 'variables': variables}
+        )
+        response.raise_for_status()
+        payload = response.json()
+        errors = [error for error in payload.get('errors') or [] if error.get('type') != 'NOT_FOUND']
+        if errors:
+            raise ValueError(f"GraphQL errors: {'; '.join(error.get('message', '') for error in errors)}")
+        data = payload.get('data') or {}
+        self.cache.set_json(key, data, ttl=self.cache_ttl)
+        return data
+
+    @staticmethod
+    def _repo(node: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, float], str]:
+        """Map a repository node to the REST shape, its language shares and README"""
+        repo = {
+            'name': node['name'],
+            'description': node['description'],
+            'stargazers_count': node['stargazerCount'],
+            'forks_count': node['forkCount'],
+            'language': (node.get('primaryLanguage') or {}).get('name'),
+            'html_url': node['url'],
+            'topics': [topic['topic']['name'] for topic in node['repositoryTopics']['nodes']],
+        }
+        languages = language_shares({edge['node']['name']: edge['size'] for edge in node['languages']['edges']})
+        readme = next(
+            (node[f"readme{i}"]['text'] for i in range(len(GRAPHQL_README_PATHS))
+             if (node.get(f"readme{i}") or {}).get('text') is not None),
+            "No README available"
+        )
+        return repo, languages, readme
+
+    def fetch_repo_info(self) -> Optional[Dict[str, Any]]:
+        """
+        Fetches repository information for the user
+
+        Returns:
+            Optional[Dict[str, Any]]: Dictionary containing GitHub data or None if failed
+        """
+        logger.info(f"Fetching GitHub data for username: {self.username} (GraphQL)")
+        try:
+            user, nodes, cursor = None, [], None
+            while True:
+                data = self._query({'login': self.username, 'cursor': cursor})
+                user = data.get('user')
+                if user is None:
+                    logger.warning(f"GitHub user {self.username} not found")
+                    return None
+                repositories = user['repositories']
+                nodes.extend(repositories['nodes'])
+                if not repositories['pageInfo']['hasNextPage']:
+                    break
+                cursor = repositories['pageInfo']['endCursor']
+
+            if not nodes:
+                logger.warning(f"No repositories found for user {self.username}")
+                return None
+
+            github_data = {
+                'username': self.username,
+                'name': user.get('name'),
+                'bio': user.get('bio'),
+                'followers': user['followers']['totalCount'],
+                'following': user['following']['totalCount'],
+                'public_repos': user['repositories']['totalCount'],
+                'repositories': [repo_entry(*self._repo(node)) for node in nodes if not node['isFork']]
+            }
+            logger.info(f"Successfully fetched GitHub data for {self.username}")
+            return github_data
+
+        except RateLimitExceeded as e:
+            logger.error(f"GitHub rate limit reached while fetching {self.username}: {str(e)}")
+            return None
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching GitHub data: {str(e)}")
             return None
@@ -120,13 +420,13 @@ class GithubRepoFetcher:
             logger.error(f"Unexpected error while processing GitHub data: {str(e)}")
             return None
 
-@st.cache_data(ttl=3600)
-def fetch_github_data(username: str) -> Optional[Dict[str, Any]]:
+def fetch_github_data(username: str, mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
-    Cached wrapper for fetching GitHub data
+    Fetch GitHub data, revalidating against the persistent response cache
     
     Args:
         username (str): GitHub username
+        mode (str, optional): "rest" or "graphql", defaults to GITHUB_FETCH_MODE
         
     Returns:
         Optional[Dict[str, Any]]: Dictionary containing GitHub data or None if failed
@@ -134,5 +434,12 @@ def fetch_github_data(username: str) -> Optional[Dict[str, Any]]:
     if not username:
         logger.warning("No username provided for GitHub data fetch")
         return None
-    fetcher = GithubRepoFetcher(username)
-    return fetcher.fetch_repo_info() 
\ No newline at end of file
+    mode = mode or GITHUB_FETCH_MODE
+    if mode == "graphql" and all(token is None for token in get_scheduler().tokens):
+        logger.warning("GitHub GraphQL needs a token; set GITHUB_TOKEN or GITHUB_TOKENS. Falling back to REST")
+        mode = "rest"
+    fetcher = GithubGraphQLFetcher(username) if mode == "graphql" else GithubRepoFetcher(username)
+    github_data = fetcher.fetch_repo_info()
+    for resource, budget in fetcher.scheduler.budget().items():
+        logger.info(f"GitHub {resource} budget: {budget['remaining']}/{budget['limit']} requests left")
+    return github_data 
\ No newline at end of file
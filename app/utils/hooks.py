@@ -0,0 +1,105 @@
+"""
+Hooks connecting the Streamlit-free core to whichever front end hosts it
+
+Core modules never call a UI framework: user-facing errors go through
+report_error and persistent caches are opened with open_cache. The
+Streamlit app registers st.error as an error reporter for its script
+thread, and the job queue collects errors reported inside a job on the
+job; workers, the HTTP API and benchmarks can leave the defaults or
+redirect caches.
+"""
+import threading
+from typing import Any, Callable, List, Optional
+
+from utils.cache_utils import SQLiteCache, cache_path
+from utils.logging_utils import default_logger as logger
+
+ErrorReporter = Callable[[str], None]
+CacheFactory = Callable[..., SQLiteCache]
+
+_error_reporters: List[ErrorReporter] = []
+_cache_factory: Optional[CacheFactory] = None
+_hooks_lock = threading.Lock()
+_thread = threading.local()
+
+def _thread_reporters() -> List[ErrorReporter]:
+    if not hasattr(_thread, 'reporters'):
+        _thread.reporters = []
+    return _thread.reporters
+
+def add_error_reporter(reporter: ErrorReporter, current_thread: bool = False) -> None:
+    """
+    Register a function shown every message passed to report_error; registering it again is a no-op
+
+    Args:
+        reporter: Called with each message
+        current_thread: Only receive messages reported from the calling thread, e.g. a UI
+            function that must run in the thread handling the user's request
+    """
+    if current_thread:
+        reporters = _thread_reporters()
+        if reporter not in reporters:
+            reporters.append(reporter)
+        return
+    with _hooks_lock:
+        if reporter not in _error_reporters:
+            _error_reporters.append(reporter)
+
+def remove_error_reporter(reporter: ErrorReporter) -> None:
+    """Unregister a reporter added for every thread or for the calling thread"""
+    reporters = _thread_reporters()
+    if reporter in reporters:
+        reporters.remove(reporter)
+    with _hooks_lock:
+        if reporter in _error_reporters:
+            _error_reporters.remove(reporter)
+
+def report_error(message: str) -> None:
+    """
+    Log a user-facing error and pass it to the global reporters and the calling thread's
+
+    A failing reporter is logged and skipped, so reporting an error never
+    raises another one.
+
+    Args:
+        message: Error message for the user
+    """
+    logger.error(message)
+    with _hooks_lock:
+        reporters = list(_error_reporters)
+    for reporter in reporters + _thread_reporters():
+        try:
+            reporter(message)
+        except Exception as e:
+            logger.warning(f"Error reporter {getattr(reporter, '__name__', reporter)} failed: {str(e)}")
+
+def set_cache_factory(factory: Optional[CacheFactory]) -> None:
+    """
+    Replace how shared caches are opened, or restore the default with None
+
+    Only caches opened afterwards are affected; set it before the first use
+    of the core modules.
+
+    Args:
+        factory: Called as factory(filename, **options) with the options open_cache received
+    """
+    global _cache_factory
+    with _hooks_lock:
+        _cache_factory = factory
+
+def open_cache(filename: str, **options: Any) -> SQLiteCache:
+    """
+    Open one of the process-wide caches
+
+    Args:
+        filename: Cache file name, e.g. "pdf_text.sqlite"
+        **options: SQLiteCache options such as max_bytes and ttl
+
+    Returns:
+        SQLiteCache: From the registered factory, by default a file in the cache directory
+    """
+    with _hooks_lock:
+        factory = _cache_factory
+    if factory is not None:
+        return factory(filename, **options)
+    return SQLiteCache(cache_path(filename), **options)
@@ -0,0 +1,381 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from utils.cache_utils import cache_path, file_lock
+from utils.logging_utils import default_logger as logger
+from utils.vector_index import RAG_FLAT_THRESHOLD, build_index, search_index
+
+_managers: Dict[str, "IndexManager"] = {}
+_managers_lock = threading.Lock()
+
+class IndexManager:
+    """Process-wide FAISS index shared by every session and persisted to disk.
+
+    Chunks are stored once per distinct text and linked to the owners (session
+    or candidate IDs) that added them, so a job description shared by many
+    candidates is embedded and indexed a single time. Vectors live in an
+    IndexIDMap2 keyed by chunk ID, which allows incremental add/remove and
+    owner- or source-filtered searches without rebuilding the index. Once the
+    corpus outgrows RAG_FLAT_THRESHOLD the flat index is rebuilt once as an
+    IVF index, which keeps supporting incremental add/remove.
+
+    Several processes may share the directory: writers hold a file lock and
+    reload the stored index before changing it, and readers reload it when
+    another process has replaced it.
+    """
+
+    def __init__(self, directory: str, embeddings: Any, mmap: bool = True):
+        """
+        Args:
+            directory: Directory holding index.faiss and metadata.sqlite
+            embeddings: Embedding backend with embed_documents(texts)
+            mmap: Memory-map the stored index when loading it
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.embeddings = embeddings
+        self.index_path = os.path.join(directory, "index.faiss")
+        self.lock_path = os.path.join(directory, "index.lock")
+        self.mmap = mmap
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._version: Optional[Tuple[int, int, int]] = None
+        self._mapped = False
+        self._conn = sqlite3.connect(os.path.join(directory, "metadata.sqlite"), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_hash TEXT UNIQUE NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS links (
+                chunk_id INTEGER NOT NULL,
+                owner_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                PRIMARY KEY (chunk_id, owner_id, source)
+            );
+            CREATE INDEX IF NOT EXISTS idx_links_owner ON links(owner_id, source);
+        """)
+        self._conn.commit()
+        with self._locked():
+            self.index = self._load(mmap)
+            self._reconcile()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialise writers across this process's threads and every process sharing the directory"""
+        with self._lock:
+            # flock is per open file, so only the outermost holder of the thread lock takes it
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with file_lock(self.lock_path):
+                self._lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth = 0
+
+    def _disk_version(self) -> Optional[Tuple[int, int, int]]:
+        """Identity of the stored index file; os.replace in save() gives every write a new one"""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load(self, mmap: bool) -> Optional[faiss.Index]:
+        """Read the stored index, falling back to a regular read if mmap is not supported"""
+        self._version = self._disk_version()
+        self._mapped = False
+        if self._version is None:
+            return None
+        if mmap:
+            try:
+                index = faiss.read_index(self.index_path, faiss.IO_FLAG_MMAP)
+                self._mapped = True
+                return index
+            except RuntimeError as e:
+                logger.debug(f"Memory-mapped index load failed, reading into memory: {str(e)}")
+        return faiss.read_index(self.index_path)
+
+    def _refresh(self, writable: bool = False) -> None:
+        """
+        Reload the stored index if another process has replaced it since it was read
+
+        Args:
+            writable: Read it into memory, as memory-mapped IVF lists cannot be modified
+        """
+        if self._disk_version() != self._version:
+            logger.debug(f"Reloading shared index changed on disk: {self.index_path}")
+            self.index = self._load(self.mmap and not writable)
+        elif writable and self._mapped:
+            self.index = self._load(False)
+
+    def _stored_ids(self) -> np.ndarray:
+        """Chunk IDs that have a vector in the index"""
+        if self.index is None:
+            return np.empty(0, dtype='int64')
+        if isinstance(self.index, faiss.IndexIDMap):
+            return faiss.vector_to_array(self.index.id_map).astype('int64')
+        invlists = faiss.extract_index_ivf(self.index).invlists
+        ids = [
+            faiss.rev_swig_ptr(invlists.get_ids(i), invlists.list_size(i)).copy()
+            for i in range(invlists.nlist) if invlists.list_size(i)
+        ]
+        return np.concatenate(ids).astype('int64') if ids else np.empty(0, dtype='int64')
+
+    def _reconcile(self) -> None:
+        """Re-embed chunks whose vectors never reached the stored index and drop vectors without a chunk"""
+        stored = set(self._stored_ids().tolist())
+        rows = {row[0] for row in self._conn.execute("SELECT id FROM chunks")}
+        missing = sorted(rows - stored)
+        stale = sorted(stored - rows)
+        if not missing and not stale:
+            return
+        logger.warning(
+            f"Shared index out of sync with its metadata: re-embedding {len(missing)} chunks, "
+            f"dropping {len(stale)} vectors"
+        )
+        self._refresh(writable=True)
+        if stale:
+            self.index.remove_ids(np.array(stale, dtype='int64'))
+        for start in range(0, len(missing), 500):
+            batch = missing[start:start + 500]
+            texts = dict(self._conn.execute(
+                f"SELECT id, text FROM chunks WHERE id IN ({','.join('?' * len(batch))})", batch
+            ).fetchall())
+            vectors = np.asarray(self.embeddings.embed_documents([texts[i] for i in batch]), dtype='float32')
+            self._add_vectors(vectors, np.array(batch, dtype='int64'))
+        self.save()
+
+    def save(self) -> None:
+        """Write the index to disk atomically"""
+        with self._locked():
+            if self.index is None:
+                return
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            faiss.write_index(self.index, tmp_path)
+            os.replace(tmp_path, self.index_path)
+            self._version = self._disk_version()
+
+    @property
+    def ntotal(self) -> int:
+        """Number of distinct chunks in the index"""
+        return self.index.ntotal if self.index is not None else 0
+
+    def add_documents(self, documents: List[Dict[str, Any]], owner_id: str) -> int:
+        """
+        Add chunks for an owner, embedding only texts the index does not hold yet
+
+        Args:
+            documents: Chunks shaped like {'text': str, 'metadata': {'source': str, ...}}
+            owner_id: Session or candidate ID the chunks belong to
+
+        Returns:
+            int: Number of newly embedded chunks
+        """
+        hashes = [hashlib.sha256(doc['text'].encode('utf-8')).hexdigest() for doc in documents]
+        with self._lock:
+            existing = self._chunk_ids(hashes)
+        new_texts = {}
+        for content_hash, doc in zip(hashes, documents):
+            if content_hash not in existing:
+                new_texts.setdefault(content_hash, doc['text'])
+        # Embed before taking the file lock so other processes are not held up by the embedding calls
+        vectors = {}
+        if new_texts:
+            embedded = self.embeddings.embed_documents(list(new_texts.values()))
+            vectors = dict(zip(new_texts, np.asarray(embedded, dtype='float32')))
+
+        with self._locked():
+            self._refresh(writable=True)
+            # Another process may have stored some of the same texts meanwhile
+            existing = self._chunk_ids(hashes)
+            new_texts = {content_hash: text for content_hash, text in new_texts.items() if content_hash not in existing}
+            if new_texts:
+                self._conn.executemany(
+                    "INSERT INTO chunks (content_hash, text) VALUES (?, ?)", list(new_texts.items())
+                )
+                existing.update(self._chunk_ids(list(new_texts)))
+                ids = np.array([existing[content_hash] for content_hash in new_texts], dtype='int64')
+                self._add_vectors(np.stack([vectors[content_hash] for content_hash in new_texts]), ids)
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO links (chunk_id, owner_id, source, metadata) VALUES (?, ?, ?, ?)",
+                [
+                    (existing[content_hash], owner_id, doc['metadata'].get('source', ''), json.dumps(doc['metadata']))
+                    for content_hash, doc in zip(hashes, documents)
+                ]
+            )
+            self._conn.commit()
+            if new_texts:
+                self.save()
+            logger.info(f"Indexed {len(documents)} chunks for {owner_id} ({len(new_texts)} newly embedded)")
+            return len(new_texts)
+
+    def _add_vectors(self, vectors: np.ndarray, ids: np.ndarray) -> None:
+        """Add vectors under chunk IDs, creating the index on first use"""
+        if self.index is None:
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatL2(vectors.shape[1]))
+        self.index.add_with_ids(vectors, ids)
+        self._upgrade_tier()
+
+    def _upgrade_tier(self) -> None:
+        """Rebuild the flat index as IVF once it crosses the brute-force threshold"""
+        if not isinstance(self.index, faiss.IndexIDMap) or self.index.ntotal < RAG_FLAT_THRESHOLD:
+            return
+        if not isinstance(faiss.downcast_index(self.index.index), faiss.IndexFlat):
+            return
+        ids = faiss.vector_to_array(self.index.id_map).astype('int64')
+        vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+        logger.info(f"Shared index reached {len(ids)} chunks, rebuilding as IVF")
+        # IVF supports remove_ids, which HNSW does not
+        self.index = build_index(vectors, ids=ids, index_type="ivf")
+
+    def remove_by_source(self, owner_id: str, source: Optional[str] = None) -> int:
+        """
+        Unlink an owner's chunks and drop chunks no other owner still references
+
+        Args:
+            owner_id: Session or candidate ID
+            source: Only remove chunks of this source (e.g. 'resume'), defaults to all
+
+        Returns:
+            int: Number of chunks removed from the index
+        """
+        with self._locked():
+            self._refresh(writable=True)
+            if source is None:
+                self._conn.execute("DELETE FROM links WHERE owner_id = ?", (owner_id,))
+            else:
+                self._conn.execute("DELETE FROM links WHERE owner_id = ? AND source = ?", (owner_id, source))
+            orphans = [row[0] for row in self._conn.execute(
+                "SELECT id FROM chunks WHERE id NOT IN (SELECT chunk_id FROM links)"
+            )]
+            if orphans:
+                self._conn.executemany("DELETE FROM chunks WHERE id = ?", [(chunk_id,) for chunk_id in orphans])
+                if self.index is not None:
+                    self.index.remove_ids(np.array(orphans, dtype='int64'))
+            self._conn.commit()
+            if orphans:
+                self.save()
+            return len(orphans)
+
+    def allowed_ids(self, owner_id: Optional[str] = None, sources: Optional[Iterable[str]] = None) -> Optional[np.ndarray]:
+        """Chunk IDs visible to an owner and/or sources, or None when unfiltered"""
+        if owner_id is None and not sources:
+            return None
+        clauses, params = [], []
+        if owner_id is not None:
+            clauses.append("owner_id = ?")
+            params.append(owner_id)
+        if sources:
+            sources = list(sources)
+            clauses.append(f"source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT chunk_id FROM links WHERE {' AND '.join(clauses)}", params
+            ).fetchall()
+        return np.array([row[0] for row in rows], dtype='int64')
+
+    def search(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int,
+        owner_id: Optional[str] = None,
+        sources: Optional[Iterable[str]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search the shared index, restricted to an owner's and/or sources' chunks
+
+        Args:
+            query_vectors: (n_queries, dim) float32 matrix
+            top_k: Number of results per query
+            owner_id: Only return chunks linked to this owner
+            sources: Only return chunks from these sources
+
+        Returns:
+            One list of {'text', 'metadata', 'score'} dicts per query
+        """
+        query_vectors = np.asarray(query_vectors, dtype='float32').reshape(-1, query_vectors.shape[-1])
+        with self._lock:
+            self._refresh()
+            if self.index is None or self.index.ntotal == 0:
+                return [[] for _ in range(len(query_vectors))]
+            allowed = self.allowed_ids(owner_id, sources)
+            if allowed is not None and len(allowed) == 0:
+                return [[] for _ in range(len(query_vectors))]
+            distances, ids = search_index(self.index, query_vectors, top_k, allowed)
+            details = self._details(np.unique(ids[ids >= 0]).tolist(), owner_id)
+
+        results = []
+        for row_distances, row_ids in zip(distances, ids):
+            results.append([
+                {
+                    'text': details[chunk_id]['text'],
+                    'metadata': details[chunk_id]['metadata'],
+                    'score': float(distance)
+                }
+                for distance, chunk_id in zip(row_distances, row_ids)
+                if chunk_id >= 0 and chunk_id in details
+            ])
+        return results
+
+    def _chunk_ids(self, hashes: List[str]) -> Dict[str, int]:
+        """Map content hashes to stored chunk IDs"""
+        found = {}
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT content_hash, id FROM chunks WHERE content_hash IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def _details(self, chunk_ids: List[int], owner_id: Optional[str]) -> Dict[int, Dict[str, Any]]:
+        """Text and owner-specific metadata for chunk IDs"""
+        details = {}
+        for start in range(0, len(chunk_ids), 500):
+            batch = chunk_ids[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            owner_clause = "AND l.owner_id = ?" if owner_id is not None else ""
+            params = batch + ([owner_id] if owner_id is not None else [])
+            for chunk_id, text, metadata in self._conn.execute(
+                f"SELECT c.id, c.text, l.metadata FROM chunks c JOIN links l ON l.chunk_id = c.id "
+                f"WHERE c.id IN ({placeholders}) {owner_clause}", params
+            ):
+                details.setdefault(chunk_id, {'text': text, 'metadata': json.loads(metadata)})
+        return details
+
+def get_index_manager(embeddings: Any) -> IndexManager:
+    """
+    Return the process-wide index manager for an embedding model
+
+    Args:
+        embeddings: Embedding backend; its model attribute selects the on-disk index
+
+    Returns:
+        IndexManager: Shared manager, created and loaded on first use
+    """
+    model = getattr(embeddings, 'model', type(embeddings).__name__)
+    with _managers_lock:
+        if model not in _managers:
+            directory = cache_path(os.path.join("faiss", re.sub(r"[^A-Za-z0-9_.-]", "_", model)))
+            _managers[model] = IndexManager(directory, embeddings)
+        return _managers[model]
@@ -0,0 +1,631 @@
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.cache_utils import cache_path
+from utils.logging_utils import default_logger as logger
+from utils.skill_taxonomy import SkillTaxonomy, get_taxonomy
+from utils.text_utils import tokenize
+
+POSTING_CACHE_SIZE = int(os.getenv("POSTING_CACHE_SIZE", "4096"))
+# Share of tombstoned documents above which posting lists are rewritten without them
+COMPACT_RATIO = 0.25
+# A term's newest segments are merged once this many of them are of the same size tier
+SEGMENT_MERGE_FACTOR = 8
+
+SKILL_PREFIX = "skill:"
+_QUERY_TOKEN_RE = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """LEB128-encode non-negative integers, 7 bits per byte with a continuation bit"""
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+def decode_varints(data: bytes) -> np.ndarray:
+    """Decode LEB128 integers in one vectorised pass"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if raw.size == 0:
+        return np.empty(0, dtype=np.int64)
+    ends = np.flatnonzero(raw < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    group = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shifts = 7 * (np.arange(len(raw)) - starts[group])
+    values = np.bincount(group, weights=(raw & 0x7F) * np.exp2(shifts), minlength=len(ends))
+    return values.astype(np.int64)
+
+def _first_varint(data: bytes) -> int:
+    """First LEB128 integer of an encoded sequence"""
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return value
+
+def _tier(df: int) -> int:
+    """Size tier of a segment: floor(log base SEGMENT_MERGE_FACTOR of its document count)"""
+    tier = 0
+    while df >= SEGMENT_MERGE_FACTOR:
+        df //= SEGMENT_MERGE_FACTOR
+        tier += 1
+    return tier
+
+def _intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersection of two sorted unique ID arrays, probing the larger with the smaller"""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return a
+    positions = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[positions] == a]
+
+def _difference(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Elements of sorted a that are not in sorted b"""
+    if len(a) == 0 or len(b) == 0:
+        return a
+    positions = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[positions] != a]
+
+class InvertedIndex:
+    """Persistent inverted index over candidate resumes.
+
+    Each term (word token, or 'skill:<name>' for a normalised skill) maps to a
+    posting list of (document ID, term frequency) pairs stored as
+    delta-encoded varints in segment rows. Document IDs only grow, so each
+    add writes its pairs as a new segment at the end of the list instead of
+    rewriting it. Once SEGMENT_MERGE_FACTOR trailing segments are of the same
+    size tier they are merged into one, so every pair is rewritten about
+    log(n) times and a list stays a handful of rows. Replaced or removed
+    resumes are tombstoned, then dropped from the lists by compact(), which
+    also merges each list into a single segment. Decoded lists are kept in
+    an LRU cache so repeated queries stay in memory.
+
+    Several processes may share the database: every read and write runs in a
+    transaction that first reloads the in-memory document state and drops
+    cached lists if another connection has committed since.
+    """
+
+    def __init__(self, path: str, taxonomy: Optional[SkillTaxonomy] = None,
+                 cache_size: int = POSTING_CACHE_SIZE, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            path: SQLite database file
+            taxonomy: Skill taxonomy used to index and query normalised skills
+            cache_size: Number of decoded posting lists kept in memory
+            k1: BM25 term frequency saturation
+            b: BM25 length normalisation strength
+        """
+        self.path = path
+        self.taxonomy = taxonomy or get_taxonomy()
+        self.cache_size = cache_size
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._data_version: Optional[int] = None
+        self._cache: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                metadata TEXT NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_documents_key ON documents(key, deleted);
+        """)
+        self._create_postings()
+        self._conn.commit()
+        self._sync()
+
+    def _create_postings(self) -> None:
+        """Create the segmented postings table, moving single-row lists of older indexes into it"""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(postings)")]
+        if columns and 'segment' not in columns:
+            self._conn.execute("ALTER TABLE postings RENAME TO postings_unsegmented")
+        # A segment is keyed by its first document ID, which is also the first gap of its data
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                df INTEGER NOT NULL,
+                last_doc INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (term, segment)
+            )
+        """)
+        if columns and 'segment' not in columns:
+            rows = self._conn.execute("SELECT term, df, last_doc, data FROM postings_unsegmented").fetchall()
+            self._conn.executemany(
+                "INSERT INTO postings (term, segment, df, last_doc, data) VALUES (?, ?, ?, ?, ?)",
+                [(term, _first_varint(data), df, last_doc, data) for term, df, last_doc, data in rows]
+            )
+            self._conn.execute("DROP TABLE postings_unsegmented")
+            logger.info(f"Converted candidate index postings to segments: {self.path}")
+
+    @contextmanager
+    def _reading(self) -> Iterator[None]:
+        """Read from one database snapshot with the in-memory state synced to it"""
+        with self._lock:
+            if self._conn.in_transaction:
+                yield
+                return
+            self._conn.execute("BEGIN")
+            try:
+                self._sync()
+                yield
+            finally:
+                self._conn.commit()
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Hold the database write lock with the in-memory state synced, committing on success"""
+        with self._lock:
+            if self._conn.in_transaction:
+                yield
+                return
+            # IMMEDIATE takes the write lock up front, so posting lists are not read stale and rewritten
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                yield
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                # In-memory changes made before the failure are discarded on the next sync
+                self._data_version = None
+                raise
+
+    def _sync(self) -> None:
+        """Reload document state and drop cached posting lists if another connection has committed"""
+        # Start the read snapshot first so the version matches what later statements see
+        self._conn.execute("SELECT 1 FROM documents LIMIT 1").fetchall()
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        if self._data_version is not None:
+            logger.debug(f"Candidate index changed by another connection, reloading: {self.path}")
+        self._load_documents()
+        self._cache.clear()
+        self._data_version = version
+
+    def _load_documents(self) -> None:
+        """Read live document lengths and tombstones into memory"""
+        rows = self._conn.execute("SELECT id, length, deleted FROM documents").fetchall()
+        max_id = max((row[0] for row in rows), default=0)
+        self._lengths = np.zeros(max_id + 1, dtype=np.float64)
+        deleted = []
+        for doc_id, length, is_deleted in rows:
+            if is_deleted:
+                deleted.append(doc_id)
+            else:
+                self._lengths[doc_id] = length
+        self._deleted = np.array(sorted(deleted), dtype=np.int64)
+        self._live = np.array(sorted(row[0] for row in rows if not row[2]), dtype=np.int64)
+
+    @property
+    def size(self) -> int:
+        """Number of live documents"""
+        with self._reading():
+            return len(self._live)
+
+    def analyze(self, text: str) -> Counter:
+        """Index terms of a text: word tokens plus normalised skills"""
+        terms = Counter(tokenize(text, drop_stopwords=False))
+        for skill, count in self.taxonomy.extract(text).items():
+            terms[SKILL_PREFIX + skill.lower()] += count
+        return terms
+
+    def add_document(self, key: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """Index one resume; see add_documents"""
+        return self.add_documents([(key, text, metadata or {})])[0]
+
+    def add_documents(self, documents: Iterable[Tuple[str, str, Dict[str, Any]]]) -> List[int]:
+        """
+        Index resumes, replacing earlier versions stored under the same keys
+
+        Args:
+            documents: (key, text, metadata) tuples; the key identifies the candidate (e.g. the PDF path)
+
+        Returns:
+            List[int]: Document IDs assigned, in input order (a key repeated within the call keeps its last text)
+        """
+        latest = {key: (text, metadata) for key, text, metadata in documents}
+        analyzed = [(key, self.analyze(text), metadata or {}) for key, (text, metadata) in latest.items()]
+        with self._writing():
+            keys = [key for key, _, _ in analyzed]
+            self._tombstone(keys)
+            doc_ids = []
+            appends: Dict[str, List[Tuple[int, int]]] = {}
+            for key, terms, metadata in analyzed:
+                cursor = self._conn.execute(
+                    "INSERT INTO documents (key, length, metadata) VALUES (?, ?, ?)",
+                    (key, sum(terms.values()), json.dumps(metadata))
+                )
+                doc_id = cursor.lastrowid
+                doc_ids.append(doc_id)
+                for term, tf in terms.items():
+                    appends.setdefault(term, []).append((doc_id, tf))
+            self._append_postings(appends)
+
+            if doc_ids and doc_ids[-1] >= len(self._lengths):
+                self._lengths = np.concatenate([self._lengths, np.zeros(doc_ids[-1] + 1 - len(self._lengths))])
+            for doc_id, (_, terms, _) in zip(doc_ids, analyzed):
+                self._lengths[doc_id] = sum(terms.values())
+            self._live = np.concatenate([self._live, np.array(doc_ids, dtype=np.int64)])
+            if len(self._deleted) > COMPACT_RATIO * max(1, len(self._live)):
+                self.compact()
+        logger.debug(f"Indexed {len(doc_ids)} documents ({len(appends)} terms touched)")
+        return doc_ids
+
+    def _append_postings(self, appends: Dict[str, List[Tuple[int, int]]]) -> None:
+        """Write each term's new (doc ID, tf) pairs as a segment keyed by its first ID, then merge full tiers"""
+        rows = []
+        for term, pairs in appends.items():
+            values, last_doc = [], 0
+            for doc_id, tf in pairs:
+                values.extend((doc_id - last_doc, tf))
+                last_doc = doc_id
+            rows.append((term, pairs[0][0], len(pairs), last_doc, sqlite3.Binary(encode_varints(values))))
+            self._cache.pop(term, None)
+        self._conn.executemany(
+            "INSERT INTO postings (term, segment, df, last_doc, data) VALUES (?, ?, ?, ?, ?)", rows
+        )
+
+        # A list's tail can only be full if SEGMENT_MERGE_FACTOR of its segments share the new segment's tier
+        by_tier: Dict[int, List[str]] = {}
+        for term, pairs in appends.items():
+            by_tier.setdefault(_tier(len(pairs)), []).append(term)
+        crowded = []
+        for tier, terms in by_tier.items():
+            low, high = SEGMENT_MERGE_FACTOR ** tier, SEGMENT_MERGE_FACTOR ** (tier + 1)
+            for start in range(0, len(terms), 500):
+                batch = terms[start:start + 500]
+                crowded.extend(row[0] for row in self._conn.execute(
+                    f"SELECT term FROM postings WHERE term IN ({','.join('?' * len(batch))}) "
+                    f"GROUP BY term HAVING SUM(df >= ? AND df < ?) >= ?",
+                    batch + [low, high, SEGMENT_MERGE_FACTOR]
+                ))
+        for term in crowded:
+            self._merge_tail(term, self._conn.execute(
+                "SELECT segment, df FROM postings WHERE term = ? ORDER BY segment", (term,)
+            ).fetchall())
+
+    def _merge_tail(self, term: str, segments: List[Tuple[int, int]]) -> None:
+        """Merge a term's trailing segments while SEGMENT_MERGE_FACTOR of them share a size tier"""
+        while True:
+            tier = _tier(segments[-1][1])
+            count = 0
+            while count < len(segments) and _tier(segments[-1 - count][1]) == tier:
+                count += 1
+            if count < SEGMENT_MERGE_FACTOR:
+                return
+            first = segments[-count][0]
+            rows = self._conn.execute(
+                "SELECT segment, df, last_doc, data FROM postings WHERE term = ? AND segment >= ? ORDER BY segment",
+                (term, first)
+            ).fetchall()
+            # Segments are gap-encoded from 0, so joining them only re-encodes each one's first gap
+            parts = [bytes(rows[0][3])]
+            for (_, _, previous_last, _), (segment, _, _, data) in zip(rows, rows[1:]):
+                parts.append(encode_varints([segment - previous_last]))
+                parts.append(bytes(data)[len(encode_varints([segment])):])
+            df = sum(row[1] for row in rows)
+            self._conn.execute("DELETE FROM postings WHERE term = ? AND segment >= ?", (term, first))
+            self._conn.execute(
+                "INSERT INTO postings (term, segment, df, last_doc, data) VALUES (?, ?, ?, ?, ?)",
+                (term, first, df, rows[-1][2], sqlite3.Binary(b''.join(parts)))
+            )
+            segments = segments[:-count] + [(first, df)]
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove a candidate from the index
+
+        Args:
+            key: Key the resume was indexed under
+
+        Returns:
+            bool: Whether a document was removed
+        """
+        with self._writing():
+            return self._tombstone([key]) > 0
+
+    def _tombstone(self, keys: List[str]) -> int:
+        """Mark the live documents stored under keys as deleted"""
+        ids = []
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            ids.extend(row[0] for row in self._conn.execute(
+                f"SELECT id FROM documents WHERE deleted = 0 AND key IN ({','.join('?' * len(batch))})", batch
+            ))
+        if ids:
+            self._conn.executemany("UPDATE documents SET deleted = 1 WHERE id = ?", [(doc_id,) for doc_id in ids])
+            ids = np.array(sorted(ids), dtype=np.int64)
+            self._deleted = np.union1d(self._deleted, ids)
+            self._live = _difference(self._live, ids)
+            self._lengths[ids] = 0
+            self._cache.clear()
+        return len(ids)
+
+    def compact(self) -> None:
+        """Merge each posting list into one segment without tombstoned documents and drop their rows"""
+        with self._writing():
+            deleted = self._deleted
+            lists: Dict[str, List[bytes]] = {}
+            for term, data in self._conn.execute("SELECT term, data FROM postings ORDER BY term, segment"):
+                lists.setdefault(term, []).append(data)
+            removed, merged = [], []
+            for term, blobs in lists.items():
+                ids, tfs = self._decode_segments(blobs)
+                keep = ~np.isin(ids, deleted, assume_unique=True) if len(deleted) else None
+                if keep is not None and not keep.all():
+                    ids, tfs = ids[keep], tfs[keep]
+                elif len(blobs) == 1:
+                    continue
+                if len(ids) == 0:
+                    removed.append((term,))
+                else:
+                    merged.append((term, int(ids[0]), len(ids), int(ids[-1]), self._encode(ids, tfs)))
+            self._conn.executemany("DELETE FROM postings WHERE term = ?", removed + [(row[0],) for row in merged])
+            self._conn.executemany(
+                "INSERT INTO postings (term, segment, df, last_doc, data) VALUES (?, ?, ?, ?, ?)", merged
+            )
+            # Only the tombstones whose postings were rewritten above
+            self._conn.executemany("DELETE FROM documents WHERE id = ?", [(int(doc_id),) for doc_id in deleted])
+            logger.info(
+                f"Compacted candidate index: dropped {len(deleted)} documents, "
+                f"rewrote {len(merged) + len(removed)} of {len(lists)} terms"
+            )
+            self._deleted = np.empty(0, dtype=np.int64)
+            self._cache.clear()
+
+    @staticmethod
+    def _encode(ids: np.ndarray, tfs: np.ndarray) -> sqlite3.Binary:
+        """Varint-encode sorted IDs as gaps (the first from 0) interleaved with their term frequencies"""
+        values = np.empty(2 * len(ids), dtype=np.int64)
+        values[0::2], values[1::2] = np.diff(ids, prepend=0), tfs
+        return sqlite3.Binary(encode_varints(values.tolist()))
+
+    @staticmethod
+    def _decode_segments(blobs: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+        """Concatenate decoded segments, given in segment order"""
+        ids, tfs = [], []
+        for data in blobs:
+            values = decode_varints(data)
+            ids.append(np.cumsum(values[0::2]))
+            tfs.append(values[1::2])
+        if not ids:
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        return np.concatenate(ids), np.concatenate(tfs)
+
+    def _read_segments(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Decoded pairs of all of a term's segments"""
+        return self._decode_segments([row[0] for row in self._conn.execute(
+            "SELECT data FROM postings WHERE term = ? ORDER BY segment", (term,)
+        )])
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decoded posting list of a term, excluding tombstoned documents
+
+        Args:
+            term: Index term (lowercase token or 'skill:<name>')
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Sorted document IDs and their term frequencies
+        """
+        with self._reading():
+            cached = self._cache.get(term)
+            if cached is not None:
+                self._cache.move_to_end(term)
+                return cached
+            ids, tfs = self._read_segments(term)
+            if len(self._deleted) and len(ids):
+                live = ~np.isin(ids, self._deleted, assume_unique=True)
+                ids, tfs = ids[live], tfs[live]
+            self._cache[term] = (ids, tfs)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return ids, tfs
+
+    def resolve(self, word: str) -> List[str]:
+        """
+        Index terms a query word or phrase stands for
+
+        Skills resolve through the taxonomy (so 'k8s' finds 'Kubernetes'); other
+        words are tokenized like the indexed text and must all be present.
+        """
+        skill = self.taxonomy.canonical(word)
+        if skill:
+            return [SKILL_PREFIX + skill.lower()]
+        return tokenize(word, drop_stopwords=False)
+
+    def _term_ids(self, word: str) -> np.ndarray:
+        terms = self.resolve(word)
+        if not terms:
+            return np.empty(0, dtype=np.int64)
+        ids = self.postings(terms[0])[0]
+        for term in terms[1:]:
+            ids = _intersect(ids, self.postings(term)[0])
+        return ids
+
+    def _parse(self, query: str):
+        """
+        Parse a boolean query into a nested (op, ...) tuple
+
+        Grammar: OR binds loosest, then AND (also implied between adjacent
+        terms), then NOT; parentheses group and double quotes make phrases.
+        """
+        tokens = _QUERY_TOKEN_RE.findall(query)
+        position = 0
+
+        def peek():
+            return tokens[position] if position < len(tokens) else None
+
+        def take():
+            nonlocal position
+            position += 1
+            return tokens[position - 1]
+
+        def parse_or():
+            node = parse_and()
+            while peek() is not None and peek().upper() == 'OR':
+                take()
+                node = ('or', node, parse_and())
+            return node
+
+        def parse_and():
+            node = parse_not()
+            while peek() is not None and peek() != ')' and peek().upper() != 'OR':
+                if peek().upper() == 'AND':
+                    take()
+                node = ('and', node, parse_not())
+            return node
+
+        def parse_not():
+            token = peek()
+            if token is None:
+                raise ValueError(f"Unexpected end of query: {query!r}")
+            if token.upper() == 'NOT':
+                take()
+                return ('not', parse_not())
+            if token == '(':
+                take()
+                node = parse_or()
+                if peek() != ')':
+                    raise ValueError(f"Unbalanced parentheses in query: {query!r}")
+                take()
+                return node
+            if token == ')' or token.upper() in ('AND', 'OR'):
+                raise ValueError(f"Unexpected {token!r} in query: {query!r}")
+            take()
+            return ('term', token.strip('"'))
+
+        node = parse_or()
+        if position != len(tokens):
+            raise ValueError(f"Unexpected {tokens[position]!r} in query: {query!r}")
+        return node
+
+    def _evaluate(self, node) -> np.ndarray:
+        op = node[0]
+        if op == 'term':
+            return self._term_ids(node[1])
+        if op == 'not':
+            return _difference(self._live, self._evaluate(node[1]))
+        if op == 'and':
+            left, right = node[1], node[2]
+            # 'A AND NOT B' filters A instead of materialising every document without B
+            if right[0] == 'not':
+                return _difference(self._evaluate(left), self._evaluate(right[1]))
+            if left[0] == 'not':
+                return _difference(self._evaluate(right), self._evaluate(left[1]))
+            return _intersect(self._evaluate(left), self._evaluate(right))
+        return np.union1d(self._evaluate(node[1]), self._evaluate(node[2]))
+
+    def _positive_words(self, node) -> List[str]:
+        """Words that count towards ranking (everything not under a NOT)"""
+        if node[0] == 'term':
+            return [node[1]]
+        if node[0] == 'not':
+            return []
+        return self._positive_words(node[1]) + self._positive_words(node[2])
+
+    def match(self, query: str) -> np.ndarray:
+        """
+        Document IDs satisfying a boolean query, e.g. 'Python AND Spark AND NOT intern'
+
+        Args:
+            query: Terms combined with AND, OR, NOT and parentheses
+
+        Returns:
+            np.ndarray: Sorted matching document IDs
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        node = self._parse(query)
+        with self._reading():
+            return self._evaluate(node)
+
+    def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Candidates matching a boolean query, ranked by BM25 over its positive terms
+
+        Args:
+            query: Terms combined with AND, OR, NOT and parentheses
+            top_k: Number of results
+
+        Returns:
+            List[Dict[str, Any]]: {'id', 'key', 'score', 'metadata'} dicts, best first
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        node = self._parse(query)
+        with self._reading():
+            candidates = self._evaluate(node)
+            if len(candidates) == 0:
+                return []
+            n_docs = max(1, len(self._live))
+            avg_length = self._lengths[self._live].mean() if len(self._live) else 1.0
+            norm = self.k1 * (1 - self.b + self.b * self._lengths[candidates] / max(avg_length, 1e-9))
+            scores = np.zeros(len(candidates))
+            for term in {term for word in self._positive_words(node) for term in self.resolve(word)}:
+                ids, tfs = self.postings(term)
+                if len(ids) == 0:
+                    continue
+                idf = math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+                positions = np.minimum(np.searchsorted(ids, candidates), len(ids) - 1)
+                tf = np.where(ids[positions] == candidates, tfs[positions], 0)
+                scores += idf * tf * (self.k1 + 1) / (tf + norm)
+            top = np.argsort(-scores, kind='stable')[:top_k]
+            chosen = candidates[top]
+            details = self._documents(chosen.tolist())
+        return [
+            {'id': int(doc_id), 'key': details[int(doc_id)][0], 'score': float(score),
+             'metadata': details[int(doc_id)][1]}
+            for doc_id, score in zip(chosen, scores[top])
+        ]
+
+    def _documents(self, doc_ids: List[int]) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        rows = self._conn.execute(
+            f"SELECT id, key, metadata FROM documents WHERE id IN ({','.join('?' * len(doc_ids))})", doc_ids
+        ).fetchall() if doc_ids else []
+        return {doc_id: (key, json.loads(metadata)) for doc_id, key, metadata in rows}
+
+    def stats(self) -> Dict[str, int]:
+        """Live and tombstoned document counts, term and segment counts and total posting bytes"""
+        with self._reading():
+            terms, segments, total = self._conn.execute(
+                "SELECT COUNT(DISTINCT term), COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM postings"
+            ).fetchone()
+        return {'documents': len(self._live), 'deleted': len(self._deleted), 'terms': terms,
+                'segments': segments, 'posting_bytes': total, 'cached_lists': len(self._cache)}
+
+_candidate_index = None
+_candidate_index_lock = threading.Lock()
+
+def get_candidate_index() -> InvertedIndex:
+    """Return the process-wide candidate index stored in the cache directory"""
+    global _candidate_index
+    with _candidate_index_lock:
+        if _candidate_index is None:
+            _candidate_index = InvertedIndex(cache_path("candidates.sqlite"))
+        return _candidate_index
@@ -0,0 +1,208 @@
+"""
+In-process background job queue with status polling and bounded admission
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.hooks import add_error_reporter, remove_error_reporter
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Queued plus running jobs accepted before new submissions are rejected
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "16"))
+# Finished jobs are kept this long for polling clients, then dropped
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+class QueueFullError(RuntimeError):
+    """Raised when a submission would exceed the queue's pending-job limit"""
+
+@dataclass
+class Job:
+    """State of one submitted job; status() returns copies, so polling never sees a half-updated job"""
+    id: str
+    kind: str
+    key: Optional[str] = None
+    status: str = QUEUED
+    stage: str = ""
+    # Output published while the job runs, e.g. streamed model text
+    partial: str = ""
+    result: Any = None
+    error: Optional[str] = None
+    # Messages passed to report_error while the job ran, for the client to show
+    errors: List[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+_current = threading.local()
+
+def report_progress(stage: str) -> None:
+    """Set the stage shown to pollers of the job running in this thread; a no-op outside jobs"""
+    job = getattr(_current, 'job', None)
+    if job is not None:
+        job.stage = stage
+
+def report_output(chunk: str) -> None:
+    """Append to the partial output of the job running in this thread; a no-op outside jobs"""
+    job = getattr(_current, 'job', None)
+    if job is not None:
+        job.partial += chunk
+
+class JobQueue:
+    """
+    Worker pool running submitted functions as jobs with IDs, status and stored results
+
+    Submissions with the same key while a job for it is pending or its
+    result is still stored return the existing job, so repeated clicks or
+    reruns do not start the same work again.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, max_pending: int = JOB_MAX_PENDING,
+                 result_ttl: float = JOB_RESULT_TTL, name: str = "jobs"):
+        """
+        Args:
+            max_workers: Jobs running at once
+            max_pending: Queued plus running jobs accepted before QueueFullError
+            result_ttl: Seconds finished jobs stay available
+            name: Metrics prefix and worker thread name
+        """
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._jobs: Dict[str, Job] = {}
+        self._keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def pending(self) -> int:
+        """Number of queued and running jobs"""
+        with self._lock:
+            return sum(not job.finished for job in self._jobs.values())
+
+    def submit(self, fn: Callable[..., Any], *args: Any, kind: str = "job", key: Optional[str] = None,
+               **kwargs: Any) -> str:
+        """
+        Queue fn(*args, **kwargs) to run on a worker
+
+        Args:
+            fn: Function to run; it may call report_progress to publish its stage
+            kind: Label for logs and metrics
+            key: Idempotency key; a pending or stored job with the same key is reused
+
+        Returns:
+            str: Job ID
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+        with self._lock:
+            self._expire()
+            if key is not None and key in self._keys:
+                default_metrics.increment(f"{self.name}.deduplicated")
+                return self._keys[key]
+            pending = sum(not job.finished for job in self._jobs.values())
+            if pending >= self.max_pending:
+                default_metrics.increment(f"{self.name}.rejected")
+                raise QueueFullError(f"{pending} jobs are already pending; try again shortly")
+            job = Job(id=uuid.uuid4().hex, kind=kind, key=key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._keys[key] = job.id
+        default_metrics.increment(f"{self.name}.submitted")
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        logger.info(f"Queued {kind} job {job.id} ({pending + 1} pending)")
+        return job.id
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> None:
+        job.started_at = time.time()
+        job.status = RUNNING
+        default_metrics.observe(f"{self.name}.wait", job.started_at - job.created_at)
+        _current.job = job
+        # This thread has no UI; errors reported here are kept for whoever polls the job
+        add_error_reporter(job.errors.append, current_thread=True)
+        try:
+            result = fn(*args, **kwargs)
+            with self._lock:
+                job.result, job.status, job.finished_at = result, DONE, time.time()
+        except Exception as e:
+            logger.error(f"{job.kind} job {job.id} failed: {str(e)}")
+            with self._lock:
+                job.error, job.status, job.finished_at = str(e), FAILED, time.time()
+                # A failed job should not block a retry of the same work
+                if job.key is not None and self._keys.get(job.key) == job.id:
+                    del self._keys[job.key]
+        finally:
+            remove_error_reporter(job.errors.append)
+            _current.job = None
+            default_metrics.observe(f"{self.name}.run", time.time() - job.started_at)
+
+    def status(self, job_id: str) -> Optional[Job]:
+        """Snapshot of a job, or None when the ID is unknown or its result has expired"""
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+            return replace(job, errors=list(job.errors)) if job is not None else None
+
+    def result(self, job_id: str, timeout: Optional[float] = None, poll_interval: float = 0.05) -> Any:
+        """
+        Wait for a job and return its result
+
+        Args:
+            job_id: Job ID
+            timeout: Seconds to wait, forever when None
+            poll_interval: Seconds between status checks
+
+        Returns:
+            Any: The job function's return value
+
+        Raises:
+            KeyError: If the job is unknown or expired
+            TimeoutError: If the job does not finish in time
+            RuntimeError: If the job failed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.status == DONE:
+                return job.result
+            if job.status == FAILED:
+                raise RuntimeError(job.error)
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} did not finish within {timeout}s")
+            time.sleep(poll_interval)
+
+    def _expire(self) -> None:
+        """Drop finished jobs older than result_ttl; caller holds the lock"""
+        cutoff = time.time() - self.result_ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]:
+            job = self._jobs.pop(job_id)
+            if job.key is not None and self._keys.get(job.key) == job_id:
+                del self._keys[job.key]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue shared by every UI session"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
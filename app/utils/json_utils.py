@@ -0,0 +1,414 @@
+"""
+Tolerant extraction, repair and schema validation of JSON in LLM responses
+"""
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+
+# Schema value kinds besides str, [spec] and nested dicts
+PERCENT = 'percent'
+SCORE = 'score'
+
+ATS_SCHEMA = {
+    'JD Match': PERCENT,
+    'MissingKeywords': [str],
+    'Profile Summary': str,
+    'ProjectMatch': PERCENT,
+    'WorkExpMatch': PERCENT,
+    'EduMatch': PERCENT,
+}
+
+GITHUB_ANALYSIS_SCHEMA = {
+    **ATS_SCHEMA,
+    'GitHub Analysis': {
+        'RecommendedProjects': [{
+            'ProjectName': str,
+            'Relevance': PERCENT,
+            'RecommendedDescription': str,
+            'KeySkills': [str],
+            'ImpactScore': SCORE,
+        }],
+        'OverallGitHubScore': SCORE,
+        'Recommendations': str,
+    },
+}
+
+# Candidate objects tried before giving up on a response
+MAX_CANDIDATES = 5
+
+_QUOTES = {'"': '"', "'": "'", '“': '”', '”': '”'}
+_STRUCTURAL = set('{}[],:"\'“”')
+_LITERALS = {'true': 'true', 'false': 'false', 'null': 'null', 'True': 'true', 'False': 'false',
+             'None': 'null', 'NaN': 'null', 'undefined': 'null'}
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_PERCENT_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*%?\s*$")
+_SCORE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(?:/\s*10)?\s*$")
+
+class JSONStreamExtractor:
+    """
+    Incremental scanner that finds the first complete top-level JSON object in streamed text
+
+    Prose before the object is skipped and braces inside strings (double,
+    single or curly quoted) are ignored, so a stream can be stopped as soon
+    as the object closes.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._depth = 0
+        self._closing: Optional[str] = None
+        self._escape = False
+        self.result: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    @property
+    def partial(self) -> str:
+        """Text of the object seen so far, e.g. of a truncated response"""
+        return self.result if self.done else "".join(self._parts)
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Scan the next chunk of text
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Optional[str]: The complete object text once it has closed, else None
+        """
+        if self.done:
+            return self.result
+        for ch in chunk:
+            if not self._depth:
+                if ch != '{':
+                    continue
+                self._parts = []
+            self._parts.append(ch)
+            if self._closing is not None:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == self._closing or (self._closing == '”' and ch == '"'):
+                    self._closing = None
+            elif ch in _QUOTES:
+                self._closing = _QUOTES[ch]
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if not self._depth:
+                    self.result = "".join(self._parts)
+                    return self.result
+        return None
+
+def repair_json(text: str) -> str:
+    """
+    Fix common LLM mistakes in JSON-like text
+
+    Outside strings: comments are dropped, single and curly quotes become
+    double quotes, trailing commas are removed, missing commas between values
+    are inserted, Python literals are mapped to JSON ones, bare keys are
+    quoted and bare values that are not numbers (e.g. 85%, 8/10) become
+    strings. Raw newlines inside strings are escaped. A truncated object has
+    its open string and brackets closed.
+
+    Args:
+        text: JSON-like text, usually a single object
+
+    Returns:
+        str: Text that json.loads is more likely to accept
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    i, n = 0, len(text)
+
+    def last() -> str:
+        for piece in reversed(out):
+            stripped = piece.rstrip()
+            if stripped:
+                return stripped[-1]
+        return ''
+
+    def open_value() -> None:
+        # A value right after another value means the model forgot a comma
+        if last() in ('"', '}', ']') or last().isalnum():
+            out.append(',')
+
+    while i < n:
+        ch = text[i]
+        if ch in _QUOTES:
+            open_value()
+            closing, j, body = _QUOTES[ch], i + 1, []
+            while j < n:
+                c = text[j]
+                if c == '\\' and j + 1 < n:
+                    nxt = text[j + 1]
+                    body.append(nxt if nxt == "'" else c + nxt)
+                    j += 2
+                    continue
+                if c == closing or (closing == '”' and c == '"'):
+                    break
+                if c == '"':
+                    body.append('\\"')
+                elif c == '\n':
+                    body.append('\\n')
+                elif c in '\r\t':
+                    body.append('\\r' if c == '\r' else '\\t')
+                else:
+                    body.append(c)
+                j += 1
+            out.append('"' + "".join(body) + '"')
+            i = j + 1
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        elif ch in '{[':
+            open_value()
+            stack.append('}' if ch == '{' else ']')
+            out.append(ch)
+            i += 1
+        elif ch in '}]':
+            _strip_trailing_comma(out)
+            if stack:
+                out.append(stack.pop())
+            i += 1
+            if not stack:
+                break
+        elif ch == ',':
+            if last() not in ('', ',', '{', '[', ':'):
+                out.append(',')
+            i += 1
+        elif ch == ':':
+            out.append(':')
+            i += 1
+        elif ch.isspace():
+            out.append(ch)
+            i += 1
+        else:
+            j = i
+            while j < n and text[j] not in _STRUCTURAL and text[j] != '\n' and not text.startswith('//', j):
+                j += 1
+            token = text[i:j].strip()
+            i = j
+            if not token:
+                continue
+            following = text[j:].lstrip()[:1]
+            open_value()
+            if following == ':':
+                out.append(json.dumps(token))
+            elif token in _LITERALS:
+                out.append(_LITERALS[token])
+            elif _NUMBER_RE.fullmatch(token):
+                out.append(token)
+            else:
+                out.append(json.dumps(token))
+
+    # Close whatever a truncated response left open
+    if stack:
+        _strip_trailing_comma(out)
+        if last() == ':':
+            out.append('null')
+        out.extend(reversed(stack))
+    return "".join(out)
+
+def _strip_trailing_comma(out: List[str]) -> None:
+    while out and not out[-1].strip():
+        out.pop()
+    if out and out[-1] == ',':
+        out.pop()
+
+def _candidates(text: str) -> List[str]:
+    """Object texts starting at successive '{' positions, up to MAX_CANDIDATES"""
+    candidates, start = [], text.find('{')
+    while start >= 0 and len(candidates) < MAX_CANDIDATES:
+        extractor = JSONStreamExtractor()
+        extractor.feed(text[start:])
+        candidates.append(extractor.partial)
+        start = text.find('{', start + 1)
+    return candidates
+
+def extract_json(text: str) -> Tuple[Any, bool]:
+    """
+    Parse the first JSON object in an LLM response
+
+    Args:
+        text: Raw response, possibly with prose, code fences or a truncated tail
+
+    Returns:
+        Tuple[Any, bool]: Parsed object and whether syntax repairs were needed
+
+    Raises:
+        ValueError: If no object can be parsed even after repairs
+    """
+    stripped = text.strip()
+    try:
+        return json.loads(stripped), False
+    except ValueError:
+        pass
+    for candidate in _candidates(stripped):
+        try:
+            return json.loads(candidate), False
+        except ValueError:
+            pass
+        try:
+            value = json.loads(repair_json(candidate))
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value, True
+    raise ValueError("No JSON object found in the response")
+
+def _normalize_key(key: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", str(key).lower())
+
+def validate(value: Any, spec: Any, path: str = "") -> Tuple[Any, List[str]]:
+    """
+    Coerce a value to a schema spec and collect the paths that do not fit
+
+    Specs are PERCENT ('85%'), SCORE ('8/10'), str, [spec] for lists and dicts
+    of field name to spec. Numbers and bare strings are coerced to percentages
+    and scores, comma-separated strings to string lists and keys are matched
+    ignoring case, spaces and underscores.
+
+    Args:
+        value: Parsed JSON value
+        spec: Schema spec
+        path: Path of value, used in error messages
+
+    Returns:
+        Tuple[Any, List[str]]: Coerced value and error messages ('field: problem')
+    """
+    label = path or "response"
+    if isinstance(spec, dict):
+        if not isinstance(value, dict):
+            return value, [f"{label}: expected an object"]
+        by_key = {_normalize_key(key): key for key in value}
+        result, errors = dict(value), []
+        for name, field_spec in spec.items():
+            key = name if name in value else by_key.get(_normalize_key(name))
+            field_path = f"{path}.{name}" if path else name
+            if key is None:
+                errors.append(f"{field_path}: missing")
+                continue
+            if key != name:
+                result[name] = result.pop(key)
+            result[name], field_errors = validate(result[name], field_spec, field_path)
+            errors.extend(field_errors)
+        return result, errors
+    if isinstance(spec, list):
+        if isinstance(value, str) and spec[0] is str:
+            value = [item.strip() for item in value.split(',') if item.strip()]
+        if not isinstance(value, list):
+            return value, [f"{label}: expected a list"]
+        result, errors = [], []
+        for index, item in enumerate(value):
+            item, item_errors = validate(item, spec[0], f"{path}[{index}]")
+            result.append(item)
+            errors.extend(item_errors)
+        return result, errors
+    if spec is str:
+        if isinstance(value, str):
+            return value, []
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value), []
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return "\n".join(value), []
+        return value, [f"{label}: expected a string"]
+    if spec in (PERCENT, SCORE):
+        pattern, limit, suffix = (_PERCENT_RE, 100, "%") if spec == PERCENT else (_SCORE_RE, 10, "/10")
+        match = pattern.match(str(value)) if not isinstance(value, bool) else None
+        if not match or float(match.group(1)) > limit:
+            example = "'85%'" if spec == PERCENT else "'8/10'"
+            return value, [f"{label}: expected a {spec} like {example}"]
+        number = float(match.group(1))
+        return f"{number:g}{suffix}", []
+    raise ValueError(f"Unknown schema spec: {spec!r}")
+
+def describe(spec: Any) -> Any:
+    """Example value of a schema spec, for repair prompts"""
+    if isinstance(spec, dict):
+        return {name: describe(field_spec) for name, field_spec in spec.items()}
+    if isinstance(spec, list):
+        return [describe(spec[0])]
+    return {PERCENT: "X%", SCORE: "X/10", str: "text"}[spec]
+
+def parse_llm_json(text: str, schema: Dict[str, Any],
+                   repair: Optional[Callable[[str], str]] = None) -> Dict[str, Any]:
+    """
+    Extract, repair and validate the JSON object of an LLM response
+
+    When fields are missing or malformed and a repair function is given, the
+    model is asked once for just those top-level fields, which are merged into
+    the response. Counters in the default metrics registry: 'llm_json.responses',
+    'llm_json.syntax_repairs', 'llm_json.invalid', 'llm_json.field_repairs'
+    (fields requested again), 'llm_json.repair_calls' and 'llm_json.failures';
+    failures / responses is the failure rate.
+
+    Args:
+        text: Raw response text
+        schema: ATS_SCHEMA, GITHUB_ANALYSIS_SCHEMA or another dict spec
+        repair: Function sending a prompt to the model and returning its response
+
+    Returns:
+        Dict[str, Any]: Validated response with values coerced to the schema
+
+    Raises:
+        ValueError: If no object can be parsed or fields remain invalid
+    """
+    default_metrics.increment("llm_json.responses")
+    try:
+        data, repaired = extract_json(text)
+    except ValueError:
+        default_metrics.increment("llm_json.failures")
+        raise
+    if repaired:
+        default_metrics.increment("llm_json.syntax_repairs")
+
+    data, errors = validate(data, schema)
+    if errors:
+        default_metrics.increment("llm_json.invalid")
+        if repair is not None and isinstance(data, dict):
+            data, errors = _repair_fields(text, data, errors, schema, repair)
+    if errors:
+        default_metrics.increment("llm_json.failures")
+        raise ValueError(f"Invalid response fields: {'; '.join(errors)}")
+    return data
+
+def _repair_fields(text: str, data: Dict[str, Any], errors: List[str], schema: Dict[str, Any],
+                   repair: Callable[[str], str]) -> Tuple[Dict[str, Any], List[str]]:
+    """Ask the model again for the top-level fields with errors and merge its answer"""
+    from prompts.templates import json_repair_prompt
+
+    fields = list(dict.fromkeys(re.split(r"[.\[:]", error, maxsplit=1)[0] for error in errors))
+    fields = [name for name in fields if name in schema]
+    if not fields:
+        return data, errors
+    sub_schema = {name: schema[name] for name in fields}
+    default_metrics.increment("llm_json.field_repairs", len(fields))
+    default_metrics.increment("llm_json.repair_calls")
+    logger.info(f"Requesting repair of response fields: {', '.join(fields)}")
+    prompt = json_repair_prompt.format(
+        errors="\n".join(f"- {error}" for error in errors),
+        fields=json.dumps(describe(sub_schema), indent=4),
+        response=text[-4000:]
+    )
+    try:
+        patch, _ = extract_json(repair(prompt))
+    except Exception as e:
+        logger.warning(f"Field repair failed: {str(e)}")
+        return data, errors
+    patch, patch_errors = validate(patch, sub_schema)
+    if not isinstance(patch, dict):
+        return data, errors
+    merged = {**data, **{name: patch[name] for name in fields if name in patch}}
+    return validate(merged, schema)
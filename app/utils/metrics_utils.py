@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from utils.logging_utils import default_logger as logger
+
+class MetricsRegistry:
+    """Thread-safe in-process counters and latency observations"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._observations: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add value to a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one observation (e.g. a latency in seconds)"""
+        with self._lock:
+            stats = self._observations.setdefault(
+                name, {'count': 0, 'sum': 0.0, 'min': float('inf'), 'max': 0.0, 'last': 0.0}
+            )
+            stats['count'] += 1
+            stats['sum'] += value
+            stats['min'] = min(stats['min'], value)
+            stats['max'] = max(stats['max'], value)
+            stats['last'] = value
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the enclosed block under name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of every counter and observation summary, with averages"""
+        with self._lock:
+            observations = {
+                name: {**stats, 'avg': stats['sum'] / stats['count']}
+                for name, stats in self._observations.items()
+            }
+            return {'counters': dict(self._counters), 'observations': observations}
+
+    def reset(self) -> None:
+        """Clear every metric"""
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+
+def timed_stream(
+    chunks: Iterable[str],
+    name: str,
+    registry: Optional[MetricsRegistry] = None,
+    start: Optional[float] = None
+) -> Iterator[str]:
+    """
+    Pass text chunks through while recording time-to-first-token and total latency
+
+    Args:
+        chunks: Iterable of streamed text chunks
+        name: Metric prefix; '<name>.ttft' and '<name>.total' are observed in seconds
+        registry: Registry to record into, defaults to default_metrics
+        start: time.perf_counter() value the request was sent at, defaults to now
+
+    Yields:
+        str: The chunks, unchanged
+    """
+    registry = registry or default_metrics
+    start = start if start is not None else time.perf_counter()
+    first = None
+    try:
+        for chunk in chunks:
+            if first is None:
+                first = time.perf_counter() - start
+                registry.observe(f"{name}.ttft", first)
+            yield chunk
+    finally:
+        total = time.perf_counter() - start
+        registry.observe(f"{name}.total", total)
+        ttft = f"{first:.3f}s" if first is not None else "n/a"
+        logger.info(f"{name} stream finished: time to first token {ttft}, total {total:.3f}s")
+
+# Create default registry
+default_metrics = MetricsRegistry()
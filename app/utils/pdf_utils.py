@@ -1,24 +1,224 @@
+import atexit
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
 import PyPDF2 as pdf
-import streamlit as st
 
-@st.cache_data(ttl=3600)
-def extract_text_from_pdf(uploaded_file):
+from utils.cache_utils import SQLiteCache
+from utils.hooks import open_cache, report_error
+from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import default_metrics
+
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_MB", "256")) * 1024 * 1024
+# Documents with at least this many pages have their pages fanned out to worker processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "48"))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "16"))
+PDF_MAX_WORKERS = int(os.getenv("PDF_MAX_WORKERS", str(os.cpu_count() or 2)))
+# Extraction stops after this many pages or characters so huge documents cannot exhaust memory
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "500"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "2000000"))
+
+# Part of every cache key, so upgrading the extractor invalidates stale text
+EXTRACTOR_VERSION = f"pypdf2-{pdf.__version__}"
+
+PdfSource = Union[str, bytes, io.IOBase]
+
+class PageText(NamedTuple):
+    number: int
+    text: str
+    seconds: float
+
+_cache = None
+_pool = None
+_shared_lock = threading.Lock()
+
+def get_pdf_cache() -> SQLiteCache:
+    """Return the process-wide extracted text cache, keyed by the SHA-256 of the PDF bytes"""
+    global _cache
+    with _shared_lock:
+        if _cache is None:
+            _cache = open_cache("pdf_text.sqlite", max_bytes=PDF_CACHE_MAX_BYTES)
+        return _cache
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Return the process pool used to extract pages of large documents"""
+    global _pool
+    with _shared_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_MAX_WORKERS)
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+def pdf_bytes(pdf_file: PdfSource) -> bytes:
+    """Raw bytes of a PDF given as a path, bytes or binary file-like object (e.g. a Streamlit upload)"""
+    if isinstance(pdf_file, bytes):
+        return pdf_file
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, 'rb') as f:
+            return f.read()
+    if hasattr(pdf_file, 'getvalue'):
+        return pdf_file.getvalue()
+    pdf_file.seek(0)
+    return pdf_file.read()
+
+def pdf_cache_key(data: bytes) -> str:
+    """Cache key of a PDF's extracted text"""
+    return f"{EXTRACTOR_VERSION}:{hashlib.sha256(data).hexdigest()}"
+
+def _extract_range(source: Union[str, bytes], start: int, stop: int) -> List[PageText]:
+    """Extract pages [start, stop) of a PDF file path or bytes; runs in worker processes"""
+    reader = pdf.PdfReader(source if isinstance(source, str) else io.BytesIO(source))
+    pages = []
+    for number in range(start, stop):
+        page_start = time.perf_counter()
+        text = reader.pages[number].extract_text() or ""
+        pages.append(PageText(number, text, time.perf_counter() - page_start))
+    return pages
+
+def _extract_document(data: bytes) -> Tuple[str, List[float]]:
+    """Extract a whole document serially; runs in worker processes for batch fan-out"""
+    return _collect(_iter_pages(data, parallel=False))
+
+def _collect(pages: Iterator[PageText]) -> Tuple[str, List[float]]:
+    """Join page texts, stopping once PDF_MAX_CHARS is reached, and return them with per-page timings"""
+    parts, timings, chars = [], [], 0
+    for page in pages:
+        parts.append(page.text)
+        timings.append(page.seconds)
+        chars += len(page.text)
+        if chars >= PDF_MAX_CHARS:
+            logger.warning(f"PDF text truncated to {PDF_MAX_CHARS} characters after page {page.number + 1}")
+            break
+    return "".join(parts)[:PDF_MAX_CHARS], timings
+
+def _iter_pages(data: bytes, parallel: Optional[bool] = None, max_workers: Optional[int] = None) -> Iterator[PageText]:
+    reader = pdf.PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    if page_count > PDF_MAX_PAGES:
+        logger.warning(f"PDF has {page_count} pages, only the first {PDF_MAX_PAGES} are extracted")
+        page_count = PDF_MAX_PAGES
+    if parallel is None:
+        parallel = page_count >= PDF_PARALLEL_MIN_PAGES
+    if not parallel:
+        for number in range(page_count):
+            page_start = time.perf_counter()
+            text = reader.pages[number].extract_text() or ""
+            yield PageText(number, text, time.perf_counter() - page_start)
+        return
+
+    # Workers read the document from a temporary file rather than receiving its bytes with every task
+    pool = get_pdf_pool()
+    window = max_workers or PDF_MAX_WORKERS
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    pending = deque()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        ranges = iter(range(0, page_count, PDF_PAGES_PER_TASK))
+        # A bounded window of page ranges keeps finished-but-unconsumed pages from piling up
+        for start in ranges:
+            pending.append(pool.submit(_extract_range, path, start, min(start + PDF_PAGES_PER_TASK, page_count)))
+            if len(pending) >= window:
+                break
+        while pending:
+            pages = pending.popleft().result()
+            next_start = next(ranges, None)
+            if next_start is not None:
+                pending.append(pool.submit(
+                    _extract_range, path, next_start, min(next_start + PDF_PAGES_PER_TASK, page_count)
+                ))
+            yield from pages
+    finally:
+        for future in pending:
+            future.cancel()
+        for future in pending:
+            if not future.cancelled():
+                future.exception()
+        os.remove(path)
+
+def iter_pdf_pages(pdf_file: PdfSource, parallel: Optional[bool] = None,
+                   max_workers: Optional[int] = None) -> Iterator[PageText]:
     """
-    Extract text from uploaded PDF file
-    
+    Yield extracted text page by page, in page order
+
+    Per-page extraction time is observed under 'pdf.page' in the default
+    metrics registry. Stopping iteration early cancels outstanding work.
+
     Args:
-        uploaded_file: Streamlit uploaded file object
-    
+        pdf_file: Path, bytes or binary file-like object of the PDF
+        parallel: Fan page ranges out to the process pool; defaults to documents
+            of at least PDF_PARALLEL_MIN_PAGES pages
+        max_workers: Page ranges in flight at once, defaults to PDF_MAX_WORKERS
+
+    Yields:
+        PageText: Page number (0-based), text and extraction time in seconds
+    """
+    for page in _iter_pages(pdf_bytes(pdf_file), parallel, max_workers):
+        default_metrics.observe("pdf.page", page.seconds)
+        yield page
+
+def read_pdf_text(pdf_file: PdfSource, use_cache: bool = True, executor: Optional[Executor] = None) -> str:
+    """
+    Extract text from a PDF without any Streamlit calls
+
+    Text is cached on disk under the SHA-256 of the PDF bytes, so the same
+    file uploaded twice or screened in several batches is parsed once.
+
+    Args:
+        pdf_file: Path, bytes or binary file-like object of the PDF
+        use_cache: Read and write the extracted text cache
+        executor: Process pool to extract the whole file in (batch fan-out);
+            by default large documents have their pages fanned out instead
+
     Returns:
         str: Extracted text from PDF
+
+    Raises:
+        Exception: If the PDF cannot be read
+    """
+    data = pdf_bytes(pdf_file)
+    key = pdf_cache_key(data)
+    if use_cache:
+        cached = get_pdf_cache().get(key)
+        if cached is not None:
+            default_metrics.increment("pdf.cache_hits")
+            return cached.decode('utf-8')
+
+    start = time.perf_counter()
+    if executor is not None:
+        text, timings = executor.submit(_extract_document, data).result()
+        for seconds in timings:
+            default_metrics.observe("pdf.page", seconds)
+    else:
+        text, timings = _collect(iter_pdf_pages(data))
+    elapsed = time.perf_counter() - start
+    default_metrics.observe("pdf.document", elapsed)
+    slowest = max(timings, default=0.0)
+    logger.debug(f"Extracted {len(timings)} pages in {elapsed:.3f}s (slowest page {slowest:.3f}s)")
+
+    if use_cache:
+        get_pdf_cache().set(key, text.encode('utf-8'))
+    return text
+
+def extract_text_from_pdf(uploaded_file):
+    """
+    Extract text from uploaded PDF file, passing failures to the error reporters
+
+    Args:
+        uploaded_file: Uploaded file object (e.g. from Streamlit)
+
+    Returns:
+        str: Extracted text from PDF, or None if it cannot be read
     """
     try:
-        reader = pdf.PdfReader(uploaded_file)
-        text = ""
-        for page in range(len(reader.pages)):
-            page = reader.pages[page]
-            text += str(page.extract_text())
-        return text
+        return read_pdf_text(uploaded_file)
     except Exception as e:
-        st.error(f"Error processing PDF: {str(e)}")
-        return None 
\ No newline at end of file
+        report_error(f"Error processing PDF: {str(e)}")
+        return None
@@ -1,28 +1,58 @@
 import os
 import json
+import time
 import numpy as np
-import faiss
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+from models.llm_gateway import get_gateway
+from utils.embedding_cache import CachedEmbeddings
+from utils.embeddings import Embedder, get_embedder
+from utils.index_manager import IndexManager, get_index_manager
+from utils.vector_index import build_index, search_index
 from utils.logging_utils import default_logger as logger
+from utils.metrics_utils import timed_stream
+from utils.resume_parser import parse_resume
+
+RAG_LLM_PROVIDER = os.getenv("RAG_LLM_PROVIDER", "openai")
+RAG_CHAT_MODEL = os.getenv("RAG_CHAT_MODEL", "gpt-3.5-turbo")
+CHUNK_SIZE = 1000
 
 class RAGSystem:
-    def __init__(self):
-        """Initialize the RAG system with OpenAI embeddings and FAISS index"""
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        owner_id: Optional[str] = None,
+        index_manager: Optional[IndexManager] = None
+    ):
+        """
+        Initialize the RAG system with the configured embedding backend and FAISS index
+        
+        Args:
+            embedder: Embedding backend, defaults to the one selected by RAG_EMBEDDING_BACKEND
+            owner_id: Session or candidate ID; when set, chunks go to the shared
+                persisted index and searches only see this owner's chunks
+            index_manager: Shared index to use with owner_id, defaults to the
+                process-wide manager for the embedding model
+        """
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not self.openai_api_key:
-            logger.error("OpenAI API key not found in environment variables")
-            raise ValueError("OpenAI API key is required for RAG functionality")
+        self.gateway = get_gateway()
+        self.llm_provider = RAG_LLM_PROVIDER
+        self.chat_model = RAG_CHAT_MODEL
         
-        self.client = OpenAI(api_key=self.openai_api_key)
-        self.embeddings = OpenAIEmbeddings(openai_api_key=self.openai_api_key)
+        embedder = embedder or get_embedder()
+        # Remote embeddings are cached on disk by (model, chunk text) and reused across sessions;
+        # local ones are cheaper to recompute than to look up
+        self.embeddings = CachedEmbeddings(embedder) if embedder.is_remote else embedder
+        # Imported here: langchain takes most of a second to load and only RAG needs it
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
         self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
+            chunk_size=CHUNK_SIZE,
             chunk_overlap=200,
             length_function=len,
         )
+        self.owner_id = owner_id
+        self.index_manager = None
+        if owner_id is not None:
+            self.index_manager = index_manager or get_index_manager(self.embeddings)
         self.index = None
         self.documents = []
         self.metadata = []
@@ -41,15 +71,15 @@ class RAGSystem:
         # Prepare documents with metadata
         documents = []
         
-        # Resume document
-        resume_chunks = self.text_splitter.split_text(resume_text)
-        for i, chunk in enumerate(resume_chunks):
+        # Resume document, chunked along its sections and entries
+        for i, (chunk, section_metadata) in enumerate(self._resume_chunks(resume_text)):
             documents.append({
                 'text': chunk,
                 'metadata': {
                     'source': 'resume',
                     'chunk_id': i,
-                    'type': 'resume_section'
+                    'type': 'resume_section',
+                    **section_metadata
                 }
             })
         
@@ -92,6 +122,43 @@ class RAGSystem:
         self.documents = documents
         logger.info(f"Processed {len(documents)} document chunks")
         
+    def _resume_chunks(self, resume_text: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Chunk a resume along parsed section and entry boundaries
+        
+        Each job, degree or project becomes one chunk headed by its section,
+        title, organisation and dates; undated sections are one chunk each.
+        Only pieces longer than the splitter's chunk size are split further.
+        
+        Args:
+            resume_text: Extracted text from resume
+        
+        Returns:
+            List of (chunk text, section metadata) pairs
+        """
+        chunks = []
+        for section in parse_resume(resume_text).sections:
+            heading = section.heading or section.kind.title()
+            pieces = []
+            if section.entries:
+                for entry in section.entries:
+                    label = " - ".join(part for part in (entry.title, entry.organization) if part)
+                    dates = f" ({entry.start} to {entry.end})" if entry.start != entry.end else f" ({entry.start})"
+                    dates = dates if entry.start else ""
+                    pieces.append((
+                        f"{heading}: {label}{dates}\n{entry.text}".strip(),
+                        {'section': section.kind, 'title': entry.title, 'organization': entry.organization,
+                         'start': entry.start, 'end': entry.end}
+                    ))
+            else:
+                pieces.append((f"{heading}:\n{section.text}", {'section': section.kind}))
+            for text, metadata in pieces:
+                if len(text) <= CHUNK_SIZE:
+                    chunks.append((text, metadata))
+                else:
+                    chunks.extend((part, metadata) for part in self.text_splitter.split_text(text))
+        return chunks
+        
     def create_embeddings_and_index(self) -> None:
         """Create embeddings and build FAISS index"""
         if not self.documents:
@@ -104,17 +171,20 @@ class RAGSystem:
         texts = [doc['text'] for doc in self.documents]
         self.metadata = [doc['metadata'] for doc in self.documents]
         
+        if self.index_manager:
+            # Replace this owner's previous chunks; chunks other owners share stay indexed
+            self.index_manager.remove_by_source(self.owner_id)
+            self.index_manager.add_documents(self.documents, self.owner_id)
+            return
+        
         # Create embeddings
         try:
-            embeddings_list = self.embeddings.embed_documents(texts)
-            embeddings_array = np.array(embeddings_list).astype('float32')
-            
-            # Create FAISS index
-            dimension = embeddings_array.shape[1]
-            self.index = faiss.IndexFlatL2(dimension)
-            self.index.add(embeddings_array)
+            embeddings_array = np.asarray(self.embeddings.embed_documents(texts), dtype='float32')
             
-            logger.info(f"Created FAISS index with {len(embeddings_array)} vectors of dimension {dimension}")
+            # Create FAISS index; flat for small corpora, IVF/HNSW above RAG_FLAT_THRESHOLD
+            self.index = build_index(embeddings_array)
+            if isinstance(self.embeddings, CachedEmbeddings):
+                logger.debug(f"Embedding cache stats: {self.embeddings.stats()}")
             
         except Exception as e:
             logger.error(f"Error creating embeddings: {str(e)}")
@@ -131,49 +201,72 @@ class RAGSystem:
         Returns:
             List of relevant documents with their metadata
         """
-        if not self.index:
+        results = self.retrieve_many([query], top_k=top_k)
+        return results[0] if results else []
+    
+    def retrieve_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        source: Optional[Union[str, List[str]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve relevant context for several queries with one embedding batch and one search
+        
+        Args:
+            queries: The search queries
+            top_k: Number of top results to return per query
+            source: Only return chunks whose metadata source matches
+                ('resume', 'job_description' or 'github'); applied before the top-k cut
+            
+        Returns:
+            One list of relevant documents with their metadata per query
+        """
+        if not self.index and not self.index_manager:
             logger.error("FAISS index not initialized")
             return []
+        if not queries:
+            return []
+        sources = [source] if isinstance(source, str) else source
         
         try:
-            # Create query embedding
-            query_embedding = self.embeddings.embed_query(query)
-            query_vector = np.array([query_embedding]).astype('float32')
-            
-            # Search the index
-            distances, indices = self.index.search(query_vector, top_k)
+            # Embed every query in one batch and search with the 2-D query matrix
+            query_vectors = np.asarray(self.embeddings.embed_queries(list(queries)), dtype='float32')
             
-            # Retrieve relevant documents
-            relevant_docs = []
-            for idx in indices[0]:
-                if idx < len(self.documents):
-                    relevant_docs.append({
-                        'text': self.documents[idx]['text'],
-                        'metadata': self.documents[idx]['metadata'],
-                        'score': float(distances[0][list(indices[0]).index(idx)])
-                    })
+            if self.index_manager:
+                results = self.index_manager.search(query_vectors, top_k, owner_id=self.owner_id, sources=sources)
+            else:
+                allowed = None
+                if sources:
+                    allowed = np.array(
+                        [i for i, metadata in enumerate(self.metadata) if metadata.get('source') in sources],
+                        dtype='int64'
+                    )
+                distances, indices = search_index(self.index, query_vectors, top_k, allowed)
+                
+                # Build results straight from the distance rows, skipping the -1 padding
+                results = [
+                    [
+                        {
+                            'text': self.documents[idx]['text'],
+                            'metadata': self.documents[idx]['metadata'],
+                            'score': float(distance)
+                        }
+                        for distance, idx in zip(row_distances, row_indices)
+                        if 0 <= idx < len(self.documents)
+                    ]
+                    for row_distances, row_indices in zip(distances, indices)
+                ]
             
-            logger.info(f"Retrieved {len(relevant_docs)} relevant documents for query: {query}")
-            return relevant_docs
+            logger.info(f"Retrieved {sum(len(docs) for docs in results)} relevant documents for {len(queries)} queries")
+            return results
             
         except Exception as e:
             logger.error(f"Error retrieving context: {str(e)}")
-            return []
+            return [[] for _ in queries]
     
-    def generate_rag_response(self, query: str, context_docs: List[Dict[str, Any]]) -> str:
-        """
-        Generate a response using RAG with retrieved context
-        
-        Args:
-            query: The user query
-            context_docs: Retrieved relevant documents
-            
-        Returns:
-            Generated response string
-        """
-        if not context_docs:
-            return "I don't have enough context to answer your question. Please try rephrasing or ask about your resume, job description, or GitHub projects."
-        
+    def _build_messages(self, query: str, context_docs: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Chat messages asking the model to answer query from the retrieved context"""
         # Prepare context
         context_text = "\n\n".join([doc['text'] for doc in context_docs])
         
@@ -189,22 +282,66 @@ Please provide a comprehensive and helpful answer based on the available context
 
 Answer:"""
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant that analyzes resumes, job descriptions, and GitHub profiles to provide career advice and insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
-            )
+        return [
+            {"role": "system", "content": "You are a helpful AI assistant that analyzes resumes, job descriptions, and GitHub profiles to provide career advice and insights."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def generate_rag_response(self, query: str, context_docs: List[Dict[str, Any]]) -> str:
+        """
+        Generate a response using RAG with retrieved context
+        
+        Args:
+            query: The user query
+            context_docs: Retrieved relevant documents
+            
+        Returns:
+            Generated response string
+        """
+        return "".join(self.generate_rag_response_stream(query, context_docs, stream=False))
+    
+    def generate_rag_response_stream(
+        self,
+        query: str,
+        context_docs: List[Dict[str, Any]],
+        stream: bool = True
+    ) -> Iterator[str]:
+        """
+        Generate a response using RAG, yielding tokens as they arrive
+        
+        Time-to-first-token and total latency are recorded under 'rag.ttft'
+        and 'rag.total' in the default metrics registry.
+        
+        Args:
+            query: The user query
+            context_docs: Retrieved relevant documents
+            stream: Request a streamed completion; when False the whole answer is yielded at once
             
-            return response.choices[0].message.content
+        Yields:
+            Response text chunks
+        """
+        if not context_docs:
+            yield "I don't have enough context to answer your question. Please try rephrasing or ask about your resume, job description, or GitHub projects."
+            return
+        
+        if self.llm_provider == "openai" and not self.openai_api_key:
+            logger.error("OpenAI API key not found in environment variables")
+            yield "Answer generation requires an OpenAI API key. Retrieval still works without one."
+            return
+        
+        try:
+            start = time.perf_counter()
+            messages = self._build_messages(query, context_docs)
+            params = {'max_tokens': 1000, 'temperature': 0.7}
+            if stream:
+                chunks = self.gateway.stream(self.llm_provider, self.chat_model, messages, **params)
+            else:
+                chunks = iter([self.gateway.generate(self.llm_provider, self.chat_model, messages, **params)])
+            yield from timed_stream(chunks, "rag", start=start)
             
         except Exception as e:
             logger.error(f"Error generating RAG response: {str(e)}")
-            return f"Sorry, I encountered an error while generating a response: {str(e)}"
+            yield f"Sorry, I encountered an error while generating a response: {str(e)}"
     
     def chat_with_rag(self, user_message: str) -> str:
         """
@@ -222,4 +359,17 @@ Answer:"""
         # Generate response
         response = self.generate_rag_response(user_message, context_docs)
         
-        return response 
\ No newline at end of file
+        return response
+    
+    def chat_with_rag_stream(self, user_message: str) -> Iterator[str]:
+        """
+        Streaming RAG pipeline: retrieve context, then yield response tokens as they arrive
+        
+        Args:
+            user_message: User's question or message
+            
+        Yields:
+            Response text chunks
+        """
+        context_docs = self.retrieve_relevant_context(user_message, top_k=5)
+        yield from self.generate_rag_response_stream(user_message, context_docs)
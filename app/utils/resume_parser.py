@@ -0,0 +1,280 @@
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.skill_taxonomy import SkillTaxonomy, get_taxonomy
+from utils.text_utils import section_blocks
+
+# Sections with dated entries (jobs, degrees, projects)
+ENTRY_SECTIONS = ('experience', 'education', 'projects')
+# Sections sent to the model for ATS analysis; contact details, interests and references are left out
+PROMPT_SECTIONS = ('summary', 'experience', 'projects', 'skills', 'education', 'certifications', 'achievements')
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:\b(?:{_MONTH}\s+)?(?:19|20)\d{{2}}\b|\b(?:0?[1-9]|1[0-2])/(?:19|20)\d{{2}}\b)"
+_DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|present|current|now|today)",
+    re.IGNORECASE
+)
+_SINGLE_DATE_RE = re.compile(rf"(?P<start>{_DATE})", re.IGNORECASE)
+_BULLET_RE = re.compile(r"^\s*(?:[-•*▪●◦‣–]|\d+[.)])\s+")
+_HEADER_SPLIT_RE = re.compile(r"\s+(?:at|@)\s+|\s*[|,–—]\s*|\s+-\s+")
+_TITLE_RE = re.compile(
+    r"\b(?:engineer|developer|manager|intern|analyst|scientist|lead|consultant|architect|designer|director|"
+    r"administrator|specialist|officer|assistant|associate|researcher|head|vp|cto|ceo|founder|"
+    r"bachelor|master|b\.?sc|m\.?sc|b\.?tech|m\.?tech|b\.?e|b\.?s|m\.?s|ph\.?d|mba|diploma|degree)\b",
+    re.IGNORECASE
+)
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"\+?\d[\d ()-]{7,}\d")
+_URL_RE = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com)/[\w/-]+", re.IGNORECASE)
+
+@dataclass(slots=True)
+class Entry:
+    """One job, degree or project"""
+    title: str = ""
+    organization: str = ""
+    start: str = ""
+    end: str = ""
+    text: str = ""
+
+    def months(self) -> int:
+        """Length of the entry in months, 0 when its dates are unknown"""
+        start, end = _month_index(self.start), _month_index(self.end)
+        if start is None or end is None or end < start:
+            return 0
+        return end - start + 1
+
+@dataclass(slots=True)
+class Section:
+    """A headed block of the resume, with its entries when the section has dated ones"""
+    kind: str
+    heading: str
+    text: str
+    entries: List[Entry] = field(default_factory=list)
+
+@dataclass(slots=True)
+class ResumeDocument:
+    """Structured view of a resume: contact details, ordered sections and normalised skills"""
+    sections: List[Section] = field(default_factory=list)
+    contact: Dict[str, str] = field(default_factory=dict)
+    skills: List[str] = field(default_factory=list)
+
+    def section(self, kind: str) -> Optional[Section]:
+        """First section of a kind, or None"""
+        return next((section for section in self.sections if section.kind == kind), None)
+
+    def entries(self, kind: str) -> List[Entry]:
+        """Entries of every section of a kind"""
+        return [entry for section in self.sections if section.kind == kind for entry in section.entries]
+
+    def experience_months(self) -> int:
+        """Total months covered by dated experience entries, overlaps counted once"""
+        months = set()
+        for entry in self.entries('experience'):
+            start, end = _month_index(entry.start), _month_index(entry.end)
+            if start is not None and end is not None and end >= start:
+                months.update(range(start, end + 1))
+        return len(months)
+
+    def text_for(self, kinds: Iterable[str] = PROMPT_SECTIONS) -> str:
+        """
+        Compact text of the selected sections, in resume order, for prompts
+
+        Args:
+            kinds: Section kinds to include
+
+        Returns:
+            str: Sections under their headings with blank lines and repeated spaces collapsed
+        """
+        kinds = set(kinds)
+        parts = []
+        for section in self.sections:
+            if section.kind not in kinds:
+                continue
+            body = "\n".join(" ".join(line.split()) for line in section.text.splitlines() if line.strip())
+            parts.append(f"{section.heading or section.kind.title()}:\n{body}")
+        return "\n\n".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict, e.g. for session state or JSON"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResumeDocument":
+        """Rebuild a document from to_dict output"""
+        return cls(
+            sections=[
+                Section(
+                    kind=section['kind'],
+                    heading=section['heading'],
+                    text=section['text'],
+                    entries=[Entry(**entry) for entry in section.get('entries', [])]
+                )
+                for section in data.get('sections', [])
+            ],
+            contact=dict(data.get('contact', {})),
+            skills=list(data.get('skills', []))
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "ResumeDocument":
+        return cls.from_dict(json.loads(payload))
+
+def parse_resume(text: str, taxonomy: Optional[SkillTaxonomy] = None) -> ResumeDocument:
+    """
+    Parse extracted resume text into sections, dated entries, contact details and skills
+
+    Args:
+        text: Extracted resume text
+        taxonomy: Skill taxonomy for normalised skills, defaults to the shared one
+
+    Returns:
+        ResumeDocument: Parsed resume; unrecognised layouts still yield a single 'summary' section
+    """
+    taxonomy = taxonomy or get_taxonomy()
+    sections = []
+    for kind, heading, body in section_blocks(text):
+        if not heading:
+            # The unheaded top of a resume is mostly name and contact lines, which are kept in contact instead
+            body = "\n".join(line for line in body.splitlines() if not _is_contact_line(line)).strip()
+            if not body:
+                continue
+        entries = parse_entries(body) if kind in ENTRY_SECTIONS else []
+        sections.append(Section(kind=kind, heading=heading, text=body, entries=entries))
+    return ResumeDocument(
+        sections=sections,
+        contact=_contact_details(text),
+        skills=sorted(taxonomy.extract(text))
+    )
+
+def parse_entries(body: str) -> List[Entry]:
+    """
+    Split a section body into entries, each starting at a line with a date or date range
+
+    Up to two short non-bullet lines just above a date line (e.g. 'Acme Corp'
+    over 'Backend Engineer  Jan 2019 - Present') form the entry's header.
+
+    Args:
+        body: Section text
+
+    Returns:
+        List[Entry]: Entries in order; empty when the section has no dates
+    """
+    entries: List[Entry] = []
+    current: Optional[Entry] = None
+    body_lines: List[str] = []
+    pending: List[str] = []
+    for raw in body.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        is_bullet = bool(_BULLET_RE.match(line))
+        dates = None if is_bullet else _dates(line)
+        if dates is None:
+            if is_bullet or len(line) > 80:
+                body_lines.extend(pending)
+                body_lines.append(line)
+                pending = []
+            else:
+                pending.append(line)
+            continue
+
+        if current is not None:
+            current.text = "\n".join(body_lines + pending[:-2])
+        title, organization = _split_header(pending[-2:] + [_strip_dates(line)])
+        current = Entry(title=title, organization=organization, start=dates[0], end=dates[1])
+        entries.append(current)
+        body_lines, pending = [], []
+
+    if current is not None:
+        current.text = "\n".join(body_lines + pending)
+    return entries
+
+def _dates(line: str) -> Optional[Tuple[str, str]]:
+    """Normalised (start, end) of a line's date range or single year, or None"""
+    match = _DATE_RANGE_RE.search(line)
+    if match:
+        return _normalize_date(match.group('start')), _normalize_date(match.group('end'))
+    match = _SINGLE_DATE_RE.search(line)
+    # A lone date only marks an entry on short header-like lines (e.g. 'BSc Computer Science, 2018')
+    if match and len(line) <= 80 and _normalize_date(match.group('start')):
+        date = _normalize_date(match.group('start'))
+        return date, date
+    return None
+
+def _normalize_date(value: str) -> str:
+    """'Jan 2019' -> '2019-01', '03/2020' -> '2020-03', '2018' -> '2018', 'Present' -> 'present'"""
+    value = value.strip().lower().rstrip('.')
+    if value in ('present', 'current', 'now', 'today'):
+        return 'present'
+    if '/' in value:
+        month, year = value.split('/')
+        return f"{year}-{int(month):02d}"
+    parts = value.replace('.', ' ').split()
+    if len(parts) == 2:
+        month = _MONTHS.get(parts[0][:3])
+        return f"{parts[1]}-{month:02d}" if month else parts[1]
+    return parts[-1]
+
+def _month_index(value: str) -> Optional[int]:
+    """Months since year 0 for 'YYYY', 'YYYY-MM' or 'present', None when unknown"""
+    if not value:
+        return None
+    if value == 'present':
+        today = date.today()
+        return today.year * 12 + today.month - 1
+    year, _, month = value.partition('-')
+    return int(year) * 12 + (int(month) - 1 if month else 0)
+
+def _strip_dates(line: str) -> str:
+    line = _DATE_RANGE_RE.sub('', line)
+    line = _SINGLE_DATE_RE.sub('', line)
+    return line.strip(" \t,|–—-()")
+
+def _split_header(lines: List[str]) -> Tuple[str, str]:
+    """Title and organisation from header lines such as 'Backend Engineer at Acme' or 'Acme | Engineer'"""
+    lines = [line for line in lines if line]
+    if len(lines) == 1:
+        lines = [piece.strip() for piece in _HEADER_SPLIT_RE.split(lines[0]) if piece.strip()]
+    if not lines:
+        return "", ""
+    if len(lines) == 1:
+        return lines[0], ""
+    first, second = lines[0], lines[1]
+    # Prefer the piece that names a role or degree as the title
+    if _TITLE_RE.search(second) and not _TITLE_RE.search(first):
+        return second, first
+    return first, second
+
+def _phone(text: str) -> Optional[str]:
+    """First phone number in text; date ranges such as '2018 - 2019' look like one and are skipped"""
+    for match in _PHONE_RE.finditer(text):
+        if not _DATE_RANGE_RE.fullmatch(match.group(0)):
+            return match.group(0)
+    return None
+
+def _is_contact_line(line: str) -> bool:
+    return bool(_EMAIL_RE.search(line) or _phone(line) or _URL_RE.search(line))
+
+def _contact_details(text: str) -> Dict[str, str]:
+    contact = {}
+    head = text[:2000]
+    match = _EMAIL_RE.search(head)
+    if match:
+        contact['email'] = match.group(0)
+    phone = _phone(head)
+    if phone:
+        contact['phone'] = phone
+    for url in _URL_RE.findall(head):
+        contact['linkedin' if 'linkedin' in url.lower() else 'github'] = url
+    return contact
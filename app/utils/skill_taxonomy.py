@@ -0,0 +1,199 @@
+import json
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.logging_utils import default_logger as logger
+
+SKILLS_PATH = os.getenv(
+    "SKILLS_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'skills.json')
+)
+
+# Characters that may not directly precede or follow a skill mention
+_WORD_EXTRA = frozenset('+#')
+
+class SkillMatch(NamedTuple):
+    start: int
+    end: int
+    skill: str
+    alias: str
+
+class SkillTaxonomy:
+    """Skills, their aliases, categories and weights, compiled into one Aho-Corasick automaton.
+
+    Every alias of every skill is a pattern pointing at its canonical name, so
+    'k8s' and 'Kubernetes' both extract as 'Kubernetes'. Text is scanned once
+    whatever the number of skills; matches must sit on word boundaries, and
+    aliases listed under case_sensitive (e.g. 'Go', 'R') must match exactly.
+    """
+
+    def __init__(self, skills: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            skills: Canonical skill name to {'category', 'weight', 'aliases', 'case_sensitive'}
+        """
+        self.skills = skills
+        self._canonical: Dict[str, str] = {}
+        # Automaton: per-state transitions, failure links and (alias, skill, exact) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str, bool]]] = [[]]
+        for name, info in skills.items():
+            exact = set(info.get('case_sensitive', []))
+            for alias in [name] + info.get('aliases', []):
+                if alias not in exact:
+                    self._canonical.setdefault(alias.lower(), name)
+                self._add_pattern(alias, name, alias in exact)
+        self._build_failure_links()
+        logger.debug(f"Compiled skill taxonomy: {len(skills)} skills, {len(self._goto)} automaton states")
+
+    def _add_pattern(self, alias: str, skill: str, exact: bool) -> None:
+        state = 0
+        for ch in alias.lower():
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((alias, skill, exact))
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first pass setting failure links and merging outputs of suffix states"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    @classmethod
+    def load(cls, path: str = SKILLS_PATH) -> "SkillTaxonomy":
+        """Load a taxonomy from a JSON file"""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """
+        Locate skill mentions in one pass over text
+
+        Overlapping candidates are resolved leftmost-longest, so 'Node.js'
+        wins over 'Node' and 'Ruby on Rails' over 'Ruby'.
+
+        Args:
+            text: Resume, job description or README text
+
+        Returns:
+            List[SkillMatch]: Non-overlapping matches in text order
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to several; keep offsets aligned with text
+            lowered = ''.join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+        goto, fail, out = self._goto, self._fail, self._out
+        candidates = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for alias, skill, exact in out[state]:
+                    start = i + 1 - len(alias)
+                    if exact and text[start:i + 1] != alias:
+                        continue
+                    if _is_boundary(text, start, i + 1):
+                        candidates.append(SkillMatch(start, i + 1, skill, alias))
+
+        candidates.sort(key=lambda match: (match.start, match.start - match.end))
+        matches, last_end = [], 0
+        for match in candidates:
+            if match.start >= last_end:
+                matches.append(match)
+                last_end = match.end
+        return matches
+
+    def extract(self, text: str) -> Counter:
+        """
+        Count canonical skill mentions in text
+
+        Args:
+            text: Resume, job description or README text
+
+        Returns:
+            Counter: Canonical skill name to number of mentions
+        """
+        return Counter(match.skill for match in self.find(text))
+
+    def extract_many(self, texts: Iterable[str]) -> List[Counter]:
+        """Canonical skill counts for each text"""
+        return [self.extract(text) for text in texts]
+
+    def canonical(self, term: str) -> Optional[str]:
+        """
+        Canonical skill name for a skill name or alias
+
+        Args:
+            term: Skill name, alias, or a phrase containing exactly one skill
+
+        Returns:
+            Optional[str]: Canonical name, or None if the term is not a known skill
+        """
+        if term in self.skills:
+            return term
+        name = self._canonical.get(term.strip().lower())
+        if name is None:
+            found = self.extract(term)
+            if len(found) == 1:
+                name = next(iter(found))
+        return name
+
+    def aliases(self, name: str) -> List[str]:
+        """Aliases of a canonical skill"""
+        return list(self.skills.get(name, {}).get('aliases', []))
+
+    def weight(self, name: str) -> float:
+        """Importance weight of a canonical skill"""
+        return self.skills.get(name, {}).get('weight', 1.0)
+
+    def category(self, name: str) -> str:
+        """Category of a canonical skill (language, framework, tool, ...)"""
+        return self.skills.get(name, {}).get('category', '')
+
+    def names(self) -> List[str]:
+        """Canonical skill names"""
+        return list(self.skills)
+
+def _is_boundary(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] is delimited as a whole word (allowing 'C++', 'C#', '.NET')"""
+    if start > 0:
+        before = text[start - 1]
+        if before.isalnum() or before in _WORD_EXTRA or before in '._':
+            return False
+    if end < len(text):
+        after = text[end]
+        if after.isalnum() or after in _WORD_EXTRA or after == '_':
+            return False
+        # 'Node.js' must not match inside 'Node.jsx', nor 'Node' inside 'Node.js'
+        if after == '.' and end + 1 < len(text) and text[end + 1].isalnum():
+            return False
+    return True
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Return the process-wide taxonomy loaded from data/skills.json (or SKILLS_TAXONOMY_PATH)"""
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            _taxonomy = SkillTaxonomy.load()
+        return _taxonomy
@@ -0,0 +1,106 @@
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each etc few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just least less let
+like made make many may me more most must my myself no nor not now of off on once one only or other our
+ours ourselves out over own per same shall she should so some such than that the their theirs them
+themselves then there these they this those through to too under until up upon us very via was we well
+were what when where which while who whom why will with within without would you your yours yourself
+yourselves able across ability experience strong work working years year looking role team teams using
+used use new including include includes etc join candidate candidates ideal responsibilities requirements
+required preferred plus knowledge skills skill good great excellent understanding related relevant need needs
+""".split())
+
+# Resume headings mapped to the section kind they introduce
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'about me', 'career objective'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'internships', 'internship experience'),
+    'projects': ('projects', 'personal projects', 'academic projects', 'key projects', 'side projects'),
+    'education': ('education', 'academic background', 'academics', 'education and training', 'qualifications'),
+    'skills': ('skills', 'technical skills', 'core skills', 'technologies', 'tech stack', 'core competencies'),
+    'certifications': ('certifications', 'certificates', 'licenses and certifications', 'courses'),
+    'achievements': ('achievements', 'awards', 'honors', 'honours', 'awards and achievements', 'publications'),
+    'languages': ('languages', 'spoken languages', 'language skills'),
+    'interests': ('interests', 'hobbies', 'hobbies and interests', 'extracurricular activities', 'activities'),
+    'personal': ('personal details', 'personal information', 'contact', 'contact information', 'references'),
+}
+_HEADING_LOOKUP = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+
+def tokenize(text: str, drop_stopwords: bool = True) -> List[str]:
+    """
+    Lowercase word tokens, keeping technical tokens like c++, c#, node.js
+
+    Args:
+        text: Input text
+        drop_stopwords: Remove English and job-ad boilerplate stopwords
+
+    Returns:
+        List[str]: Tokens in order
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    if drop_stopwords:
+        tokens = [token for token in tokens if token not in STOPWORDS and len(token) > 1]
+    return tokens
+
+def term_counts(text: str) -> Counter:
+    """Counter of non-stopword tokens"""
+    return Counter(tokenize(text))
+
+def heading_kind(line: str) -> str:
+    """Section kind for a heading line, or '' if the line is not a known heading"""
+    normalized = " ".join(re.sub(r"[^a-z ]", "", line.lower().replace('&', ' and ')).split())
+    kind = _HEADING_LOOKUP.get(normalized, '')
+    words = line.split()
+    # Title-cased variants such as 'Skills & Tools' or 'EXPERIENCE HIGHLIGHTS'
+    if not kind and 1 < len(words) <= 4 and all(word[0].isupper() or not word[0].isalpha() for word in words):
+        kind = _HEADING_LOOKUP.get(normalized.split(' ')[0], '')
+    return kind
+
+def section_blocks(text: str) -> List[Tuple[str, str, str]]:
+    """
+    Split resume text on known section headings, keeping their order
+
+    Args:
+        text: Extracted resume text
+
+    Returns:
+        List[Tuple[str, str, str]]: (kind, heading line, body) per section; text
+            before the first heading is a 'summary' block with an empty heading
+    """
+    blocks = []
+    kind, heading, lines = 'summary', '', []
+    for line in text.splitlines():
+        line_kind = heading_kind(line) if len(line) < 40 else ''
+        if line_kind:
+            blocks.append((kind, heading, lines))
+            kind, heading, lines = line_kind, line.strip(), []
+            continue
+        lines.append(line)
+    blocks.append((kind, heading, lines))
+    return [
+        (kind, heading, "\n".join(lines).strip())
+        for kind, heading, lines in blocks
+        if any(line.strip() for line in lines)
+    ]
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    Split resume text on known section headings
+
+    Args:
+        text: Extracted resume text
+
+    Returns:
+        Dict[str, str]: Section kind to text; text before the first heading goes to 'summary'
+    """
+    sections: Dict[str, List[str]] = {}
+    for kind, _, body in section_blocks(text):
+        sections.setdefault(kind, []).append(body)
+    return {kind: "\n".join(bodies) for kind, bodies in sections.items()}
@@ -0,0 +1,167 @@
+import math
+import os
+from typing import Optional, Tuple
+
+import faiss
+import numpy as np
+
+from utils.logging_utils import default_logger as logger
+
+# Corpus size above which brute-force search gives way to an approximate index
+RAG_FLAT_THRESHOLD = int(os.getenv("RAG_FLAT_THRESHOLD", "50000"))
+RAG_ANN_INDEX = os.getenv("RAG_ANN_INDEX", "hnsw")
+RAG_IVF_NPROBE = int(os.getenv("RAG_IVF_NPROBE", "16"))
+RAG_HNSW_M = int(os.getenv("RAG_HNSW_M", "32"))
+RAG_HNSW_EF_SEARCH = int(os.getenv("RAG_HNSW_EF_SEARCH", "64"))
+RAG_TRAIN_SAMPLE = int(os.getenv("RAG_TRAIN_SAMPLE", "100000"))
+# Filters selecting at most this many vectors are searched exactly over the selected vectors
+RAG_EXACT_FILTER_LIMIT = int(os.getenv("RAG_EXACT_FILTER_LIMIT", "20000"))
+
+def choose_index_type(n_vectors: int, ann_type: Optional[str] = None) -> str:
+    """
+    Pick the index tier for a corpus size
+
+    Args:
+        n_vectors: Number of vectors to index
+        ann_type: Approximate index to use above the threshold, 'ivf' or 'hnsw'
+
+    Returns:
+        str: 'flat', 'ivf' or 'hnsw'
+    """
+    if n_vectors < RAG_FLAT_THRESHOLD:
+        return "flat"
+    return (ann_type or RAG_ANN_INDEX).lower()
+
+def build_index(
+    vectors: np.ndarray,
+    ids: Optional[np.ndarray] = None,
+    index_type: Optional[str] = None,
+    nprobe: int = RAG_IVF_NPROBE,
+    ef_search: int = RAG_HNSW_EF_SEARCH
+) -> faiss.Index:
+    """
+    Build a FAISS index of the tier matching the corpus size
+
+    Args:
+        vectors: (n, dim) float32 matrix
+        ids: Optional int64 IDs; when given the index maps results to them
+        index_type: Force 'flat', 'ivf' or 'hnsw' instead of choosing by size
+        nprobe: IVF lists visited per query
+        ef_search: HNSW candidate list size per query
+
+    Returns:
+        faiss.Index: Populated index
+    """
+    vectors = np.ascontiguousarray(vectors, dtype='float32')
+    n, dimension = vectors.shape
+    index_type = index_type or choose_index_type(n)
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dimension)
+    elif index_type == "ivf":
+        # ~4*sqrt(n) lists, keeping at least 39 training points per list as FAISS recommends
+        nlist = max(1, min(int(4 * math.sqrt(n)), n // 39))
+        index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dimension), dimension, nlist)
+        index.train(_training_sample(vectors, max(nlist * 39, min(n, RAG_TRAIN_SAMPLE))))
+        index.nprobe = nprobe
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, RAG_HNSW_M)
+        index.hnsw.efSearch = ef_search
+    else:
+        raise ValueError(f"Unknown index type: {index_type}")
+
+    if ids is not None:
+        if index_type == "ivf":
+            # IVF stores IDs natively; a hashtable direct map lets filtered searches reconstruct by ID
+            index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        else:
+            index = faiss.IndexIDMap2(index)
+        index.add_with_ids(vectors, np.asarray(ids, dtype='int64'))
+    else:
+        index.add(vectors)
+        if index_type == "ivf":
+            # Lets filtered searches reconstruct vectors by position
+            index.make_direct_map()
+    logger.info(f"Built {index_type} index with {n} vectors of dimension {dimension}")
+    return index
+
+def search_parameters(index: faiss.Index, selector: Optional[faiss.IDSelector] = None) -> Optional[faiss.SearchParameters]:
+    """
+    Search parameters carrying an ID selector plus the tier's own tuning knobs
+
+    Args:
+        index: Index that will be searched
+        selector: Optional ID filter applied before the top-k cut
+
+    Returns:
+        Optional[faiss.SearchParameters]: Parameters, or None when no selector is needed
+    """
+    if selector is None:
+        return None
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    if isinstance(inner, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=inner.nprobe)
+    if isinstance(inner, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=inner.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+def is_approximate(index: faiss.Index) -> bool:
+    """Whether an index is an IVF or HNSW tier rather than brute force"""
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    return isinstance(inner, (faiss.IndexIVF, faiss.IndexHNSW))
+
+def search_index(
+    index: faiss.Index,
+    queries: np.ndarray,
+    top_k: int,
+    allowed_ids: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Search any tier, applying an optional ID filter before the top-k cut
+
+    Approximate tiers only visit part of the corpus, so a selective filter can
+    leave them with too few candidates; small filtered sets are therefore
+    searched exactly over their reconstructed vectors instead.
+
+    Args:
+        index: Index to search (IDs must be reconstructable when filtering an approximate tier)
+        queries: (n_queries, dim) float32 matrix
+        top_k: Results per query
+        allowed_ids: Optional IDs the results are restricted to
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Squared L2 distances and IDs, padded with -1 IDs
+    """
+    queries = np.ascontiguousarray(queries, dtype='float32')
+    if allowed_ids is None:
+        return index.search(queries, top_k)
+    allowed_ids = np.asarray(allowed_ids, dtype='int64')
+    if len(allowed_ids) == 0:
+        return (np.full((len(queries), top_k), np.inf, dtype='float32'),
+                np.full((len(queries), top_k), -1, dtype='int64'))
+    if not is_approximate(index) or len(allowed_ids) > RAG_EXACT_FILTER_LIMIT:
+        params = search_parameters(index, faiss.IDSelectorBatch(allowed_ids))
+        return index.search(queries, top_k, params=params)
+
+    vectors = index.reconstruct_batch(allowed_ids)
+    distances = (
+        (queries ** 2).sum(axis=1, keepdims=True)
+        - 2 * queries @ vectors.T
+        + (vectors ** 2).sum(axis=1)
+    )
+    k = min(top_k, len(allowed_ids))
+    top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(distances, top, axis=1).argsort(axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    out_distances = np.full((len(queries), top_k), np.inf, dtype='float32')
+    out_ids = np.full((len(queries), top_k), -1, dtype='int64')
+    out_distances[:, :k] = np.take_along_axis(distances, top, axis=1)
+    out_ids[:, :k] = allowed_ids[top]
+    return out_distances, out_ids
+
+def _training_sample(vectors: np.ndarray, size: int) -> np.ndarray:
+    """Random subset of vectors for training, without replacement"""
+    if size >= len(vectors):
+        return vectors
+    rows = np.random.default_rng(0).choice(len(vectors), size=size, replace=False)
+    return vectors[np.sort(rows)]
@@ -0,0 +1,72 @@
+"""
+Recall@k and queries-per-second of the RAG index tiers against flat search
+
+Usage:
+    python benchmarks/ann_bench.py --vectors 200000 --dim 128 --queries 1000 --k 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from utils.vector_index import build_index
+
+
+def clustered_vectors(n: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Gaussian blobs, closer to real embedding distributions than uniform noise"""
+    centers = rng.normal(size=(clusters, dim)).astype('float32')
+    labels = rng.integers(0, clusters, size=n)
+    return centers[labels] + 0.3 * rng.normal(size=(n, dim)).astype('float32')
+
+
+def timed_search(index, queries: np.ndarray, k: int):
+    start = time.perf_counter()
+    _, ids = index.search(queries, k)
+    return ids, len(queries) / (time.perf_counter() - start)
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray) -> float:
+    hits = sum(len(np.intersect1d(t, f)) for t, f in zip(truth, found))
+    return hits / truth.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vectors', type=int, default=200000)
+    parser.add_argument('--dim', type=int, default=128)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    data = clustered_vectors(args.vectors + args.queries, args.dim, 256, rng)
+    corpus, queries = data[:args.vectors], data[args.vectors:]
+
+    flat = build_index(corpus, index_type='flat')
+    truth, flat_qps = timed_search(flat, queries, args.k)
+    print(f"{'index':<22}{'build s':>9}{'recall@' + str(args.k):>12}{'QPS':>12}")
+    print(f"{'flat':<22}{'-':>9}{1.0:>12.3f}{flat_qps:>12.0f}")
+
+    start = time.perf_counter()
+    ivf = build_index(corpus, index_type='ivf')
+    ivf_build = time.perf_counter() - start
+    for nprobe in (4, 16, 64):
+        ivf.nprobe = nprobe
+        ids, qps = timed_search(ivf, queries, args.k)
+        print(f"{'ivf nprobe=' + str(nprobe):<22}{ivf_build:>9.1f}{recall_at_k(truth, ids):>12.3f}{qps:>12.0f}")
+
+    start = time.perf_counter()
+    hnsw = build_index(corpus, index_type='hnsw')
+    hnsw_build = time.perf_counter() - start
+    for ef_search in (16, 64, 256):
+        hnsw.hnsw.efSearch = ef_search
+        ids, qps = timed_search(hnsw, queries, args.k)
+        print(f"{'hnsw efSearch=' + str(ef_search):<22}{hnsw_build:>9.1f}{recall_at_k(truth, ids):>12.3f}{qps:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
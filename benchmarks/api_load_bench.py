@@ -0,0 +1,146 @@
+"""
+Load test of the HTTP API against local stubs: the GitHub stub server and the
+fake LLM stand in for GitHub, Gemini and OpenAI, so no network access is needed
+
+Usage:
+    python benchmarks/api_load_bench.py --requests 200 --concurrency 32 --llm-delay 0.2
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from stub_github import StubGithubServer
+
+RESUME = (
+    "Jane Doe - Backend Engineer\n"
+    "Experience: Built Python and FastAPI services on PostgreSQL, deployed with Docker and Kubernetes.\n"
+    "Projects: Streaming ETL with Spark and Kafka.\n"
+    "Education: BSc Computer Science"
+)
+JD = "We are hiring a backend engineer with Python, SQL, Docker, Kubernetes and AWS experience."
+ANSWER = ('{"JD Match": "72%", "MissingKeywords": ["AWS"], "Profile Summary": "Strong backend profile.", '
+          '"ProjectMatch": "70%", "WorkExpMatch": "75%", "EduMatch": "80%", '
+          '"GitHub Analysis": {"RecommendedProjects": [], "OverallGitHubScore": "6/10", "Recommendations": "Pin work."}}')
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def serve(app, port):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def request_for(endpoint, i, username, owner_id):
+    # Every request carries a distinct resume so LLM response caching does not short-circuit the load
+    resume = f"{RESUME}\nCandidate #{i}"
+    if endpoint == 'analyze':
+        return 'POST', '/analyze', {'resume_text': resume, 'job_description': JD, 'github_username': username}
+    if endpoint == 'batch-analyze':
+        resumes = [{'id': j, 'resume_text': f"{resume}.{j}"} for j in range(4)]
+        return 'POST', '/batch-analyze', {'job_description': JD, 'resumes': resumes}
+    if endpoint == 'github-profile':
+        return 'GET', f'/github-profile/{username}', None
+    if endpoint == 'rag-index':
+        return 'POST', '/rag-index', {'resume_text': resume, 'job_description': JD, 'owner_id': f"load-{i}"}
+    return 'POST', '/rag-query', {'owner_id': owner_id, 'question': f"Which databases does the candidate know? ({i})"}
+
+
+async def run_endpoint(base_url, endpoint, total, concurrency, username, owner_id):
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    latencies, statuses = [], {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        async def one(i):
+            method, path, body = request_for(endpoint, i, username, owner_id)
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+    return latencies, statuses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--llm-delay', type=float, default=0.2, help="Fake model latency per call")
+    parser.add_argument('--github-latency', type=float, default=0.02)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--endpoints', default="analyze,batch-analyze,github-profile,rag-index,rag-query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubGithubServer(repo_count=12, latency=args.github_latency) as stub:
+        # Configuration is read at import time, so point everything at the stubs first
+        os.environ.update({
+            'GITHUB_API_URL': stub.url,
+            'SMART_ATS_CACHE_DIR': tmp,
+            'GOOGLE_API_KEY': os.getenv('GOOGLE_API_KEY', 'stub'),
+            'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY', 'stub'),
+            'ATS_ENGINE': 'llm',
+            'RAG_EMBEDDING_BACKEND': 'hashing',
+        })
+        from fake_llm import FakeLLM
+        from models.llm_gateway import get_gateway
+        from utils.metrics_utils import default_metrics
+        import api
+
+        fake = FakeLLM([ANSWER], first_token_delay=args.llm_delay)
+        for provider in ('gemini', 'openai'):
+            get_gateway().register_provider(provider, lambda model: fake)
+
+        server, thread = serve(api.app, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            import httpx
+
+            owner_id = httpx.post(f"{base_url}/rag-index", json={
+                'resume_text': RESUME, 'job_description': JD, 'owner_id': 'load-query'
+            }, timeout=60).json()['owner_id']
+
+            print(f"{args.requests} requests per endpoint, concurrency {args.concurrency}, "
+                  f"fake LLM {args.llm_delay}s, GitHub stub {args.github_latency}s")
+            print(f"{'endpoint':<16}{'req/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  statuses")
+            for endpoint in args.endpoints.split(','):
+                latencies, statuses, elapsed = asyncio.run(
+                    run_endpoint(base_url, endpoint, args.requests, args.concurrency, stub.username, owner_id)
+                )
+                print(f"{endpoint:<16}{args.requests / elapsed:>8.1f}"
+                      f"{statistics.median(latencies) * 1000:>10.1f}{percentile(latencies, 95) * 1000:>10.1f}"
+                      f"{max(latencies) * 1000:>10.1f}  {dict(sorted(statuses.items()))}")
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    counters = default_metrics.snapshot()['counters']
+    print(f"upstream: {fake.calls} model call(s), {stub.request_count} GitHub request(s), "
+          f"{counters.get('api.timeouts', 0)} timeout(s)")
+
+
+if __name__ == "__main__":
+    main()
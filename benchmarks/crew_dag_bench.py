@@ -0,0 +1,85 @@
+"""
+Sequential vs dependency-scheduled crew execution, with stub agents
+
+Stub tasks sleep instead of calling an LLM. The job application crew's
+declared dependencies are run as-is, and with a GitHub analysis that needs no
+upstream output, so it can run alongside the research. A last run fails at
+interview preparation and is rerun from its checkpoints.
+
+Usage:
+    python benchmarks/crew_dag_bench.py --delay 0.5 --workers 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from crew.checkpoints import CheckpointStore
+from crew.dag_scheduler import DAGScheduler
+from utils.cache_utils import SQLiteCache
+
+
+@dataclass(eq=False)
+class StubTask:
+    """Task with a CrewAI-style context list and a fixed run time"""
+    name: str
+    delay: float
+    context: List[Any] = field(default_factory=list)
+    fail: bool = False
+
+
+def stub_runner(task, upstream, inputs):
+    time.sleep(task.delay)
+    if task.fail:
+        raise RuntimeError("stub failure")
+    return f"{task.name}({', '.join(upstream)})"
+
+
+def crew_graph(delay: float, github_needs_research: bool) -> dict:
+    research = StubTask('research', delay)
+    profiling = StubTask('profiling', delay, [research])
+    github = StubTask('github_analysis', 2 * delay, [research, profiling] if github_needs_research else [])
+    strategy = StubTask('resume_strategy', delay, [research, profiling, github])
+    interview = StubTask('interview_prep', delay, [research, profiling, github, strategy])
+    return {task.name: task for task in (research, profiling, github, strategy, interview)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--delay', type=float, default=0.5, help="Seconds per stub task")
+    parser.add_argument('--workers', type=int, default=3)
+    args = parser.parse_args()
+
+    for label, needs_research in (("declared context", True), ("independent GitHub analysis", False)):
+        print(f"{label}:")
+        for workers in (1, args.workers):
+            scheduler = DAGScheduler(crew_graph(args.delay, needs_research), max_workers=workers, runner=stub_runner)
+            result = scheduler.kickoff()
+            stages = " -> ".join("(" + ", ".join(stage) + ")" for stage in scheduler.stages)
+            print(f"  {workers} worker(s): {result.total:.2f}s  {stages}")
+        for name, timing in result.timings.items():
+            print(f"    {name:<16} start {timing.start:5.2f}s  ran {timing.seconds:5.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CheckpointStore(SQLiteCache(os.path.join(tmp, 'checkpoints.sqlite')))
+        tasks = crew_graph(args.delay, True)
+        tasks['interview_prep'].fail = True
+        scheduler = DAGScheduler(tasks, max_workers=args.workers, runner=stub_runner, checkpoints=store)
+        start = time.perf_counter()
+        try:
+            scheduler.kickoff({'company': "Acme", 'candidate': "jane"})
+        except RuntimeError:
+            pass
+        print(f"failed run: {time.perf_counter() - start:.2f}s")
+        tasks['interview_prep'].fail = False
+        result = scheduler.kickoff({'company': "Acme", 'candidate': "jane"})
+        print(f"rerun: {result.total:.2f}s, resumed {', '.join(result.resumed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Local fake LLM provider that emits chunks with delays
+
+Registers with the LLM gateway like any real provider, so streaming, caching
+and latency behaviour can be exercised without network access:
+
+    get_gateway().register_provider("fake", lambda model: FakeLLM())
+"""
+import os
+import sys
+import threading
+import time
+from typing import Iterator, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from models.llm_gateway import LLMProvider
+
+
+class FakeLLM(LLMProvider):
+    """Provider returning a fixed answer split into timed chunks"""
+
+    def __init__(self, tokens: Optional[List[str]] = None, first_token_delay: float = 0.3, token_delay: float = 0.02,
+                 prompt_token_delay: float = 0.0):
+        self.tokens = tokens or [f"token{i} " for i in range(50)]
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        # Prefill cost per prompt token (about four characters), so longer prompts answer later
+        self.prompt_token_delay = prompt_token_delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def stream(self, prompt, **params) -> Iterator[str]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.first_token_delay + self.prompt_token_delay * len(prompt) / 4)
+        for i, token in enumerate(self.tokens):
+            if i:
+                time.sleep(self.token_delay)
+            yield token
+
+    def generate(self, prompt, **params) -> str:
+        return "".join(self.stream(prompt, **params))
@@ -0,0 +1,55 @@
+"""
+Compare serial, concurrent and cache-revalidated GitHub fetching against the
+local stub server
+
+Usage:
+    python benchmarks/github_fetch_bench.py --repos 80 --latency 0.02 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from stub_github import StubGithubServer
+from utils.cache_utils import SQLiteCache
+from utils.github_utils import GithubRepoFetcher
+
+
+def timed_fetch(url: str, username: str, workers: int, cache: SQLiteCache):
+    fetcher = GithubRepoFetcher(username, max_workers=workers, api_url=url, cache=cache)
+    start = time.perf_counter()
+    data = fetcher.fetch_repo_info()
+    return data, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repos', type=int, default=80)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubGithubServer(repo_count=args.repos, latency=args.latency) as stub:
+        serial, serial_time = timed_fetch(stub.url, stub.username, 1, SQLiteCache(os.path.join(tmp, 'serial.sqlite')))
+        cache = SQLiteCache(os.path.join(tmp, 'concurrent.sqlite'))
+        concurrent, concurrent_time = timed_fetch(stub.url, stub.username, args.workers, cache)
+        cold_requests = stub.request_count
+        warm, warm_time = timed_fetch(stub.url, stub.username, args.workers, cache)
+        not_modified = stub.not_modified_count
+
+    assert serial == concurrent == warm, "fetch strategies returned different github_data"
+    assert len(serial['repositories']) == sum(1 for i in range(args.repos) if i % 5 != 4), "pagination dropped repos"
+    print(f"repos={args.repos} latency={args.latency}s")
+    print(f"serial:     {serial_time:.3f}s")
+    print(f"concurrent: {concurrent_time:.3f}s ({args.workers} workers)")
+    print(f"speedup:    {serial_time / concurrent_time:.1f}x")
+    print(f"warm cache: {warm_time:.3f}s ({not_modified} of {stub.request_count - cold_requests} requests answered 304)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare the REST and GraphQL GitHub fetchers against the local stub server:
+requests sent and latency, cold and with a warm cache, for the same
+github_data
+
+Usage:
+    python benchmarks/github_graphql_bench.py --repos 80 250 --latency 0.05 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from stub_github import StubGithubServer
+from utils.cache_utils import SQLiteCache
+from utils.github_scheduler import GithubScheduler
+from utils.github_utils import GithubGraphQLFetcher, GithubRepoFetcher
+
+
+def timed(stub, fetcher):
+    before = stub.request_count
+    start = time.perf_counter()
+    data = fetcher.fetch_repo_info()
+    return data, time.perf_counter() - start, stub.request_count - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repos', type=int, nargs='+', default=[12, 80, 250])
+    parser.add_argument('--latency', type=float, default=0.05, help="Stub round-trip latency in seconds")
+    parser.add_argument('--node-latency', type=float, default=0.002,
+                        help="Extra GraphQL server time per repository returned")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent REST requests")
+    args = parser.parse_args()
+
+    print(f"latency={args.latency}s, {args.workers} REST workers")
+    print(f"{'repos':>6}  {'mode':<8}{'requests':>9}{'cold s':>9}{'warm requests':>15}{'warm s':>9}")
+    for repo_count in args.repos:
+        with tempfile.TemporaryDirectory() as tmp, \
+                StubGithubServer(repo_count=repo_count, latency=args.latency,
+                                 graphql_node_latency=args.node_latency) as stub:
+            scheduler = GithubScheduler(tokens=["stub-token"], max_concurrency=args.workers)
+            rest_cache = SQLiteCache(os.path.join(tmp, 'rest.sqlite'))
+            graphql_cache = SQLiteCache(os.path.join(tmp, 'graphql.sqlite'))
+            results = {}
+            for mode, make in (
+                ('rest', lambda: GithubRepoFetcher(stub.username, max_workers=args.workers, api_url=stub.url,
+                                                   cache=rest_cache, scheduler=scheduler)),
+                ('graphql', lambda: GithubGraphQLFetcher(stub.username, api_url=stub.url,
+                                                         cache=graphql_cache, scheduler=scheduler)),
+            ):
+                cold, cold_time, cold_requests = timed(stub, make())
+                warm, warm_time, warm_requests = timed(stub, make())
+                assert cold == warm, f"{mode} warm fetch returned different github_data"
+                results[mode] = cold
+                print(f"{repo_count:>6}  {mode:<8}{cold_requests:>9}{cold_time:>9.3f}{warm_requests:>15}{warm_time:>9.3f}")
+        assert results['rest'] == results['graphql'], "REST and GraphQL returned different github_data"
+
+
+if __name__ == "__main__":
+    main()
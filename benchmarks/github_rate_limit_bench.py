@@ -0,0 +1,95 @@
+"""
+Rate-limit-aware GitHub fetching against a stub server that enforces a
+per-token budget and throws in secondary rate limits
+
+The same profiles are fetched with one token and with a pool of tokens.
+With one token the scheduler waits for budget resets instead of losing
+languages and READMEs to 403s; with the pool it rotates and does not wait.
+429s are retried after Retry-After. Queue waits by priority show profile
+and repository requests going ahead of README requests.
+
+Usage:
+    python benchmarks/github_rate_limit_bench.py --profiles 4 --limit 40 --window 2 --tokens 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from stub_github import StubGithubServer
+from utils.cache_utils import SQLiteCache
+from utils.github_scheduler import PRIORITY_NAMES, GithubScheduler
+from utils.github_utils import GithubRepoFetcher
+from utils.metrics_utils import default_metrics
+
+
+def complete(data) -> bool:
+    """Whether a profile was fetched with every repository's languages and README"""
+    return bool(data) and all(
+        repo['languages'] and repo['readme'] != "No README available" for repo in data['repositories']
+    )
+
+
+def run(args, tokens, tmp):
+    default_metrics.reset()
+    with StubGithubServer(repo_count=args.repos, latency=args.latency, rate_limit=args.limit,
+                          rate_window=args.window, throttle_every=args.throttle_every,
+                          retry_after=args.retry_after) as stub:
+        scheduler = GithubScheduler(tokens=tokens, max_concurrency=args.concurrency, backoff_base=0.1,
+                                    max_wait=args.window * 2)
+
+        def fetch(i):
+            # A cache per fetch, so every profile costs its full request count
+            cache = SQLiteCache(os.path.join(tmp, f"{len(tokens)}-{i}.sqlite"))
+            fetcher = GithubRepoFetcher(stub.username, api_url=stub.url, cache=cache, scheduler=scheduler)
+            return fetcher.fetch_repo_info()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.profiles) as executor:
+            results = list(executor.map(fetch, range(args.profiles)))
+        elapsed = time.perf_counter() - start
+
+        snapshot = default_metrics.snapshot()
+        counters, observations = snapshot['counters'], snapshot['observations']
+        print(f"{len(tokens)} token(s): {elapsed:.2f}s, {sum(map(complete, results))}/{args.profiles} complete profiles")
+        print(f"    requests per token: {dict(sorted(stub.token_requests.items()))}")
+        print(f"    403 rate limited: {stub.rate_limited_count}, 429 throttled: {stub.throttled_count}, "
+              f"waits for reset: {counters.get('github.rate_limit_waits', 0):.0f}, "
+              f"backoffs: {counters.get('github.backoffs', 0):.0f}")
+        waits = ", ".join(
+            f"{name} {observations[f'github.wait.{name}']['avg'] * 1000:.0f}ms"
+            for name in PRIORITY_NAMES.values() if f'github.wait.{name}' in observations
+        )
+        print(f"    average queue wait: {waits}")
+        for resource, budget in scheduler.budget().items():
+            print(f"    {resource} budget left: {budget['remaining']}/{budget['limit']} "
+                  f"({budget['exhausted']} token(s) exhausted)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--profiles', type=int, default=4)
+    parser.add_argument('--repos', type=int, default=12)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--limit', type=int, default=40, help="Requests per token per window")
+    parser.add_argument('--window', type=float, default=2, help="Rate-limit window in seconds")
+    parser.add_argument('--tokens', type=int, default=3)
+    parser.add_argument('--throttle-every', type=int, default=25, help="Answer every Nth request with 429")
+    parser.add_argument('--retry-after', type=float, default=0.2)
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.profiles} profiles of {args.repos} repos, budget {args.limit} requests per {args.window}s "
+          f"per token, 429 on every {args.throttle_every}th request")
+    with tempfile.TemporaryDirectory() as tmp:
+        run(args, ["stub-token-1"], tmp)
+        run(args, [f"stub-token-{i + 1}" for i in range(args.tokens)], tmp)
+
+
+if __name__ == "__main__":
+    main()
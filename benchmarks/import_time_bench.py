@@ -0,0 +1,135 @@
+"""
+Import time of app modules, measured in fresh interpreters
+
+Each module is imported in a new process (so nothing is already cached in
+sys.modules) several times; the median is compared with a budget and the
+slowest nested imports are listed. Exits non-zero when a module is over
+budget, so it can guard against regressions such as building agents or
+tools at import time.
+
+Core modules must not load streamlit; the bench fails when one does. With
+--workers, each module is also imported in freshly spawned pool workers, the
+way batch screening and the HTTP API start their workers, and the cold start
+is compared with a worker that only imports streamlit.
+
+Usage:
+    python benchmarks/import_time_bench.py
+    python benchmarks/import_time_bench.py --max-ms 150 crew.job_application_crew
+    python benchmarks/import_time_bench.py --workers 4 pipeline batch
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+# Median import budget in milliseconds by module; the core modules pull in numpy, requests or PyPDF2
+DEFAULT_BUDGETS_MS = {
+    'crew.job_application_crew': 150,
+    'agents.registry': 150,
+    'pipeline': 600,
+    'batch': 400,
+    'models.gemini': 150,
+    'utils.pdf_utils': 200,
+    'utils.github_utils': 250,
+}
+# UI modules, which are expected to load streamlit
+UI_MODULES = {'main', 'components.display', 'components.sidebar', 'components.session', 'streamlit'}
+
+MEASURE = (
+    "import sys, time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start); print('streamlit' in sys.modules)"
+)
+
+
+def measure(module: str) -> tuple:
+    """Seconds to import module in a fresh interpreter, whether streamlit got loaded, and the -X importtime report"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', MEASURE.format(module=module)],
+        cwd=APP_DIR, capture_output=True, text=True, env={**os.environ, 'PYTHONPATH': APP_DIR}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    seconds, loaded_streamlit = result.stdout.strip().splitlines()[-2:]
+    return float(seconds), loaded_streamlit == 'True', result.stderr
+
+
+def _import_in_worker(module: str) -> float:
+    """Import a module inside a pool worker and return the seconds it took"""
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    start = time.perf_counter()
+    __import__(module)
+    return time.perf_counter() - start
+
+
+def measure_workers(module: str, workers: int) -> tuple:
+    """Seconds from creating a spawn pool to every worker having imported module, and the median import time"""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        # Leaving the pool waits for every spawned worker, including any that started after the tasks ran out
+        imports = list(pool.map(_import_in_worker, [module] * workers))
+    return time.perf_counter() - start, statistics.median(imports)
+
+
+def parse_report(report: str) -> list:
+    """(cumulative microseconds, module) rows of an -X importtime report"""
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+def startup_modules() -> set:
+    """Modules the interpreter imports before running any code (site, .pth hooks)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'pass'], capture_output=True, text=True)
+    return {name for _, name in parse_report(result.stderr)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_BUDGETS_MS))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, help="Budget for the median import time, "
+                        "defaults to DEFAULT_BUDGETS_MS or 150 ms")
+    parser.add_argument('--top', type=int, default=5, help="Slowest nested imports to list")
+    parser.add_argument('--workers', type=int, default=0, help="Also time cold starts of this many spawned workers")
+    args = parser.parse_args()
+
+    startup = startup_modules()
+    failed = []
+    for module in args.modules:
+        samples, report, loaded_streamlit = [], "", False
+        for _ in range(args.repeats):
+            seconds, loaded_streamlit, report = measure(module)
+            samples.append(seconds)
+        median = 1000 * statistics.median(samples)
+        budget = args.max_ms or DEFAULT_BUDGETS_MS.get(module, 150.0)
+        status = "ok" if median <= budget else "OVER BUDGET"
+        if loaded_streamlit and module not in UI_MODULES:
+            status += ", LOADS STREAMLIT"
+        print(f"{module:<32}{median:>8.1f} ms  (budget {budget:.0f} ms) {status}")
+        nested = sorted(row for row in parse_report(report) if row[1] not in startup and row[1] != module)
+        for cumulative, name in nested[::-1][:args.top]:
+            print(f"    {cumulative / 1000:>8.1f} ms  {name}")
+        if status != "ok":
+            failed.append(module)
+
+    if args.workers:
+        print(f"\ncold start of {args.workers} spawned workers (pool creation to every worker ready)")
+        for module in ['streamlit'] + [m for m in args.modules if m != 'streamlit']:
+            total, imported = measure_workers(module, args.workers)
+            print(f"{module:<32}{1000 * total:>8.1f} ms  (import {1000 * imported:.1f} ms per worker)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Build time, size and query latency of the candidate inverted index
+
+Usage:
+    python benchmarks/inverted_index_bench.py --docs 100000 --words 300
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from utils.inverted_index import InvertedIndex
+from utils.skill_taxonomy import get_taxonomy
+
+QUERIES = [
+    'Python AND "Apache Spark" AND NOT intern',
+    'k8s AND (AWS OR GCP)',
+    'Java OR Scala',
+    'React AND TypeScript AND NOT senior',
+    'PostgreSQL',
+]
+
+
+def synthetic_resumes(n: int, words: int, rng: random.Random) -> list:
+    """Resumes drawn from a Zipf-like vocabulary with a handful of skill mentions each"""
+    vocabulary = [f"w{i}" for i in range(20000)] + ['intern', 'senior', 'lead', 'engineer', 'developer']
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    skills = get_taxonomy().names()
+    resumes = []
+    for _ in range(n):
+        tokens = rng.choices(vocabulary, weights=weights, k=words)
+        tokens += rng.sample(skills, rng.randint(3, 12))
+        rng.shuffle(tokens)
+        resumes.append(' '.join(tokens))
+    return resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=100000)
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    resumes = synthetic_resumes(args.docs, args.words, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = InvertedIndex(os.path.join(tmp, 'candidates.sqlite'))
+        start = time.perf_counter()
+        for offset in range(0, len(resumes), args.batch):
+            index.add_documents(
+                (f"resume-{i}", text, {}) for i, text in enumerate(resumes[offset:offset + args.batch], offset)
+            )
+        build = time.perf_counter() - start
+        stats = index.stats()
+        print(f"indexed {stats['documents']} docs in {build:.1f}s "
+              f"({stats['terms']} terms, {stats['posting_bytes'] / 1e6:.1f} MB of postings)")
+
+        start = time.perf_counter()
+        index.add_document("resume-new", resumes[0])
+        print(f"incremental add: {1000 * (time.perf_counter() - start):.2f} ms")
+
+        print(f"{'query':<46}{'hits':>7}{'cold ms':>9}{'match ms':>10}{'top10 ms':>10}")
+        for query in QUERIES:
+            index._cache.clear()
+            start = time.perf_counter()
+            hits = len(index.match(query))
+            cold = time.perf_counter() - start
+            match_times, search_times = [], []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                index.match(query)
+                match_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                index.search(query, top_k=10)
+                search_times.append(time.perf_counter() - start)
+            print(f"{query:<46}{hits:>7}{1000 * cold:>9.2f}"
+                  f"{1000 * statistics.median(match_times):>10.3f}{1000 * statistics.median(search_times):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
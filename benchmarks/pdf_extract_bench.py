@@ -0,0 +1,140 @@
+"""
+PDF text extraction: the old concatenation loop vs the page-streaming engine
+
+Generates synthetic text PDFs, then times a large document serially, with
+pages fanned out to the process pool and from the content-hash cache, and a
+batch of resume-sized files extracted in threads vs in a process pool.
+
+Usage:
+    python benchmarks/pdf_extract_bench.py --pages 200 --files 64
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import PyPDF2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from utils.cache_utils import SQLiteCache
+from utils import pdf_utils
+from utils.metrics_utils import default_metrics
+
+WORDS = ("python engineer built data pipelines spark kubernetes aws latency reduced "
+         "team led migration services api design testing deployment monitoring").split()
+
+
+def make_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """Minimal multi-page PDF with Helvetica text, written by hand"""
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = len(objects) + 2 * pages + 1
+    page_ids = []
+    for number in range(pages):
+        lines = []
+        for line in range(lines_per_page):
+            words = " ".join(WORDS[(seed + number * 7 + line * 3 + k) % len(WORDS)] for k in range(10))
+            lines.append(f"({words}) Tj 0 -14 Td".encode())
+        stream = b"BT /F1 10 Tf 40 780 Td " + b" ".join(lines) + b" ET"
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content, font)
+        ))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages))
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def legacy_extract(data: bytes) -> str:
+    """The previous implementation: repeated string concatenation over reader.pages"""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in reader.pages:
+        text += str(page.extract_text())
+    return text
+
+
+def timed(fn, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=200, help="Pages in the large document")
+    parser.add_argument('--files', type=int, default=64, help="Resume-sized files in the batch")
+    parser.add_argument('--file-pages', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Isolate the benchmark from the real text cache
+        pdf_utils._cache = SQLiteCache(os.path.join(tmp, 'pdf_text.sqlite'))
+        large = make_pdf(args.pages)
+        print(f"large document: {args.pages} pages, {len(large) / 1e6:.1f} MB, {args.workers} workers")
+        print(f"{'mode':<28}{'seconds':>9}{'peak MB':>9}")
+
+        reference, elapsed, peak = timed(legacy_extract, large)
+        print(f"{'legacy +=':<28}{elapsed:>9.2f}{peak:>9.1f}")
+
+        _, elapsed, peak = timed(lambda: "".join(p.text for p in pdf_utils.iter_pdf_pages(large, parallel=False)))
+        print(f"{'page stream, serial':<28}{elapsed:>9.2f}{peak:>9.1f}")
+
+        pdf_utils.get_pdf_pool()  # start workers outside the timing
+        text, elapsed, peak = timed(pdf_utils.read_pdf_text, large)
+        assert text == reference, "parallel extraction changed the text"
+        print(f"{'page fan-out (cold cache)':<28}{elapsed:>9.2f}{peak:>9.1f}")
+
+        _, elapsed, peak = timed(pdf_utils.read_pdf_text, large)
+        print(f"{'content-hash cache hit':<28}{elapsed:>9.4f}{peak:>9.1f}")
+
+        page = default_metrics.snapshot()['observations']['pdf.page']
+        print(f"per-page: avg {1000 * page['avg']:.1f} ms, max {1000 * page['max']:.1f} ms over {page['count']} pages")
+
+        files = [make_pdf(args.file_pages, seed=i) for i in range(args.files)]
+        print(f"\nbatch: {args.files} files of {args.file_pages} pages")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            list(executor.map(lambda data: pdf_utils.read_pdf_text(data, use_cache=False), files))
+        print(f"{'threads':<28}{time.perf_counter() - start:>9.2f}")
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            pool.submit(int).result()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                list(executor.map(
+                    lambda data: pdf_utils.read_pdf_text(data, use_cache=False, executor=pool), files
+                ))
+            print(f"{'process pool':<28}{time.perf_counter() - start:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Prompt size and latency of the analysis prompt before and after token budgeting
+
+Builds fixture resumes, job descriptions and GitHub profiles with long
+READMEs, then compares the previous prompt (relevant resume sections plus the
+raw GitHub data) with the budgeted one, timing both against the fake LLM with
+a per-prompt-token prefill cost.
+
+Usage:
+    python benchmarks/prompt_budget_bench.py --fixtures 20 --repos 30
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_llm import FakeLLM
+from prompts.builder import build_analysis_prompt, estimate_tokens
+from prompts.templates import github_analysis_prompt
+from utils.resume_parser import parse_resume
+
+SKILLS = ["Python", "Django", "PostgreSQL", "Kubernetes", "Docker", "AWS", "React", "TypeScript",
+          "Apache Spark", "Kafka", "Terraform", "Go", "Redis", "GraphQL", "Java", "Scala"]
+FILLER = ("improved reliability of internal services and worked with stakeholders across teams "
+          "to deliver features on schedule while mentoring junior engineers").split()
+
+README_BOILERPLATE = """
+[![Build Status](https://travis-ci.org/user/repo.svg?branch=master)](https://travis-ci.org/user/repo)
+[![License: MIT](https://img.shields.io/badge/License-MIT-yellow.svg)](https://opensource.org/licenses/MIT)
+
+## Installation
+
+```bash
+git clone https://github.com/user/repo.git
+cd repo
+pip install -r requirements.txt
+```
+
+## Contributing
+
+Pull requests are welcome. For major changes, please open an issue first to discuss what you would like to change.
+Please make sure to update tests as appropriate.
+
+## License
+
+This project is licensed under the MIT License - see the LICENSE.md file for details.
+"""
+
+JD_BOILERPLATE = """
+About us
+We are a fast-growing company on a mission to change how the world works. Our culture values ownership and curiosity.
+
+Benefits
+Competitive salary, health insurance, 401(k) matching, unlimited paid time off and a home office stipend.
+
+We are an equal opportunity employer and value diversity. All qualified applicants will receive consideration
+without regard to race, color, religion, sex, sexual orientation, gender identity or national origin.
+"""
+
+
+def sentence(rng: random.Random, skills: int = 2) -> str:
+    words = rng.sample(FILLER, 10) + rng.sample(SKILLS, skills)
+    rng.shuffle(words)
+    return " ".join(words).capitalize() + "."
+
+
+def make_resume(rng: random.Random, jobs: int = 6) -> str:
+    lines = ["Jane Doe", "jane@example.com | +1 555 123 4567 | github.com/janedoe", "",
+             "SUMMARY", " ".join(sentence(rng) for _ in range(4)), "", "EXPERIENCE"]
+    for year in range(2023, 2023 - jobs * 2, -2):
+        lines += [f"Senior Engineer at Company{year}  Jan {year - 2} - Dec {year}"]
+        lines += [f"- {sentence(rng)}" for _ in range(8)]
+    lines += ["", "PROJECTS"] + [f"- {sentence(rng, 3)}" for _ in range(10)]
+    lines += ["", "SKILLS", ", ".join(SKILLS), "", "EDUCATION", "BSc Computer Science, State University 2012",
+              "", "INTERESTS", "Hiking, chess, photography"]
+    return "\n".join(lines)
+
+
+def make_jd(rng: random.Random) -> str:
+    required = rng.sample(SKILLS, 6)
+    return (f"Senior Backend Engineer\n\nWe need an engineer experienced with {', '.join(required)}.\n"
+            + "\n".join(f"- {sentence(rng)}" for _ in range(12)) + "\n" + JD_BOILERPLATE)
+
+
+def make_github(rng: random.Random, repos: int) -> dict:
+    repositories = []
+    for i in range(repos):
+        skills = rng.sample(SKILLS, 3)
+        readme = (f"# project-{i}\n\n" + "\n".join(sentence(rng) for _ in range(rng.randint(10, 40)))
+                  + "\n\n## Usage\n\n```python\nimport project\nproject.run()\n```\n" + README_BOILERPLATE)
+        repositories.append({
+            'name': f"project-{i}",
+            'description': f"A {skills[0]} service using {skills[1]}",
+            'language': skills[0],
+            'languages': {skill: rng.randint(1000, 90000) for skill in skills},
+            'stars': rng.randint(0, 500),
+            'topics': [skill.lower() for skill in skills],
+            'readme': readme,
+        })
+    return {'username': "janedoe", 'repositories': repositories}
+
+
+def legacy_prompt(text: str, jd: str, github_data: dict) -> str:
+    """The previous build_analysis_prompt: relevant resume sections and the raw GitHub data"""
+    text = parse_resume(text).text_for() or text
+    return github_analysis_prompt.format(text=text, jd=jd, github_data=github_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fixtures', type=int, default=20)
+    parser.add_argument('--repos', type=int, default=30)
+    parser.add_argument('--prefill-ms', type=float, default=0.05, help="Fake LLM delay per prompt token")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    fixtures = [(make_resume(rng), make_jd(rng), make_github(rng, args.repos)) for _ in range(args.fixtures)]
+    llm = FakeLLM(["{}"], first_token_delay=0.05, prompt_token_delay=args.prefill_ms / 1000)
+
+    results = {}
+    for name, build in (('legacy', legacy_prompt), ('budgeted', lambda *a: build_analysis_prompt(*a).prompt)):
+        tokens, build_times, latencies = [], [], []
+        for text, jd, github_data in fixtures:
+            start = time.perf_counter()
+            prompt = build(text, jd, github_data)
+            built = time.perf_counter()
+            llm.generate(prompt)
+            build_times.append(built - start)
+            latencies.append(time.perf_counter() - start)
+            tokens.append(estimate_tokens(prompt))
+        results[name] = tokens
+        print(f"{name:<10} tokens median {statistics.median(tokens):>7.0f} max {max(tokens):>7}  "
+              f"build {1000 * statistics.median(build_times):>6.1f} ms  "
+              f"end-to-end {1000 * statistics.median(latencies):>7.1f} ms")
+
+    reduction = 1 - sum(results['budgeted']) / sum(results['legacy'])
+    print(f"token reduction: {100 * reduction:.1f}% over {args.fixtures} fixtures with {args.repos} repositories each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Skill extraction throughput of the compiled taxonomy against per-skill regex search
+
+Usage:
+    python benchmarks/skill_matcher_bench.py --skills 10000 --resumes 10000 --baseline-sample 100
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from utils.skill_taxonomy import SKILLS_PATH, SkillTaxonomy
+
+FILLER = (
+    "designed built maintained delivered led improved reduced latency throughput team customers service "
+    "platform pipeline features release production scale reliability ownership stakeholders metrics "
+    "quarterly roadmap migration cost users data reports dashboards analysis onboarding mentoring"
+).split()
+
+
+def synthetic_skills(n: int, rng: random.Random) -> dict:
+    """The bundled skills padded with generated ones, each with a couple of aliases"""
+    with open(SKILLS_PATH, encoding='utf-8') as f:
+        skills = json.load(f)
+    syllables = ['ka', 'lo', 'mi', 'tra', 'zen', 'qu', 'ix', 'dor', 'vel', 'nu', 'sar', 'pex']
+    while len(skills) < n:
+        name = ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title()
+        if name in skills:
+            continue
+        skills[name] = {
+            'category': 'tool',
+            'weight': 0.8,
+            'aliases': [f"{name}JS", f"{name} {rng.choice(['DB', 'Cloud', 'SDK'])}"],
+        }
+    return skills
+
+
+def synthetic_resumes(n: int, skills: dict, rng: random.Random, words: int = 600) -> list:
+    """Resumes of filler words with ~2% skill mentions (canonical names or aliases)"""
+    names = list(skills)
+    resumes = []
+    for _ in range(n):
+        tokens = []
+        for _ in range(words):
+            if rng.random() < 0.02:
+                name = rng.choice(names)
+                tokens.append(rng.choice([name] + skills[name].get('aliases', [])))
+            else:
+                tokens.append(rng.choice(FILLER))
+        resumes.append(' '.join(tokens))
+    return resumes
+
+
+def regex_baseline(skills: dict):
+    """One word-bounded case-insensitive pattern per skill, the straightforward alternative"""
+    patterns = [
+        (name, re.compile(r"(?<![\w+#.])(?:" + "|".join(re.escape(a) for a in [name] + info.get('aliases', []))
+                          + r")(?![\w+#])", re.IGNORECASE))
+        for name, info in skills.items()
+    ]
+
+    def extract(text):
+        return {name for name, pattern in patterns if pattern.search(text)}
+
+    return extract
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--skills', type=int, default=10000)
+    parser.add_argument('--resumes', type=int, default=10000)
+    parser.add_argument('--baseline-sample', type=int, default=100,
+                        help="Resumes scanned by the regex baseline (extrapolated to the full pool)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    skills = synthetic_skills(args.skills, rng)
+    resumes = synthetic_resumes(args.resumes, skills, rng)
+    megabytes = sum(len(text) for text in resumes) / 1e6
+
+    start = time.perf_counter()
+    taxonomy = SkillTaxonomy(skills)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = [taxonomy.extract(text) for text in resumes]
+    elapsed = time.perf_counter() - start
+    mentions = sum(sum(counts.values()) for counts in found)
+
+    baseline = regex_baseline(skills)
+    sample = resumes[:args.baseline_sample]
+    start = time.perf_counter()
+    for text in sample:
+        baseline(text)
+    baseline_elapsed = (time.perf_counter() - start) * len(resumes) / max(1, len(sample))
+
+    print(f"{len(skills)} skills, {len(resumes)} resumes ({megabytes:.1f} MB), {mentions} skill mentions found")
+    print(f"{'matcher':<28}{'build s':>9}{'total s':>10}{'ms/resume':>11}{'MB/s':>8}")
+    print(f"{'taxonomy (Aho-Corasick)':<28}{build:>9.2f}{elapsed:>10.2f}"
+          f"{1000 * elapsed / len(resumes):>11.2f}{megabytes / elapsed:>8.1f}")
+    print(f"{'regex per skill (est.)':<28}{'-':>9}{baseline_elapsed:>10.2f}"
+          f"{1000 * baseline_elapsed / len(resumes):>11.2f}{megabytes / baseline_elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time-to-first-token versus blocking latency for RAG chat, using the fake LLM
+
+Usage:
+    python benchmarks/streaming_bench.py --tokens 200 --first-token-delay 0.5 --token-delay 0.01
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("RAG_EMBEDDING_BACKEND", "hashing")
+os.environ.setdefault("SMART_ATS_CACHE_DIR", tempfile.mkdtemp())
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_llm import FakeLLM
+from models.llm_gateway import get_gateway
+from utils.metrics_utils import default_metrics
+from utils.rag_utils import RAGSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=200)
+    parser.add_argument('--first-token-delay', type=float, default=0.5)
+    parser.add_argument('--token-delay', type=float, default=0.01)
+    args = parser.parse_args()
+
+    fake = FakeLLM([f"t{i} " for i in range(args.tokens)], args.first_token_delay, args.token_delay)
+    get_gateway().register_provider("fake", lambda model: fake)
+    rag = RAGSystem()
+    rag.llm_provider = "fake"
+    rag.process_documents("Python developer with Spark experience.", "Data engineer, Spark and Airflow.")
+    rag.create_embeddings_and_index()
+
+    start = time.perf_counter()
+    blocking = rag.chat_with_rag("Which skills match the job?")
+    blocking_time = time.perf_counter() - start
+
+    default_metrics.reset()
+    streamed = "".join(rag.chat_with_rag_stream("Which skills match?"))
+    observations = default_metrics.snapshot()['observations']
+
+    assert streamed == blocking, "streaming and blocking answers differ"
+    print(f"blocking:  first output after {blocking_time:.3f}s")
+    print(f"streaming: first token after {observations['rag.ttft']['last']:.3f}s, "
+          f"complete after {observations['rag.total']['last']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Local stub of the GitHub REST API used by the benchmarks
+
+Serves deterministic user, repository, language and README payloads with a
+configurable per-request latency so fetch strategies can be compared without
+touching the real API. Repository listings are paginated with Link headers
+and every response carries an ETag honoured through If-None-Match.
+
+With rate_limit set, each token (Authorization header) gets that many
+requests per rate_window seconds, reported in X-RateLimit-* headers and
+answered with 403 once spent; 304 responses are free, as on GitHub. With
+throttle_every set, every Nth request gets a 429 with Retry-After, like
+GitHub's secondary rate limits.
+
+POST /graphql answers the profile query of GithubGraphQLFetcher with the same
+data, taking graphql_node_latency longer per repository returned.
+"""
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def make_repos(username: str, count: int) -> List[Dict[str, Any]]:
+    """Build deterministic repository payloads, every fifth one a fork"""
+    return [
+        {
+            'name': f"repo-{i}",
+            'description': f"Project number {i}" if i % 3 else None,
+            'fork': i % 5 == 4,
+            'stargazers_count': i * 3,
+            'forks_count': i,
+            'language': 'Python' if i % 2 else 'Go',
+            'html_url': f"https://github.com/{username}/repo-{i}",
+            'topics': ['ml', 'api'] if i % 2 else [],
+        }
+        for i in range(count)
+    ]
+
+
+class StubGithubServer:
+    """Threaded HTTP server emulating the GitHub endpoints the fetchers use"""
+
+    def __init__(self, username: str = 'octo', repo_count: int = 40, latency: float = 0.02,
+                 rate_limit: Optional[int] = None, rate_window: float = 3600, throttle_every: int = 0,
+                 retry_after: float = 1, graphql_node_latency: float = 0.002):
+        self.username = username
+        self.repos = make_repos(username, repo_count)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.graphql_node_latency = graphql_node_latency
+        self.request_count = 0
+        self.graphql_count = 0
+        self.not_modified_count = 0
+        self.rate_limited_count = 0
+        self.throttled_count = 0
+        # Requests that counted against each token's budget
+        self.token_requests = Counter()
+        self._windows: Dict[tuple, list] = {}
+        self._checked = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def route(self, path: str, headers) -> tuple:
+        """Return (status, body, content_type, extra_headers) for a request path"""
+        parsed = urlparse(path)
+        query = parse_qs(parsed.query)
+        path = parsed.path
+        repos_prefix = f"/repos/{self.username}/"
+        if path == f"/users/{self.username}":
+            body = {'name': 'Octo Cat', 'bio': 'Stub user', 'followers': 10,
+                    'following': 2, 'public_repos': len(self.repos)}
+            return 200, json.dumps(body), 'application/json', {}
+        if path == f"/users/{self.username}/repos":
+            per_page = int(query.get('per_page', ['30'])[0])
+            page = int(query.get('page', ['1'])[0])
+            start = (page - 1) * per_page
+            extra = {}
+            if start + per_page < len(self.repos):
+                extra['Link'] = f'<{self.url}{path}?per_page={per_page}&page={page + 1}>; rel="next"'
+            return 200, json.dumps(self.repos[start:start + per_page]), 'application/json', extra
+        if path.startswith(repos_prefix) and path.endswith('/languages'):
+            name = path[len(repos_prefix):-len('/languages')]
+            index = int(name.split('-')[-1])
+            return 200, json.dumps({'Python': 1000 + index, 'Shell': 100}), 'application/json', {}
+        if path.startswith(repos_prefix) and path.endswith('/readme'):
+            name = path[len(repos_prefix):-len('/readme')]
+            return 200, f"# {name}\n\nStub README for {name}.\n", 'text/plain', {}
+        return 404, json.dumps({'message': 'Not Found'}), 'application/json', {}
+
+    def graphql(self, body: Dict[str, Any]) -> tuple:
+        """Return (status, body, content_type, extra_headers) for a GraphQL profile query"""
+        query, variables = body.get('query', ''), body.get('variables') or {}
+        if variables.get('login') != self.username:
+            payload = {'data': {'user': None}, 'errors': [{'type': 'NOT_FOUND', 'message': 'Could not resolve user'}]}
+            return 200, json.dumps(payload), 'application/json', {}
+        page_size = int(re.search(r'repositories\(first: (\d+)', query).group(1))
+        start = int(variables.get('cursor') or 0)
+        page = self.repos[start:start + page_size]
+        readmes = re.findall(r'(\w+): object\(expression: "HEAD:([^"]+)"\)', query)
+        time.sleep(self.graphql_node_latency * len(page))
+        nodes = []
+        for repo in page:
+            index = int(repo['name'].split('-')[-1])
+            node = {
+                'name': repo['name'],
+                'description': repo['description'],
+                'isFork': repo['fork'],
+                'stargazerCount': repo['stargazers_count'],
+                'forkCount': repo['forks_count'],
+                'url': repo['html_url'],
+                'primaryLanguage': {'name': repo['language']},
+                'languages': {'edges': [{'size': 1000 + index, 'node': {'name': 'Python'}},
+                                        {'size': 100, 'node': {'name': 'Shell'}}]},
+                'repositoryTopics': {'nodes': [{'topic': {'name': topic}} for topic in repo['topics']]},
+            }
+            for alias, path in readmes:
+                node[alias] = {'text': f"# {repo['name']}\n\nStub README for {repo['name']}.\n"} \
+                    if path == "README.md" else None
+            nodes.append(node)
+        end = start + len(page)
+        user = {
+            'name': 'Octo Cat', 'bio': 'Stub user',
+            'followers': {'totalCount': 10}, 'following': {'totalCount': 2},
+            'repositories': {
+                'totalCount': len(self.repos),
+                'pageInfo': {'hasNextPage': end < len(self.repos), 'endCursor': str(end)},
+                'nodes': nodes,
+            },
+        }
+        return 200, json.dumps({'data': {'user': user}}), 'application/json', {}
+
+    def limit(self, token: str, resource: str = 'core') -> tuple:
+        """Check a request against the token's budget; return (status or None, rate-limit headers)"""
+        with self._lock:
+            self._checked += 1
+            if self.throttle_every and self._checked % self.throttle_every == 0:
+                self.throttled_count += 1
+                return 429, {'Retry-After': str(self.retry_after)}
+            if self.rate_limit is None:
+                return None, {}
+            now = time.time()
+            window = self._windows.get((token, resource))
+            if window is None or now >= window[0]:
+                window = self._windows[(token, resource)] = [math.ceil(now + self.rate_window), 0]
+            headers = {'X-RateLimit-Limit': str(self.rate_limit), 'X-RateLimit-Reset': str(window[0]),
+                       'X-RateLimit-Resource': resource}
+            if window[1] >= self.rate_limit:
+                self.rate_limited_count += 1
+                return 403, {**headers, 'X-RateLimit-Remaining': '0'}
+            window[1] += 1
+            self.token_requests[token] += 1
+            return None, {**headers, 'X-RateLimit-Remaining': str(self.rate_limit - window[1])}
+
+    def _refund(self, token: str) -> None:
+        """Give back the budget of a request answered 304 Not Modified"""
+        with self._lock:
+            if self.rate_limit is not None and (token, 'core') in self._windows:
+                self._windows[(token, 'core')][1] -= 1
+                self.token_requests[token] -= 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+                token = self.headers.get('Authorization', 'anonymous')
+                limited, rate_headers = stub.limit(token)
+                if limited is not None:
+                    message = ("API rate limit exceeded" if limited == 403
+                               else "You have exceeded a secondary rate limit")
+                    status, body, content_type, extra = limited, json.dumps({'message': message}), 'application/json', {}
+                else:
+                    status, body, content_type, extra = stub.route(self.path, self.headers)
+                extra = {**extra, **rate_headers}
+                payload = body.encode('utf-8')
+                etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    with stub._lock:
+                        stub.not_modified_count += 1
+                    stub._refund(token)
+                    if 'X-RateLimit-Remaining' in extra:
+                        extra['X-RateLimit-Remaining'] = str(int(extra['X-RateLimit-Remaining']) + 1)
+                    status, payload = 304, b''
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('ETag', etag)
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                with stub._lock:
+                    stub.request_count += 1
+                    stub.graphql_count += 1
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                time.sleep(stub.latency)
+                limited, rate_headers = stub.limit(self.headers.get('Authorization', 'anonymous'), 'graphql')
+                if self.path != '/graphql':
+                    status, payload = 404, json.dumps({'message': 'Not Found'})
+                elif limited is not None:
+                    status, payload = limited, json.dumps({'message': "API rate limit exceeded"})
+                else:
+                    status, payload, _, _ = stub.graphql(body)
+                payload = payload.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in rate_headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Caches go to a throwaway directory and the Gemini key check passes; set before the app modules import
+os.environ.setdefault("SMART_ATS_CACHE_DIR", tempfile.mkdtemp(prefix="smart-ats-tests-"))
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
@@ -0,0 +1,46 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from starlette.testclient import TestClient
+
+import api
+from pipeline import AnalysisError
+
+
+@pytest.fixture
+def one_thread(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(api, "_executor", executor)
+    yield
+    executor.shutdown(wait=True)
+
+
+def test_timed_out_work_keeps_its_slot_until_it_finishes(one_thread):
+    async def scenario():
+        with pytest.raises(api.APIError) as error:
+            await api.run_blocking(time.sleep, 0.5, timeout=0.1)
+        assert error.value.status == 504
+        # The abandoned sleep still holds the only thread
+        with pytest.raises(api.APIError):
+            await api.run_blocking(lambda: "late", timeout=0.1)
+        await asyncio.sleep(0.4)
+        return await api.run_blocking(lambda: "ok", timeout=0.5)
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+@pytest.mark.parametrize("error, status", [
+    (AnalysisError("Invalid response fields: JD Match"), 422),
+    (ValueError("bug elsewhere"), 500),
+])
+def test_only_unusable_analyses_are_422(monkeypatch, error, status):
+    def fail(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(api, "score_text", fail)
+    response = TestClient(api.app).post(
+        "/analyze", json={'resume_text': "Python developer", 'job_description': "Python", 'engine': "local"}
+    )
+    assert response.status_code == status
@@ -0,0 +1,92 @@
+import json
+import sys
+
+import pandas as pd
+import pytest
+
+import batch
+
+
+def fake_read_pdf_text(path, executor=None):
+    return f"Python developer resume from {path}"
+
+
+@pytest.fixture
+def screened(monkeypatch):
+    monkeypatch.setattr(batch, "read_pdf_text", fake_read_pdf_text)
+    calls = []
+
+    def scorer(text, jd):
+        calls.append(text.rsplit(" ", 1)[-1])
+        return json.dumps({"JD Match": "80%"})
+
+    return scorer, calls
+
+
+def test_load_completed_skips_failures_and_a_truncated_last_line(tmp_path):
+    journal = tmp_path / "results.jsonl"
+    journal.write_text(
+        json.dumps({'path': "a.pdf", 'status': 'ok'}) + "\n"
+        + json.dumps({'path': "b.pdf", 'status': 'error'}) + "\n"
+        + '{"path": "c.pdf", "sta'
+    )
+
+    assert batch.load_completed(str(journal)) == {"a.pdf"}
+    assert batch.load_completed(str(tmp_path / "missing.jsonl")) == set()
+
+
+def test_resumed_run_screens_only_unfinished_resumes(tmp_path, screened):
+    scorer, calls = screened
+    journal = tmp_path / "results.jsonl"
+    # A killed run: a.pdf done, b.pdf failed, c.pdf cut off mid-write
+    journal.write_text(
+        json.dumps({'path': "a.pdf", 'status': 'ok'}) + "\n"
+        + json.dumps({'path': "b.pdf", 'status': 'error'}) + "\n"
+        + '{"path": "c.pdf", "sta'
+    )
+
+    summary = batch.screen_resumes(["a.pdf", "b.pdf", "c.pdf"], "jd", str(journal), max_workers=2, scorer=scorer)
+
+    assert summary == {'ok': 2, 'error': 0, 'skipped': 1}
+    assert sorted(calls) == ["b.pdf", "c.pdf"]
+    lines = journal.read_text().splitlines()
+    assert lines[2] == '{"path": "c.pdf", "sta'
+    assert sorted(json.loads(line)['path'] for line in lines[3:]) == ["b.pdf", "c.pdf"]
+    assert batch.load_completed(str(journal)) == {"a.pdf", "b.pdf", "c.pdf"}
+
+
+def test_no_resume_starts_over(tmp_path, screened):
+    scorer, calls = screened
+    journal = tmp_path / "results.jsonl"
+    journal.write_text(json.dumps({'path': "a.pdf", 'status': 'ok'}) + "\n")
+
+    summary = batch.screen_resumes(["a.pdf"], "jd", str(journal), max_workers=1, resume=False, scorer=scorer)
+
+    assert summary == {'ok': 1, 'error': 0, 'skipped': 0}
+    assert calls == ["a.pdf"]
+    assert len(journal.read_text().splitlines()) == 1
+
+
+def test_parquet_output_keeps_the_latest_record_per_path(tmp_path, screened):
+    scorer, _ = screened
+    output = tmp_path / "results.parquet"
+    (tmp_path / "results.parquet.partial.jsonl").write_text(
+        json.dumps({'path': "a.pdf", 'status': 'error', 'result': None, 'error': "timeout", 'elapsed': 1.0}) + "\n"
+    )
+
+    batch.screen_resumes(["a.pdf", "b.pdf"], "jd", str(output), max_workers=2, scorer=scorer)
+
+    df = pd.read_parquet(output).sort_values('path')
+    assert df['path'].tolist() == ["a.pdf", "b.pdf"]
+    assert df['status'].tolist() == ['ok', 'ok']
+    assert df['result.JD Match'].tolist() == ["80%", "80%"]
+
+
+def test_parquet_without_an_engine_fails_before_screening(tmp_path, screened, monkeypatch):
+    scorer, calls = screened
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "fastparquet", None)
+
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        batch.screen_resumes(["a.pdf"], "jd", str(tmp_path / "results.parquet"), scorer=scorer)
+    assert calls == []
@@ -0,0 +1,42 @@
+import time
+
+from utils import cache_utils
+from utils.cache_utils import SQLiteCache
+
+
+def test_least_recently_used_entries_are_evicted_below_the_limit(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_bytes=1000)
+    for i in range(10):
+        cache.set(f"k{i}", b"x" * 100)
+        time.sleep(0.001)
+    cache.get("k0")
+    cache.set("k10", b"x" * 100)
+
+    assert cache.size() <= 1000
+    assert cache.get("k0") is not None and cache.get("k10") is not None
+    assert cache.get("k1") is None
+    # Eviction frees headroom so the following writes do not evict again
+    assert cache.size() <= 1000 * cache_utils.CACHE_EVICT_TARGET
+
+
+def test_expired_entries_are_dropped_on_write(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    cache.set("old", b"value", ttl=0.01)
+    time.sleep(0.02)
+    cache.set("new", b"value")
+    assert cache.stats()['entries'] == 1
+
+
+def test_other_connections_writes_count_toward_the_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_utils, "CACHE_RECOUNT_WRITES", 5)
+    path = str(tmp_path / "cache.sqlite")
+    first, second = SQLiteCache(path, max_bytes=1000), SQLiteCache(path)
+    first.set("a", b"x" * 10)
+    # Unbounded writer: only the recount lets the first connection see these bytes
+    second.set_many({f"k{i}": b"x" * 100 for i in range(15)})
+    first.set("b", b"x" * 10)
+    assert first.size() > 1000
+    for i in range(4):
+        first.set(f"c{i}", b"x" * 10)
+
+    assert first.size() <= 1000
@@ -0,0 +1,82 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from crew.checkpoints import CheckpointStore
+from crew.dag_scheduler import DAGScheduler
+from utils.cache_utils import SQLiteCache
+
+
+class InterpolatingTask:
+    """Stand-in for crewai.Task: interpolate_inputs rewrites the description in place"""
+
+    def __init__(self, description, context=None):
+        self.description = description
+        self.expected_output = "A sentence"
+        self.context = context or []
+        self.agent = None
+        self._original_description = None
+
+    def interpolate_inputs(self, inputs):
+        if self._original_description is None:
+            self._original_description = self.description
+        self.description = self._original_description.format(**inputs)
+
+    def execute_sync(self, agent, context):
+        return f"{self.description} | {context}"
+
+
+def crew(store=None):
+    research = InterpolatingTask("Research {company}")
+    profile = InterpolatingTask("Profile {candidate} for {company}", [research])
+    return DAGScheduler({'research': research, 'profile': profile}, checkpoints=store)
+
+
+def test_concurrent_kickoffs_do_not_share_interpolated_descriptions():
+    scheduler = crew()
+    inputs = [{'company': f"Company{i}", 'candidate': f"candidate{i}"} for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(scheduler.kickoff, inputs))
+
+    for values, result in zip(inputs, results):
+        assert result.outputs['profile'] == (
+            f"Profile {values['candidate']} for {values['company']} | Research {values['company']} | None"
+        )
+    assert scheduler.tasks['profile'].description == "Profile {candidate} for {company}"
+
+
+def test_rerun_resumes_from_checkpoints_keyed_by_the_template(tmp_path):
+    store = CheckpointStore(SQLiteCache(os.path.join(tmp_path, "checkpoints.sqlite")))
+    scheduler = crew(store)
+    scheduler.kickoff({'company': "Acme", 'candidate': "jane"})
+
+    assert sorted(scheduler.kickoff({'company': "Acme", 'candidate': "jane"}).resumed) == ['profile', 'research']
+    assert scheduler.kickoff({'company': "Initech", 'candidate': "jane"}).resumed == []
+
+
+class SleepingTask:
+    """Stub agent task taking a fixed time"""
+
+    def __init__(self, seconds, context=None):
+        self.seconds = seconds
+        self.context = context or []
+
+
+def sleep_runner(task, upstream, inputs):
+    time.sleep(task.seconds)
+    return f"done after {sorted(upstream)}"
+
+
+def test_independent_stages_run_in_parallel_and_are_all_timed():
+    research = SleepingTask(0.1)
+    profile, github = SleepingTask(0.3, [research]), SleepingTask(0.3, [research])
+    strategy = SleepingTask(0.1, [profile, github])
+    tasks = {'research': research, 'profile': profile, 'github': github, 'strategy': strategy}
+    result = DAGScheduler(tasks, max_workers=3, runner=sleep_runner).kickoff()
+
+    assert set(result.timings) == set(tasks)
+    assert all(result.timings[name].seconds >= task.seconds for name, task in tasks.items())
+    # The two middle stages overlap, so the run takes about 0.5 s rather than 0.8 s
+    assert result.total < sum(timing.seconds for timing in result.timings.values()) - 0.2
+    assert result.timings['strategy'].start >= result.timings['profile'].start + 0.3
+    assert result.final == "done after ['github', 'profile']"
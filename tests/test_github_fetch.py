@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+
+from stub_github import StubGithubServer
+from utils.cache_utils import SQLiteCache
+from utils.github_scheduler import PRIORITY_PROFILE, PRIORITY_README, GithubScheduler
+from utils.github_utils import GithubRepoFetcher
+
+
+def test_exhausted_token_pool_still_returns_profile_and_repos(tmp_path):
+    # Budget for the profile and the repository list only; every language and README request is over it
+    with StubGithubServer(repo_count=6, rate_limit=2, rate_window=60) as stub:
+        scheduler = GithubScheduler(tokens=["stub-token"], max_wait=0, reserve=0)
+        fetcher = GithubRepoFetcher(stub.username, api_url=stub.url, scheduler=scheduler,
+                                    cache=SQLiteCache(os.path.join(tmp_path, "github.sqlite")))
+        data = fetcher.fetch_repo_info()
+
+    assert data is not None
+    assert data['username'] == stub.username
+    # repo-4 is a fork and is skipped
+    assert [repo['name'] for repo in data['repositories']] == ['repo-0', 'repo-1', 'repo-2', 'repo-3', 'repo-5']
+    for repo in data['repositories']:
+        assert repo['languages'] == {}
+        assert repo['readme'] == "No README available"
+
+
+def test_core_request_goes_ahead_while_graphql_budget_is_exhausted():
+    with StubGithubServer(rate_limit=1, rate_window=2) as stub:
+        scheduler = GithubScheduler(tokens=["stub-token"], max_concurrency=1, max_wait=10, reserve=0)
+        graphql_query = {'query': '', 'variables': {'login': 'nobody'}}
+        # Spends the only GraphQL request of the window
+        scheduler.request(f"{stub.url}/graphql", method="POST", json=graphql_query, resource="graphql")
+
+        waiting = threading.Thread(target=scheduler.request, args=(f"{stub.url}/graphql",),
+                                   kwargs={'method': "POST", 'json': graphql_query, 'resource': "graphql",
+                                           'priority': PRIORITY_PROFILE})
+        waiting.start()
+        time.sleep(0.2)
+        start = time.perf_counter()
+        response = scheduler.request(f"{stub.url}/users/{stub.username}", priority=PRIORITY_README)
+        elapsed = time.perf_counter() - start
+        graphql_still_waiting = waiting.is_alive()
+        waiting.join()
+
+    assert response.status_code == 200
+    assert graphql_still_waiting
+    assert elapsed < 1
+
+
+def test_concurrent_fetch_matches_sequential_and_is_faster(tmp_path):
+    results, durations = {}, {}
+    with StubGithubServer(repo_count=20, latency=0.02) as stub:
+        for workers in (1, 8):
+            fetcher = GithubRepoFetcher(stub.username, max_workers=workers, api_url=stub.url,
+                                        scheduler=GithubScheduler(tokens=[None], max_concurrency=8),
+                                        cache=SQLiteCache(os.path.join(tmp_path, f"github-{workers}.sqlite")))
+            start = time.perf_counter()
+            results[workers] = fetcher.fetch_repo_info()
+            durations[workers] = time.perf_counter() - start
+
+    assert results[1] is not None
+    assert len(results[1]['repositories']) == 16
+    assert results[8] == results[1]
+    # 32 per-repo requests at 20 ms each take over 0.6 s one at a time
+    assert durations[8] < durations[1] / 2
+
+
+def test_cached_validators_without_a_body_refetch_the_body(tmp_path):
+    cache = SQLiteCache(os.path.join(tmp_path, "github.sqlite"))
+    with StubGithubServer(repo_count=3) as stub:
+        fetcher = GithubRepoFetcher(stub.username, api_url=stub.url, cache=cache,
+                                    scheduler=GithubScheduler(tokens=[None]))
+        first = fetcher.fetch_repo_info()
+        # Entries that kept their ETag but lost the body, e.g. written by an older version
+        for key, in cache._conn.execute("SELECT key FROM entries").fetchall():
+            cache.set_json(key, {**cache.get_json(key), 'body': None})
+        second = fetcher.fetch_repo_info()
+        not_modified = stub.not_modified_count
+
+    assert first is not None
+    assert second == first
+    assert not_modified == 0
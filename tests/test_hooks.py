@@ -0,0 +1,41 @@
+import threading
+
+from utils.hooks import add_error_reporter, remove_error_reporter, report_error
+from utils.job_queue import DONE, JobQueue
+
+
+def test_thread_reporter_only_sees_its_own_threads_errors():
+    seen = []
+    add_error_reporter(seen.append, current_thread=True)
+    add_error_reporter(seen.append, current_thread=True)
+    try:
+        report_error("here")
+        worker = threading.Thread(target=report_error, args=("elsewhere",))
+        worker.start()
+        worker.join()
+    finally:
+        remove_error_reporter(seen.append)
+    report_error("after removal")
+
+    assert seen == ["here"]
+
+
+def test_errors_reported_inside_a_job_are_kept_on_the_job():
+    queue = JobQueue(max_workers=1)
+    try:
+        def work():
+            report_error("Error processing PDF: truncated file")
+            return "partial result"
+
+        job = queue.status(queue.submit(work))
+        queue.result(job.id, timeout=5)
+        job = queue.status(job.id)
+        assert job.status == DONE
+        assert job.errors == ["Error processing PDF: truncated file"]
+        # The worker thread does not keep the job's reporter for the next job
+        second = queue.submit(lambda: report_error("next job"))
+        queue.result(second, timeout=5)
+        assert queue.status(job.id).errors == ["Error processing PDF: truncated file"]
+        assert queue.status(second).errors == ["next job"]
+    finally:
+        queue.shutdown()
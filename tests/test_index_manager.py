@@ -0,0 +1,36 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.embeddings import HashingEmbedder
+from utils.index_manager import IndexManager
+
+
+def chunks(owner, count):
+    return [{'text': f"{owner} chunk {i} about python and sql", 'metadata': {'source': 'resume'}} for i in range(count)]
+
+
+def test_managers_sharing_a_directory_keep_each_others_vectors(tmp_path):
+    # Separate managers stand in for separate worker processes: each has its own in-memory index
+    managers = [IndexManager(str(tmp_path), HashingEmbedder()) for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: managers[i].add_documents(chunks(f"owner{i}", 25), f"owner{i}"), range(4)))
+
+    fresh = IndexManager(str(tmp_path), HashingEmbedder())
+    assert fresh.ntotal == 100
+    query = HashingEmbedder().embed_documents(["owner3 chunk 7 about python and sql"])
+    # A manager that wrote earlier sees the later writers' vectors without restarting
+    assert managers[0].search(query, 1, owner_id="owner3")[0][0]['text'] == "owner3 chunk 7 about python and sql"
+
+
+def test_chunks_missing_from_the_stored_index_are_re_embedded_on_load(tmp_path):
+    IndexManager(str(tmp_path), HashingEmbedder()).add_documents(chunks("a", 5), "a")
+    # A writer that committed its rows but died before saving the index
+    with sqlite3.connect(str(tmp_path / "metadata.sqlite")) as conn:
+        conn.execute("INSERT INTO chunks (content_hash, text) VALUES ('lost', 'lost chunk about rust')")
+        chunk_id = conn.execute("SELECT id FROM chunks WHERE content_hash = 'lost'").fetchone()[0]
+        conn.execute("INSERT INTO links VALUES (?, 'b', 'resume', '{\"source\": \"resume\"}')", (chunk_id,))
+
+    manager = IndexManager(str(tmp_path), HashingEmbedder())
+    assert manager.ntotal == 6
+    query = HashingEmbedder().embed_documents(["lost chunk about rust"])
+    assert manager.search(query, 1, owner_id="b")[0][0]['text'] == "lost chunk about rust"
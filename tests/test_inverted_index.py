@@ -0,0 +1,65 @@
+from utils.inverted_index import InvertedIndex
+
+
+def test_index_sees_documents_added_by_another_connection(tmp_path):
+    path = str(tmp_path / "candidates.sqlite")
+    first, second = InvertedIndex(path), InvertedIndex(path)
+    first.add_document("a.pdf", "Python developer with Spark")
+    assert [hit['key'] for hit in first.search("python")] == ["a.pdf"]
+
+    # The second connection appends to the posting list the first one has cached
+    second.add_documents([(f"{i}.pdf", f"Python engineer number {i}", {}) for i in range(20)])
+
+    assert first.size == 21
+    assert len(first.search("python", top_k=50)) == 21
+
+
+def test_compact_keeps_documents_another_connection_changed(tmp_path):
+    path = str(tmp_path / "candidates.sqlite")
+    first, second = InvertedIndex(path), InvertedIndex(path)
+    first.add_documents([(f"{i}.pdf", f"Python engineer number {i}", {}) for i in range(8)])
+    first.remove("0.pdf")
+    second.remove("1.pdf")
+    second.add_document("2.pdf", "Go engineer")
+
+    first.compact()
+
+    for index in (first, second, InvertedIndex(path)):
+        assert index.stats()['deleted'] == 0
+        assert sorted(hit['key'] for hit in index.search("python", top_k=50)) == [f"{i}.pdf" for i in range(3, 8)]
+        assert [hit['key'] for hit in index.search("go")] == ["2.pdf"]
+
+
+def test_single_adds_append_segments_that_merge_by_tier(tmp_path):
+    index = InvertedIndex(str(tmp_path / "candidates.sqlite"))
+    for i in range(100):
+        index.add_document(f"{i}.pdf", f"Python engineer number {i}")
+
+    segments = index._conn.execute("SELECT df FROM postings WHERE term = 'python' ORDER BY segment").fetchall()
+    # 100 = 1 * 64 + 4 * 8 + 4 * 1 after merging every 8 same-tier segments
+    assert [row[0] for row in segments] == [64] + [8] * 4 + [1] * 4
+    ids, tfs = index.postings("python")
+    assert ids.tolist() == list(range(1, 101)) and tfs.tolist() == [1] * 100
+
+    index.remove("5.pdf")
+    index.compact()
+    assert index._conn.execute("SELECT COUNT(*) FROM postings WHERE term = 'python'").fetchone()[0] == 1
+    assert len(index.search("python", top_k=200)) == 99
+
+
+def test_unsegmented_postings_are_converted(tmp_path):
+    path = str(tmp_path / "candidates.sqlite")
+    index = InvertedIndex(path)
+    index.add_documents([(f"{i}.pdf", f"Python engineer number {i}", {}) for i in range(5)])
+    index.compact()
+    index._conn.executescript("""
+        CREATE TABLE old_postings AS SELECT term, df, last_doc, data FROM postings;
+        DROP TABLE postings;
+        ALTER TABLE old_postings RENAME TO postings;
+    """)
+
+    reopened = InvertedIndex(path)
+    assert reopened.stats()['segments'] == reopened.stats()['terms']
+    assert sorted(hit['key'] for hit in reopened.search("python", top_k=50)) == [f"{i}.pdf" for i in range(5)]
+    reopened.add_document("5.pdf", "Python engineer")
+    assert len(reopened.search("python", top_k=50)) == 6
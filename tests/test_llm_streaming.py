@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from fake_llm import FakeLLM
+from models import gemini
+from models.llm_gateway import LLMGateway
+from utils.cache_utils import SQLiteCache
+
+ANALYSIS = {"JD Match": "80%", "MissingKeywords": [], "Profile Summary": "Fits the role"}
+
+
+@pytest.fixture
+def gateway(tmp_path, monkeypatch):
+    gateway = LLMGateway(SQLiteCache(str(tmp_path / "llm.sqlite")))
+    monkeypatch.setattr(gemini, "get_gateway", lambda: gateway)
+    monkeypatch.setattr(gemini, "GOOGLE_API_KEY", "test-key")
+    return gateway
+
+
+def test_streamed_analysis_is_cached_after_early_stop(gateway):
+    # Trailing prose after the object, which stream_analysis stops before reading
+    body = json.dumps(ANALYSIS)
+    fake = FakeLLM(tokens=[body[:20], body[20:], " Hope this helps!"], first_token_delay=0, token_delay=0)
+    gateway.register_provider("gemini", lambda model: fake)
+
+    first = "".join(gemini.stream_analysis("resume", "job description"))
+    second = "".join(gemini.stream_analysis("resume", "job description"))
+
+    assert fake.calls == 1
+    assert json.loads(first) == json.loads(second) == ANALYSIS
+
+
+def test_incomplete_stream_is_not_cached(gateway):
+    fake = FakeLLM(tokens=['{"JD Match": ', '"80%"', ' and more'], first_token_delay=0, token_delay=0)
+    gateway.register_provider("fake", lambda model: fake)
+
+    stream = gateway.stream("fake", "model", "prompt", complete=gemini.has_json_object)
+    next(stream)
+    stream.close()
+    "".join(gateway.stream("fake", "model", "prompt"))
+
+    assert fake.calls == 2
+
+
+def test_non_streaming_analysis_matches_streamed_one(gateway):
+    full = {**ANALYSIS, "ProjectMatch": "70%", "WorkExpMatch": "90%", "EduMatch": "100%"}
+    fake = FakeLLM(tokens=[json.dumps(full)], first_token_delay=0, token_delay=0)
+    gateway.register_provider("gemini", lambda model: fake)
+
+    analysis = gemini.analyze_resume("resume", "job description")
+    streamed = gemini.clean_response("".join(gemini.stream_analysis("resume", "job description")))
+
+    assert json.loads(analysis) == json.loads(streamed) == full
+    # The streamed call is answered from the response the blocking call cached
+    assert fake.calls == 1
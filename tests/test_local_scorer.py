@@ -0,0 +1,45 @@
+import json
+
+from models.local_scorer import LocalATSScorer, score_resume_local
+from utils.json_utils import ATS_SCHEMA
+
+JD = """Senior Backend Engineer
+We need strong Python and Kubernetes experience, with PostgreSQL and AWS.
+Experience building distributed data pipelines with Apache Spark is a plus.
+A bachelor's degree in computer science is required."""
+
+STRONG = """Experience
+Backend engineer building distributed data pipelines in Python on Apache Spark, deployed to k8s on AWS.
+Maintained PostgreSQL schemas for the pipelines.
+Projects
+Open-source Python library for Spark pipelines on Kubernetes.
+Education
+B.S. in Computer Science"""
+
+WEAK = """Experience
+Graphic designer producing brand identities and print layouts.
+Education
+Diploma in Fine Arts"""
+
+
+def test_analysis_has_the_llm_shape():
+    analysis = json.loads(score_resume_local(STRONG, JD))
+    assert set(analysis) == set(ATS_SCHEMA)
+    assert all(analysis[field].endswith('%') for field in ("JD Match", "ProjectMatch", "WorkExpMatch", "EduMatch"))
+
+
+def test_matching_resume_scores_higher_and_aliases_count():
+    scorer = LocalATSScorer(JD)
+    strong, weak = scorer.score(STRONG), scorer.score(WEAK)
+
+    assert int(strong["JD Match"][:-1]) > int(weak["JD Match"][:-1])
+    # 'k8s' is an alias of Kubernetes
+    assert "Kubernetes" not in strong["MissingKeywords"]
+    assert {"Python", "Kubernetes", "PostgreSQL", "AWS"} <= set(weak["MissingKeywords"])
+
+
+def test_score_does_not_depend_on_the_rest_of_the_pool():
+    scorer = LocalATSScorer(JD)
+    alone = scorer.score(STRONG)
+    assert scorer.score_many([WEAK, STRONG, WEAK])[1] == alone
+    assert LocalATSScorer(JD).score(STRONG) == alone
@@ -0,0 +1,71 @@
+import json
+
+from prompts.builder import (
+    RelevanceScorer, build_analysis_prompt, compact_github, compact_jd, dedupe_lines, estimate_tokens,
+    summarize_readme, truncate_to_tokens
+)
+
+JD = """Backend Engineer
+You will build Python services on Kubernetes and tune PostgreSQL.
+
+We are an equal opportunity employer and consider applicants without regard to race or religion.
+
+Benefits: health insurance, paid time off and a 401(k)."""
+
+RESUME = "Experience\n" + "\n".join(
+    [f"- Organised the office party number {i} for the whole floor" for i in range(60)]
+    + ["- Built Python services on Kubernetes backed by PostgreSQL"]
+)
+
+
+def repo(name, description, readme=""):
+    return {'name': name, 'description': description, 'language': "Python", 'languages': {"Python": 10},
+            'stars': 1, 'topics': [], 'readme': readme}
+
+
+def test_truncation_respects_the_budget_at_a_word_boundary():
+    text = "word " * 100
+    cut = truncate_to_tokens(text, 10)
+    assert cut.endswith(" …") and estimate_tokens(cut[:-2]) <= 10
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_jd_drops_benefits_and_equal_opportunity_paragraphs():
+    text = compact_jd(JD, RelevanceScorer(JD), 1000)
+    assert "Kubernetes" in text
+    assert "equal opportunity" not in text and "health insurance" not in text
+
+
+def test_resume_over_budget_keeps_the_relevant_lines():
+    built = build_analysis_prompt(RESUME, JD, budgets={'resume': 100})
+    assert built.tokens['text'] <= 100 < built.original_tokens['text']
+    assert "Built Python services on Kubernetes" in built.prompt
+    assert built.total_tokens == estimate_tokens(built.prompt)
+
+
+def test_github_field_ranks_repositories_by_relevance_within_budget():
+    repos = [repo(f"party-{i}", "Spreadsheet of office party games") for i in range(20)]
+    repos.insert(10, repo("k8s-api", "Python API deployed on Kubernetes"))
+    scorer = RelevanceScorer(JD)
+    lines = compact_github({'repositories': repos}, scorer, 60, 50).splitlines()
+
+    assert json.loads(lines[0])['name'] == "k8s-api"
+    assert sum(estimate_tokens(line) + 1 for line in lines) <= 60 and len(lines) < len(repos)
+
+
+def test_readme_boilerplate_shared_across_repositories_is_dropped():
+    license = "Released under the MIT license, see LICENSE for details."
+    first, second = dedupe_lines([f"Ingests events into PostgreSQL.\n{license}", f"Kubernetes operator.\n{license}"])
+    assert first == "Ingests events into PostgreSQL." and second == "Kubernetes operator."
+
+
+def test_readme_summary_prefers_relevant_sentences():
+    readme = "# Title\n" + " ".join(["This project is fun."] * 40) + " It runs Python on Kubernetes."
+    summary = summarize_readme(readme, RelevanceScorer(JD), 20)
+    assert "Kubernetes" in summary and estimate_tokens(summary) <= 20
+
+
+def test_github_entries_carry_skills_derived_from_the_repository():
+    entry = repo("deploy-tools", "Helm charts for k8s", readme="Scripts in Golang.")
+    line = compact_github([entry], RelevanceScorer(JD), 200, 50)
+    assert json.loads(line)['skills'] == ["Go", "Helm", "Kubernetes", "Python"]
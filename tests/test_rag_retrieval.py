@@ -0,0 +1,41 @@
+from utils.embeddings import HashingEmbedder
+from utils.rag_utils import RAGSystem
+
+
+class RecordingEmbedder(HashingEmbedder):
+    """Remote-looking embedder that records which texts were embedded as documents and as queries"""
+
+    is_remote = True
+
+    def __init__(self):
+        super().__init__(dimension=256)
+        self.documents, self.queries = [], []
+
+    def embed_documents(self, texts):
+        self.documents.extend(texts)
+        return super().embed_documents(texts)
+
+    def embed_queries(self, texts):
+        self.queries.extend(texts)
+        return super().embed_documents(texts)
+
+
+def test_queries_use_query_embeddings_and_are_not_cached():
+    embedder = RecordingEmbedder()
+    rag = RAGSystem(embedder=embedder)
+    rag.documents = [
+        {'text': "Built Python services on Kubernetes", 'metadata': {'source': 'resume'}},
+        {'text': "Designed brand identities for print", 'metadata': {'source': 'resume'}},
+    ]
+    rag.create_embeddings_and_index()
+    store = rag.embeddings.cache.store
+    cached = store.stats()['entries']
+
+    results = rag.retrieve_many(["Python Kubernetes", "brand design"], top_k=1)
+
+    assert [docs[0]['text'] for docs in results] == [
+        "Built Python services on Kubernetes", "Designed brand identities for print"
+    ]
+    assert embedder.queries == ["Python Kubernetes", "brand design"]
+    assert "Python Kubernetes" not in embedder.documents
+    assert store.stats()['entries'] == cached
@@ -0,0 +1,78 @@
+from utils.resume_parser import ResumeDocument, parse_entries, parse_resume
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 123 4567 | github.com/janedoe
+
+SUMMARY
+Backend engineer focused on data platforms.
+
+Experience
+Acme Corp
+Senior Backend Engineer  Jan 2019 - Present
+- Built Python services on Kubernetes
+- Cut PostgreSQL query latency by 40%
+Data Engineer at Initech  03/2016 - Dec 2018
+- Ran Apache Spark pipelines
+
+Projects & Open Source
+ats-tool  2021
+- Resume screening CLI in Go
+
+Education
+BSc Computer Science, University of Somewhere  2012 - 2016
+
+Interests
+Climbing, chess
+"""
+
+
+def test_sections_keep_resume_order_and_known_kinds():
+    document = parse_resume(RESUME)
+    assert [section.kind for section in document.sections] == [
+        'summary', 'summary', 'experience', 'projects', 'education', 'interests'
+    ]
+    assert document.section('projects').heading == "Projects & Open Source"
+    # Contact lines are kept out of the unheaded top block
+    assert document.sections[0].heading == "" and document.sections[0].text == "Jane Doe"
+
+
+def test_dated_entries_have_titles_organisations_and_normalised_dates():
+    jobs = parse_resume(RESUME).entries('experience')
+    assert [(job.title, job.organization, job.start, job.end) for job in jobs] == [
+        ("Senior Backend Engineer", "Acme Corp", "2019-01", "present"),
+        ("Data Engineer", "Initech", "2016-03", "2018-12"),
+    ]
+    assert jobs[1].text == "- Ran Apache Spark pipelines"
+    assert jobs[1].months() == 34
+
+
+def test_overlapping_experience_is_counted_once():
+    document = parse_resume("Experience\nEngineer at A  2018 - 2019\nConsultant at B  Jan 2019 - Jun 2019\n")
+    # Jan 2018 through Jun 2019
+    assert document.experience_months() == 18
+    # A date range is not a phone number
+    assert document.contact == {}
+
+
+def test_contact_details_and_skills():
+    document = parse_resume(RESUME)
+    assert document.contact == {'email': "jane@example.com", 'phone': "+1 555 123 4567",
+                                'github': "github.com/janedoe"}
+    assert {"Python", "Kubernetes", "PostgreSQL", "Apache Spark", "Go"} <= set(document.skills)
+
+
+def test_prompt_text_drops_interests_and_collapses_whitespace():
+    text = parse_resume(RESUME).text_for()
+    assert text.startswith("Summary:\nJane Doe\n\nSUMMARY:\nBackend engineer")
+    assert "Climbing" not in text
+    assert "Senior Backend Engineer Jan 2019 - Present" in text
+
+
+def test_round_trips_through_json():
+    document = parse_resume(RESUME)
+    assert ResumeDocument.from_json(document.to_json()) == document
+
+
+def test_sections_without_dates_have_no_entries():
+    assert parse_entries("- Built things\n- Shipped them") == []
+    assert parse_resume("no headings at all").sections[0].kind == 'summary'
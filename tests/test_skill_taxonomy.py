@@ -0,0 +1,46 @@
+from utils.skill_taxonomy import SkillTaxonomy, get_taxonomy
+
+
+def skills(text):
+    return [match.skill for match in get_taxonomy().find(text)]
+
+
+def test_aliases_resolve_to_canonical_names():
+    taxonomy = get_taxonomy()
+    assert taxonomy.extract("k8s, Kubernetes and Golang") == {"Kubernetes": 2, "Go": 1}
+    assert taxonomy.canonical("k8s") == "Kubernetes"
+    assert taxonomy.canonical("experience with PySpark") == "Apache Spark"
+    assert taxonomy.canonical("cooking") is None
+
+
+def test_leftmost_longest_match_wins():
+    assert skills("Ruby on Rails and Node.js") == ["Ruby on Rails", "Node.js"]
+    assert skills("Ruby scripts") == ["Ruby"]
+
+
+def test_matches_sit_on_word_boundaries():
+    assert skills("C++ and C# developer") == ["C++", "C#"]
+    assert skills("Javanese JavaScript") == ["JavaScript"]
+    assert skills("components in Node.jsx") == []
+    assert skills("ASP.NET services") == [".NET"]
+
+
+def test_case_sensitive_aliases_match_exactly():
+    assert skills("Written in Go and R") == ["Go", "R"]
+    assert skills("ready to go or r") == []
+
+
+def test_match_offsets_point_into_the_original_text():
+    text = "İstanbul team using Kubernetes"
+    match, = get_taxonomy().find(text)
+    assert text[match.start:match.end] == "Kubernetes"
+
+
+def test_overlapping_aliases_in_a_small_taxonomy():
+    taxonomy = SkillTaxonomy({
+        "SQL": {"aliases": []},
+        "PostgreSQL": {"aliases": ["Postgres"]},
+        "Machine Learning": {"aliases": ["ML"]},
+    })
+    # 'SQL' is a suffix of 'PostgreSQL' but only whole-word matches count
+    assert taxonomy.extract("PostgreSQL, Postgres, SQL and ML") == {"PostgreSQL": 2, "SQL": 1, "Machine Learning": 1}